@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from lib.table_routing import TableRouter
+
+TABLES = ("stg_terapias", "stg_chat", "stg_capacitaciones", "stg_viaticos", "stg_organizaciones", "stg_profesionales")
+WORDS = ("terapia", "consejeria", "chat", "bloques", "viaticos", "sede", "norte", "sur", "cliente", "usuarios")
+RULE_COUNTS = (15, 150, 1500, 15000)
+
+
+def generate_rules(count: int, seed: int = 7) -> dict[str, str]:
+    rng = random.Random(seed)
+    rules: dict[str, str] = {}
+    while len(rules) < count:
+        pattern = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{len(rules):05d}"
+        rules[pattern] = rng.choice(TABLES)
+    return rules
+
+
+def generate_names(rules: dict[str, str], count: int = 2000, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    patterns = list(rules)
+    names: list[str] = []
+    for index in range(count):
+        if index % 2:
+            names.append(f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_export_{index}")
+        else:
+            names.append(f"reporte_{rng.choice(patterns)}_2024")
+    return names
+
+
+def legacy_resolve(mapping: dict[str, str], name: str) -> str | None:
+    if name in mapping:
+        return mapping[name]
+    for key, value in mapping.items():
+        if key in name:
+            return value
+    return None
+
+
+def _per_name_us(resolve: object, names: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for name in names:
+            resolve(name)
+        best = min(best, time.perf_counter() - started)
+    return best / len(names) * 1_000_000
+
+
+def measure_routing(count: int, names_count: int = 2000, repeat: int = 3, seed: int = 7) -> dict[str, object]:
+    rules = generate_rules(count, seed)
+    names = generate_names(rules, names_count, seed)
+
+    started = time.perf_counter()
+    router = TableRouter.from_mapping(rules)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    mismatches = sum(router.resolve(name) != legacy_resolve(rules, name) for name in names)
+    return {
+        "reglas": count,
+        "construccion_ms": build_ms,
+        "automata_us": _per_name_us(router.resolve, names, repeat),
+        "lineal_us": _per_name_us(lambda name: legacy_resolve(rules, name), names, repeat),
+        "diferencias": mismatches,
+    }
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Medir el costo de ruteo archivo -> tabla segun la cantidad de reglas")
+    parser.add_argument("--rules", type=int, action="append", help="Cantidad de reglas (repetible)")
+    parser.add_argument("--names", type=int, default=2000, help="Nombres de archivo a rutear por medicion")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medicion (se reporta el minimo)")
+    parser.add_argument("--seed", type=int, default=7, help="Semilla de las reglas sinteticas")
+    parser.add_argument("--max-ratio", type=float, default=3.0, help="Crecimiento maximo permitido con --check")
+    parser.add_argument("--check", action="store_true", help="Fallar si el costo del automata crece con las reglas")
+    args = parser.parse_args(argv)
+
+    results = [
+        measure_routing(count, names_count=max(1, args.names), repeat=args.repeat, seed=args.seed)
+        for count in sorted(args.rules or RULE_COUNTS)
+    ]
+    for result in results:
+        print(
+            f" - reglas={result['reglas']}: automata={result['automata_us']:.1f}us/archivo, "
+            f"lineal={result['lineal_us']:.1f}us/archivo, construccion={result['construccion_ms']:.0f}ms"
+        )
+
+    failed = False
+    if any(result["diferencias"] for result in results):
+        print("[ERROR] El automata no coincide con el ruteo lineal")
+        failed = True
+    ratio = results[-1]["automata_us"] / max(results[0]["automata_us"], 1e-9)
+    if args.check and ratio > args.max_ratio:
+        print(f"[ERROR] El costo del automata crecio {ratio:.1f}x (limite {args.max_ratio:.1f}x)")
+        failed = True
+
+    if not failed:
+        print(f"[OK] Costo de ruteo: {ratio:.1f}x entre {results[0]['reglas']} y {results[-1]['reglas']} reglas")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
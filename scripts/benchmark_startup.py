@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+ENTRY_POINTS = ("data_toolkit_cli", "cleanup_temp_outputs")
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "pyarrow", "xlrd")
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def measure_startup(module: str, runs: int = 5) -> dict[str, object]:
+    import_us: list[int] = []
+    wall_ms: list[float] = []
+    loaded: set[str] = set()
+    slowest: list[tuple[int, str]] = []
+
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=SCRIPTS_DIR,
+            capture_output=True,
+            text=True,
+        )
+        wall_ms.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"No se pudo importar {module}: {result.stderr.strip().splitlines()[-1:]}")
+
+        total = 0
+        entries: list[tuple[int, str]] = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_PATTERN.match(line)
+            if not match:
+                continue
+            own, cumulative, name = int(match.group(1)), int(match.group(2)), match.group(4)
+            loaded.add(name)
+            entries.append((own, name))
+            if len(match.group(3)) == 1:
+                total += cumulative
+        import_us.append(total)
+        slowest = sorted(entries, reverse=True)[:5]
+
+    heavy = sorted(name for name in loaded if name in HEAVY_MODULES)
+    return {
+        "modulo": module,
+        "import_ms": min(import_us) / 1000,
+        "arranque_ms": min(wall_ms),
+        "modulos_pesados": heavy,
+        "mas_lentos": [f"{name}={own / 1000:.1f}ms" for own, name in slowest],
+    }
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Medir tiempo de arranque con python -X importtime")
+    parser.add_argument("--module", action="append", help="Modulo a medir (repetible, default: entradas sin pandas)")
+    parser.add_argument("--runs", type=int, default=5, help="Repeticiones por modulo (se reporta el minimo)")
+    parser.add_argument("--max-ms", type=float, help="Fallar si el tiempo de import supera este limite")
+    parser.add_argument("--check", action="store_true", help="Fallar si se importan pandas/numpy/openpyxl al arrancar")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.module or ENTRY_POINTS:
+        result = measure_startup(module, runs=args.runs)
+        print(
+            f" - {result['modulo']}: import={result['import_ms']:.1f}ms, "
+            f"arranque={result['arranque_ms']:.1f}ms, pesados={result['modulos_pesados'] or 'ninguno'}"
+        )
+        print(f"   mas lentos: {', '.join(result['mas_lentos'])}")
+        if args.check and result["modulos_pesados"]:
+            print(f"[ERROR] {module} importa dependencias pesadas al arrancar")
+            failed = True
+        if args.max_ms is not None and result["import_ms"] > args.max_ms:
+            print(f"[ERROR] {module} supera {args.max_ms:.0f}ms de import")
+            failed = True
+
+    if not failed:
+        print("[OK] Arranque dentro de los limites")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterator
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+SHEET_NAMES = ("Terapias", "Consejeria", "Viaticos", "Capacitaciones", "Chat Bloques")
+CSV_SPECS = (
+    ("terapias", ",", "utf-8"),
+    ("consejeria", ";", "latin-1"),
+    ("viaticos", "\t", "utf-8-sig"),
+    ("chat_bloques", "|", "utf-8"),
+)
+HEADER = ("Row ID", "Fecha", "Organizacion", "Profesional", "Paciente", "Monto", "Email", "Observaciones")
+ORGANIZATIONS = ("Fundacion Ñandú", "Centro Integral", "Asociacion Esperanza", "Red Salud Norte")
+NAMES = ("María José", "Andrés", "Lucía", "José Luis", "Sofía", "Martín", "Inés", "Raúl")
+NOTES = ("", "Sin novedad", "Reprogramado, llamar", 'Dijo "mañana"', "Pago parcial; pendiente", "Linea 1\nLinea 2")
+CASES = (
+    "convert_excel",
+    "convert_excel_streaming",
+    "inspect_excel",
+    "inspect_excel_fast",
+    "sql_warehouse_clean",
+    "sql_generic",
+    "merge_csv",
+    "validate_csv",
+)
+EXCEL_CASES = ("convert_excel", "convert_excel_streaming", "inspect_excel", "inspect_excel_fast")
+LIB_MODULES = ("lib.csv_sql", "lib.excel_csv", "lib.inspect_excel", "lib.merge_csv", "lib.validate_csv")
+
+
+def _iter_rows(rng: random.Random, rows: int, start: int = 0) -> Iterator[list[object]]:
+    base = date(2024, 1, 1)
+    for idx in range(start, start + rows):
+        name = rng.choice(NAMES)
+        yield [
+            f"R{idx:08d}",
+            datetime.combine(base + timedelta(days=rng.randrange(730)), datetime.min.time()),
+            rng.choice(ORGANIZATIONS),
+            name,
+            None if rng.random() < 0.02 else f"{rng.choice(NAMES)} {rng.randrange(1000)}",
+            round(rng.uniform(5, 500), 2),
+            f"{name.split()[0].lower()}{idx}@example.org",
+            rng.choice(NOTES),
+        ]
+
+
+def generate_workbook(path: Path, sheets: int = 3, rows: int = 20000, junk_rows: int = 2, seed: int = 7) -> int:
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    for sheet_idx in range(max(1, sheets)):
+        title = SHEET_NAMES[sheet_idx % len(SHEET_NAMES)]
+        if sheet_idx >= len(SHEET_NAMES):
+            title = f"{title} {sheet_idx // len(SHEET_NAMES) + 1}"
+        worksheet = workbook.create_sheet(title)
+        for junk_idx in range(junk_rows):
+            worksheet.append([f"Reporte generado {junk_idx + 1}"] if junk_idx % 2 == 0 else [])
+        worksheet.append(list(HEADER))
+        for row in _iter_rows(rng, rows, start=sheet_idx * rows):
+            worksheet.append(row)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+    return max(1, sheets) * rows
+
+
+def generate_csv(path: Path, rows: int = 50000, delimiter: str = ",", encoding: str = "utf-8", seed: int = 7) -> int:
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding=encoding, newline="") as handle:
+        writer = csv.writer(handle, delimiter=delimiter)
+        writer.writerow(HEADER)
+        for row in _iter_rows(rng, rows):
+            row[1] = row[1].strftime("%Y-%m-%d")
+            writer.writerow(row)
+    return rows
+
+
+def generate_dataset(
+    work_dir: Path,
+    sheets: int = 3,
+    rows: int = 20000,
+    junk_rows: int = 2,
+    csv_files: int = 4,
+    csv_rows: int = 50000,
+    seed: int = 7,
+) -> dict[str, object]:
+    workbook = work_dir / "input" / "workbook.xlsx"
+    csv_dir = work_dir / "input" / "csv"
+    workbook_rows = generate_workbook(workbook, sheets=sheets, rows=rows, junk_rows=junk_rows, seed=seed)
+
+    total_csv_rows = 0
+    for idx in range(max(1, csv_files)):
+        stem, delimiter, encoding = CSV_SPECS[idx % len(CSV_SPECS)]
+        if idx >= len(CSV_SPECS):
+            stem = f"{stem}_{idx // len(CSV_SPECS) + 1}"
+        total_csv_rows += generate_csv(csv_dir / f"{stem}.csv", csv_rows, delimiter, encoding, seed=seed + idx)
+
+    return {
+        "workbook": str(workbook),
+        "workbook_filas": workbook_rows,
+        "workbook_bytes": workbook.stat().st_size,
+        "csv_dir": str(csv_dir),
+        "csv_filas": total_csv_rows,
+        "csv_bytes": sum(path.stat().st_size for path in csv_dir.glob("*.csv")),
+    }
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / 1024**2
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(case: str, dataset: dict[str, object], output_dir: Path) -> None:
+    from lib.csv_sql import csv_to_insert_sql
+    from lib.excel_csv import convert_excel_to_csv
+    from lib.inspect_excel import inspect_excel_structure
+    from lib.merge_csv import merge_csv_folder
+    from lib.validate_csv import validate_csv_folder
+
+    workbook = Path(str(dataset["workbook"]))
+    csv_dir = Path(str(dataset["csv_dir"]))
+    if case in ("convert_excel", "convert_excel_streaming"):
+        convert_excel_to_csv(
+            workbook, output_dir=output_dir, streaming=case == "convert_excel_streaming", use_cache=False
+        )
+    elif case in ("inspect_excel", "inspect_excel_fast"):
+        inspect_excel_structure(workbook, fast=case == "inspect_excel_fast")
+    elif case == "sql_warehouse_clean":
+        csv_to_insert_sql(csv_dir, profile="warehouse_clean", output_file=output_dir / "seed.sql", use_cache=False)
+    elif case == "sql_generic":
+        csv_to_insert_sql(csv_dir, profile="generic", output_dir=output_dir, use_cache=False)
+    elif case == "merge_csv":
+        merge_csv_folder(csv_dir, output_file=output_dir / "merged.csv")
+    elif case == "validate_csv":
+        validate_csv_folder(csv_dir)
+    else:
+        raise ValueError(f"Caso de benchmark desconocido: {case}")
+
+
+def measure_case(case: str, dataset: dict[str, object], output_dir: Path) -> dict[str, object]:
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    for module in LIB_MODULES:
+        importlib.import_module(module)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    _run_case(case, dataset, output_dir)
+    return {"segundos": time.perf_counter() - started, "rss_pico_mb": peak_rss_mb()}
+
+
+def run_benchmarks(
+    dataset: dict[str, object], work_dir: Path, cases: list[str], repeat: int = 1
+) -> list[dict[str, object]]:
+    results: list[dict[str, object]] = []
+    for case in cases:
+        runs: list[dict[str, object]] = []
+        for _ in range(max(1, repeat)):
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                runs.append(executor.submit(measure_case, case, dataset, work_dir / "output" / case).result())
+
+        prefix = "workbook" if case in EXCEL_CASES else "csv"
+        rows = int(dataset[f"{prefix}_filas"])
+        size = int(dataset[f"{prefix}_bytes"])
+        seconds = [float(run["segundos"]) for run in runs]
+        peaks = [run["rss_pico_mb"] for run in runs if run["rss_pico_mb"] is not None]
+        best = min(seconds)
+        results.append(
+            {
+                "caso": case,
+                "segundos": round(best, 4),
+                "segundos_media": round(sum(seconds) / len(seconds), 4),
+                "filas": rows,
+                "bytes": size,
+                "filas_por_s": round(rows / best, 1) if best else None,
+                "mb_por_s": round(size / 1024**2 / best, 3) if best else None,
+                "rss_pico_mb": round(max(peaks), 1) if peaks else None,
+            }
+        )
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _environment() -> dict[str, object]:
+    versions: dict[str, str | None] = {}
+    for module in ("pandas", "numpy", "openpyxl", "pyarrow"):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "versiones": versions,
+    }
+
+
+def compare_results(previous: dict[str, object], current: dict[str, object]) -> list[str]:
+    before = {item["caso"]: item for item in previous.get("resultados", [])}
+    lines: list[str] = []
+    for item in current.get("resultados", []):
+        old = before.get(item["caso"])
+        if old is None or not old.get("segundos"):
+            lines.append(f" - {item['caso']}: sin resultado previo")
+            continue
+        change = (item["segundos"] - old["segundos"]) / old["segundos"] * 100
+        line = f" - {item['caso']}: {old['segundos']:.3f}s -> {item['segundos']:.3f}s ({change:+.1f}%)"
+        if old.get("rss_pico_mb") and item.get("rss_pico_mb"):
+            line += f", rss {old['rss_pico_mb']:.0f}MB -> {item['rss_pico_mb']:.0f}MB"
+        lines.append(line)
+    return lines
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Medir rendimiento (filas/s, MB/s, RSS pico) con libros y CSV sinteticos generados localmente"
+    )
+    parser.add_argument("--output", default="benchmark_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--compare", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--case", action="append", choices=CASES, help="Caso a medir (repetible, default: todos)")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones por caso (se reporta el minimo)")
+    parser.add_argument("--sheets", type=int, default=3, help="Hojas del libro sintetico")
+    parser.add_argument("--rows", type=int, default=20000, help="Filas por hoja")
+    parser.add_argument("--junk-rows", type=int, default=2, help="Filas basura antes del encabezado")
+    parser.add_argument("--csv-files", type=int, default=4, help="Cantidad de CSV (rota delimitador y encoding)")
+    parser.add_argument("--csv-rows", type=int, default=50000, help="Filas por CSV")
+    parser.add_argument("--seed", type=int, default=7, help="Semilla de los datos sinteticos")
+    parser.add_argument("--work-dir", help="Carpeta de trabajo (default: temporal, se borra al terminar)")
+    args = parser.parse_args(argv)
+
+    previous = None
+    if args.compare:
+        compare_file = Path(args.compare).expanduser()
+        if not compare_file.exists():
+            raise FileNotFoundError(f"No existe el archivo de resultados: {compare_file}")
+        previous = json.loads(compare_file.read_text(encoding="utf-8"))
+
+    if args.work_dir:
+        work_dir = Path(args.work_dir).expanduser().resolve()
+    else:
+        work_dir = Path(tempfile.mkdtemp(prefix="dataforge_bench_"))
+    try:
+        print(f"[..] Generando datos sinteticos en {work_dir}")
+        dataset = generate_dataset(
+            work_dir,
+            sheets=args.sheets,
+            rows=args.rows,
+            junk_rows=args.junk_rows,
+            csv_files=args.csv_files,
+            csv_rows=args.csv_rows,
+            seed=args.seed,
+        )
+        results = run_benchmarks(dataset, work_dir, args.case or list(CASES), repeat=args.repeat)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    payload = {
+        **_environment(),
+        "parametros": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "work_dir")},
+        "datos": {key: value for key, value in dataset.items() if key.endswith(("_filas", "_bytes"))},
+        "resultados": results,
+    }
+    output_file = Path(args.output).expanduser()
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+    for item in results:
+        rss = f"{item['rss_pico_mb']:.0f}MB" if item["rss_pico_mb"] is not None else "n/d"
+        print(
+            f" - {item['caso']}: {item['segundos']:.3f}s, {item['filas_por_s']:.0f} filas/s, "
+            f"{item['mb_por_s']:.2f} MB/s, rss={rss}"
+        )
+    if previous is not None:
+        print("[OK] Comparacion con corrida anterior:")
+        if previous.get("parametros") != payload["parametros"]:
+            print(" - NOTE: los parametros difieren de la corrida anterior, la comparacion no es directa")
+        for line in compare_results(previous, payload):
+            print(line)
+    print(f"[OK] Resultados: {output_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
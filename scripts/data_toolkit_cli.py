@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import multiprocessing
+import sys
 from pathlib import Path
 
 from lib.cleanup import cleanup_temp_folders
 from lib.common import (
+    CACHE_DIRNAME,
     TEMP_CSV_DIRNAME,
     TEMP_SQL_DIRNAME,
     ask_input,
@@ -14,11 +17,6 @@ from lib.common import (
     print_section_header,
     to_path,
 )
-from lib.csv_sql import csv_to_insert_sql
-from lib.excel_csv import convert_excel_to_csv
-from lib.inspect_excel import inspect_excel_structure
-from lib.merge_csv import merge_csv_folder
-from lib.validate_csv import validate_csv_folder
 
 
 def print_usage_guide() -> None:
@@ -31,6 +29,7 @@ def print_usage_guide() -> None:
             "3) Perfil SQL: warehouse_clean (staging) o generic (dinamico).",
             "4) Opciones 3-6: inspeccionar, validar, unir y limpiar.",
             "5) Salidas por defecto: csv_exports_local / sql_exports_local.",
+            "6) Sin menu: data_toolkit_cli.py pipeline trabajo.json (Excel -> SQL).",
         ],
         accent="light",
     )
@@ -48,9 +47,18 @@ def print_usage_guide() -> None:
 
 
 def run_excel_to_csv() -> None:
-    excel_raw = ask_input("Ruta del Excel (.xlsx/.xls/.xlsm)")
+    from lib.excel_csv import convert_excel_batch, convert_excel_to_csv, default_batch_output_dir, resolve_excel_sources
+
+    excel_raw = ask_input("Ruta del Excel (.xlsx/.xls/.xlsm), carpeta o patron glob")
     excel_path = to_path(excel_raw).expanduser().resolve()
-    output_default = str(excel_path.parent / TEMP_CSV_DIRNAME)
+    excel_paths = resolve_excel_sources(excel_path)
+    batch_mode = excel_paths != [excel_path]
+    if batch_mode and not excel_paths:
+        raise ValueError("No se encontraron archivos Excel (.xlsx, .xls o .xlsm)")
+    if batch_mode:
+        output_default = str(default_batch_output_dir(excel_paths))
+    else:
+        output_default = str(excel_path.parent / TEMP_CSV_DIRNAME)
     output_raw = ask_input("Carpeta salida CSV (ENTER para default)", output_default)
     output_dir = to_path(output_raw).expanduser().resolve()
 
@@ -59,27 +67,43 @@ def run_excel_to_csv() -> None:
     delimiter = ask_input("Delimitador CSV", ",")
     encoding = ask_input("Encoding CSV", "utf-8")
     keep_empty = ask_yes_no("Conservar filas completamente vacias", default_yes=False)
+    streaming = ask_yes_no("Modo streaming (memoria constante, .xlsx/.xlsm)", default_yes=False)
+    workers = max(1, int(ask_input("Procesos en paralelo", "1")))
+    use_cache = ask_yes_no("Reusar CSV de libros sin cambios (cache)", default_yes=True)
+    file_format = ask_input("Formato de salida (csv/parquet/arrow)", "csv").strip().lower()
 
     sheets = [item.strip() for item in sheets_raw.split(",") if item.strip()]
     date_keywords = [item.strip() for item in date_raw.split(",") if item.strip()]
+    options = {
+        "output_dir": output_dir,
+        "sheets": sheets,
+        "delimiter": delimiter,
+        "encoding": encoding,
+        "date_keywords": date_keywords,
+        "drop_empty_rows": not keep_empty,
+        "streaming": streaming,
+        "workers": workers,
+        "use_cache": use_cache,
+        "file_format": file_format,
+    }
+
+    if batch_mode:
+        results = convert_excel_batch(excel_paths=excel_paths, **options)
+    else:
+        results = convert_excel_to_csv(excel_path=excel_path, **options)
 
-    results = convert_excel_to_csv(
-        excel_path=excel_path,
-        output_dir=output_dir,
-        sheets=sheets,
-        delimiter=delimiter,
-        encoding=encoding,
-        date_keywords=date_keywords,
-        drop_empty_rows=not keep_empty,
-    )
-
-    print(f"\n[OK] CSV generados en: {output_dir}")
+    label = "CSV" if file_format == "csv" else file_format.capitalize()
+    print(f"\n[OK] {label} generados en: {output_dir}")
     for csv_name, rows in results.items():
         print(f" - {csv_name}: {rows} filas")
 
 
 def run_csv_to_sql() -> None:
-    source_raw = ask_input("Ruta CSV (archivo .csv o carpeta con CSV)")
+    from lib.csv_sql import DEFAULT_TABLE_ROUTER, csv_to_insert_sql, default_delta_index_dir, load_csv_to_database
+    from lib.delta_sql import pending_delta_files, promote_delta_index
+    from lib.table_routing import load_routing_file
+
+    source_raw = ask_input("Ruta CSV/Parquet/Arrow/Feather (archivo o carpeta)")
     source_path = to_path(source_raw).expanduser().resolve()
     profile_raw = ask_input("Perfil SQL (warehouse_clean/generic)", "warehouse_clean").strip().lower()
     if profile_raw == "generic":
@@ -89,6 +113,38 @@ def run_csv_to_sql() -> None:
     else:
         raise ValueError("Perfil invalido. Usa warehouse_clean o generic")
     encoding = ask_input("Encoding CSV", "utf-8")
+    router = None
+    if profile == "warehouse_clean":
+        routing_raw = ask_input("Reglas de ruteo JSON (vacio = reglas por defecto)", "")
+        if routing_raw:
+            router = load_routing_file(to_path(routing_raw).expanduser().resolve(), defaults=DEFAULT_TABLE_ROUTER)
+    dsn = ask_input("Cargar directo a BD: DSN (vacio = generar archivos SQL)", "")
+    if dsn:
+        create_tables = ask_yes_no("Crear tablas si no existen", default_yes=False)
+        workers = max(1, int(ask_input("Conexiones en paralelo (SQLite usa una)", "1")))
+        report = load_csv_to_database(
+            source_path=source_path,
+            dsn=dsn,
+            profile=profile,
+            encoding=encoding,
+            workers=workers,
+            create_tables=create_tables,
+            router=router,
+        )
+        print(f"\n[OK] Perfil usado: {report.profile}")
+        print(f"[OK] Datos cargados en: {report.output_path}")
+        for item_name, rows in report.items.items():
+            print(f" - {item_name}: {rows} filas cargadas")
+        for table_name, rate in report.rows_per_second.items():
+            print(f" - {table_name}: {rate:,.0f} filas/s")
+        for note in report.notes:
+            print(f" - NOTE: {note}")
+        return
+
+    output_format = ask_input("Formato de salida (insert/copy/load_data)", "insert").strip().lower()
+    if output_format not in {"insert", "copy", "load_data"}:
+        raise ValueError("Formato invalido. Usa insert, copy o load_data")
+    use_cache = ask_yes_no("Reusar SQL de CSV sin cambios (cache)", default_yes=True)
 
     if profile == "warehouse_clean":
         if source_path.is_file():
@@ -99,13 +155,42 @@ def run_csv_to_sql() -> None:
         output_raw = ask_input("Archivo SQL final", output_default)
         output_file = to_path(output_raw).expanduser().resolve()
         wrap_transaction = ask_yes_no("Envolver salida con BEGIN/COMMIT", default_yes=True)
+        single_row = False
+        chunk_size = 500
+        if output_format == "insert":
+            single_row = ask_yes_no("Formato legacy (un INSERT por fila)", default_yes=False)
+            if not single_row:
+                chunk_size = max(1, int(ask_input("Filas por bloque INSERT", "500")))
+        delta = ask_yes_no("Modo delta (solo filas nuevas/modificadas por appsheet_row_id)", default_yes=False)
+        delta_style = "update"
+        delta_deletes = False
+        if delta:
+            if output_format == "insert":
+                delta_style = ask_input("Estilo delta (update/on_conflict/on_duplicate_key)", "update").strip().lower()
+            delta_deletes = ask_yes_no("Emitir DELETE para filas eliminadas", default_yes=False)
+            index_dir = default_delta_index_dir(output_file)
+            if pending_delta_files(index_dir) and ask_yes_no(
+                f"Hay un indice delta pendiente en {index_dir}. Ya aplicaste el SQL anterior (confirmarlo)",
+                default_yes=False,
+            ):
+                promote_delta_index(index_dir)
+        workers = 1 if delta else max(1, int(ask_input("Procesos en paralelo", "1")))
 
         report = csv_to_insert_sql(
             source_path=source_path,
             profile=profile,
             output_file=output_file,
             encoding=encoding,
+            chunk_size=chunk_size,
             wrap_transaction=wrap_transaction,
+            single_row_inserts=single_row,
+            output_format=output_format,
+            use_cache=use_cache,
+            delta=delta,
+            delta_style=delta_style,
+            delta_deletes=delta_deletes,
+            workers=workers,
+            router=router,
         )
     else:
         if source_path.is_file():
@@ -116,8 +201,10 @@ def run_csv_to_sql() -> None:
         output_raw = ask_input("Carpeta salida SQL", output_default)
         output_dir = to_path(output_raw).expanduser().resolve()
         prefix = ask_input("Prefijo de tablas SQL", "")
-        chunk_size_raw = ask_input("Filas por bloque INSERT", "500")
-        chunk_size = max(1, int(chunk_size_raw))
+        chunk_size = 500
+        if output_format == "insert":
+            chunk_size_raw = ask_input("Filas por bloque INSERT", "500")
+            chunk_size = max(1, int(chunk_size_raw))
 
         report = csv_to_insert_sql(
             source_path=source_path,
@@ -126,6 +213,8 @@ def run_csv_to_sql() -> None:
             table_prefix=prefix,
             encoding=encoding,
             chunk_size=chunk_size,
+            output_format=output_format,
+            use_cache=use_cache,
         )
 
     print(f"\n[OK] Perfil usado: {report.profile}")
@@ -137,23 +226,34 @@ def run_csv_to_sql() -> None:
 
 
 def run_inspect_excel() -> None:
+    from lib.inspect_excel import inspect_excel_structure
+
     excel_raw = ask_input("Ruta del Excel para inspeccionar")
     excel_path = to_path(excel_raw).expanduser().resolve()
-    report = inspect_excel_structure(excel_path)
+    fast = ask_yes_no("Modo rapido (metadatos y conteo en streaming, .xlsx/.xlsm)", default_yes=False)
+    report = inspect_excel_structure(excel_path, fast=fast)
 
     print(f"\n[OK] Estructura detectada en: {excel_path}")
     for item in report:
         print(
             f" - {item['hoja']}: filas={item['filas_no_vacias']}, "
             f"columnas={item['columnas_no_vacias']}, header_sugerido=fila {item['fila_header_detectada']}"
+            + (f", dimension={item['dimension']}" if item.get("dimension") else "")
         )
 
 
 def run_validate_csv() -> None:
+    from lib.validate_csv import check_stats_file, validate_csv_folder, write_column_stats
+
     folder_raw = ask_input("Carpeta con CSV a validar")
     folder_path = to_path(folder_raw).expanduser().resolve()
     encoding = ask_input("Encoding CSV", "utf-8")
-    report = validate_csv_folder(folder_path, encoding=encoding)
+    stats_raw = ask_input("Archivo de estadisticas por columna (.json/.csv, vacio=no guardar)", "")
+    stats_file = to_path(stats_raw).expanduser().resolve() if stats_raw else None
+    if stats_file is not None:
+        check_stats_file(stats_file)
+    workers = max(1, int(ask_input("Procesos en paralelo", "1")))
+    report = validate_csv_folder(folder_path, encoding=encoding, workers=workers)
 
     print(f"\n[OK] Reporte de validacion: {folder_path}")
     for item in report:
@@ -162,31 +262,41 @@ def run_validate_csv() -> None:
             f"delim='{item['delimitador']}', dup_cols={item['columnas_duplicadas']}, "
             f"cols_vacias={item['columnas_vacias']}, filas_vacias={item['filas_vacias']}"
         )
+    if stats_file is not None:
+        write_column_stats(report, stats_file)
+        print(f"[OK] Estadisticas por columna en: {stats_file}")
 
 
 def run_merge_csv() -> None:
+    from lib.columnar import output_name
+    from lib.merge_csv import merge_csv_folder
+
     folder_raw = ask_input("Carpeta con CSV para unir")
     folder_path = to_path(folder_raw).expanduser().resolve()
-    output_default = str(folder_path / "merged_all.csv")
-    output_raw = ask_input("Archivo CSV de salida", output_default)
+    file_format = ask_input("Formato de salida (csv/parquet/arrow)", "csv").strip().lower()
+    output_default = str(folder_path / output_name("merged_all.csv", file_format))
+    output_raw = ask_input("Archivo de salida", output_default)
     output_file = to_path(output_raw).expanduser().resolve()
     encoding = ask_input("Encoding CSV", "utf-8")
     include_source = ask_yes_no("Agregar columna source_file", default_yes=True)
+    workers = max(1, int(ask_input("Procesos en paralelo", "1")))
 
     generated = merge_csv_folder(
         folder_path=folder_path,
         output_file=output_file,
         encoding=encoding,
         include_source_column=include_source,
+        workers=workers,
+        file_format=file_format,
     )
-    print(f"\n[OK] CSV combinado: {generated}")
+    print(f"\n[OK] Archivo combinado: {generated}")
 
 
 def run_cleanup() -> None:
     base_raw = ask_input("Ruta base para limpiar temporales", str(Path.cwd()))
     base_path = to_path(base_raw).expanduser().resolve()
     confirm = ask_yes_no(
-        f"Eliminar carpetas '{TEMP_CSV_DIRNAME}' y '{TEMP_SQL_DIRNAME}' dentro de {base_path}",
+        f"Eliminar carpetas '{TEMP_CSV_DIRNAME}', '{TEMP_SQL_DIRNAME}' y '{CACHE_DIRNAME}' dentro de {base_path}",
         default_yes=False,
     )
     if not confirm:
@@ -220,7 +330,13 @@ def print_menu() -> None:
     )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == ["pipeline"]:
+        from lib.pipeline import cli
+
+        return cli(args[1:])
+
     print_banner()
     print_usage_guide()
 
@@ -255,4 +371,5 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     raise SystemExit(main())
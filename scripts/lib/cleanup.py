@@ -4,7 +4,7 @@ import argparse
 import shutil
 from pathlib import Path
 
-from .common import TEMP_CSV_DIRNAME, TEMP_SQL_DIRNAME
+from .common import CACHE_DIRNAME, TEMP_CSV_DIRNAME, TEMP_SQL_DIRNAME
 
 
 def cleanup_temp_folders(base_path: Path) -> list[Path]:
@@ -12,7 +12,7 @@ def cleanup_temp_folders(base_path: Path) -> list[Path]:
         raise FileNotFoundError(f"No existe la carpeta base: {base_path}")
 
     removed: list[Path] = []
-    for pattern in (TEMP_CSV_DIRNAME, TEMP_SQL_DIRNAME):
+    for pattern in (TEMP_CSV_DIRNAME, TEMP_SQL_DIRNAME, CACHE_DIRNAME):
         for folder in base_path.rglob(pattern):
             if folder.is_dir():
                 shutil.rmtree(folder)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 12
+INTEGER_PATTERN = r"[+-]?\d+"
+DECIMAL_PATTERN = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+BOOLEAN_PATTERN = r"(?i:true|false|verdadero|falso|si|sí|no)"
+DATE_PATTERN = r"\d{4}-\d{1,2}-\d{1,2}(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?|\d{1,2}/\d{1,2}/\d{2,4}"
+TYPE_PATTERNS = {
+    "entero": re.compile(INTEGER_PATTERN),
+    "decimal": re.compile(DECIMAL_PATTERN),
+    "booleano": re.compile(BOOLEAN_PATTERN),
+    "fecha": re.compile(DATE_PATTERN),
+}
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    lengths = np.zeros(len(values), dtype=np.uint8)
+    remaining = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = remaining >= np.uint64(1 << shift)
+        lengths[mask] += shift
+        remaining[mask] >>= np.uint64(shift)
+    lengths += (remaining > 0).astype(np.uint8)
+    return lengths
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        tail_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        tails = hashes & np.uint64((1 << tail_bits) - 1)
+        ranks = (tail_bits - _bit_length(tails) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other: HyperLogLog) -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * size and zeros:
+            return round(size * np.log(size / zeros))
+        return round(raw)
+
+
+class ColumnProfile:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.min_length: int | None = None
+        self.max_length: int | None = None
+        self.distinct = HyperLogLog()
+        self.candidates = list(TYPE_PATTERNS)
+
+    def update(self, values: pd.Series) -> None:
+        self.rows += len(values)
+        present = values.dropna()
+        self.nulls += len(values) - len(present)
+        if present.empty:
+            return
+
+        uniques = pd.unique(present.astype(str).to_numpy())
+        lengths = np.fromiter(map(len, uniques), dtype=np.int64, count=len(uniques))
+        low, high = int(lengths.min()), int(lengths.max())
+        self.min_length = low if self.min_length is None else min(self.min_length, low)
+        self.max_length = high if self.max_length is None else max(self.max_length, high)
+        self.distinct.update(pd.util.hash_array(uniques))
+
+        self.candidates = [
+            label
+            for label in self.candidates
+            if all(TYPE_PATTERNS[label].fullmatch(value.strip()) for value in uniques)
+        ]
+
+    def inferred_type(self) -> str:
+        if self.nulls == self.rows:
+            return "vacio"
+        return self.candidates[0] if self.candidates else "texto"
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "columna": self.name,
+            "nulos": self.nulls,
+            "distintos_aprox": self.distinct.estimate(),
+            "longitud_min": self.min_length,
+            "longitud_max": self.max_length,
+            "tipo_inferido": self.inferred_type(),
+        }
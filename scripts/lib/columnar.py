@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from pandas.errors import EmptyDataError
+
+from .csv_reader import PANDAS_NA_STRINGS, csv_text_frame
+
+FILE_FORMATS = ("csv", "parquet", "arrow")
+FORMAT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+COLUMNAR_INPUT_EXTENSIONS = (".parquet", ".arrow", ".feather")
+COLUMNAR_COMPRESSION = "zstd"
+ROW_GROUP_ROWS = 128_000
+DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"
+TIMESTAMP_PATTERN = r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+INT_PATTERN = r"-?(?:0|[1-9]\d{0,17})"
+FLOAT_PATTERN = r"-?(?:(?:0|[1-9]\d*)(?:\.\d+)?|\.\d+)(?:[eE][-+]?\d+)?"
+TEXT_KINDS = (("date", DATE_PATTERN), ("timestamp", TIMESTAMP_PATTERN), ("int", INT_PATTERN), ("float", FLOAT_PATTERN))
+NUMBER_TYPES = (int, float, Decimal, np.integer, np.floating)
+
+
+def require_pyarrow(file_format: str) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(f"El formato {file_format} requiere instalar pyarrow") from exc
+
+
+def check_file_format(file_format: str) -> None:
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Formato de archivo no soportado: {file_format}. Usa {', '.join(FILE_FORMATS)}")
+    if file_format != "csv":
+        require_pyarrow(file_format)
+
+
+def output_name(name: str, file_format: str) -> str:
+    return Path(name).with_suffix(FORMAT_EXTENSIONS[file_format]).as_posix()
+
+
+def _present(series: pd.Series) -> pd.Series:
+    values = series[series.notna()]
+    if values.dtype == object:
+        values = values[values.map(lambda value: not isinstance(value, str) or bool(value.strip()))]
+    return values
+
+
+def _text_arrays(series: pd.Series) -> tuple[object, object] | None:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if series.dtype != object and not isinstance(series.dtype, pd.StringDtype):
+        return None
+    try:
+        raw = pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    trimmed = pc.utf8_trim_whitespace(raw)
+    return raw, pc.if_else(pc.equal(trimmed, ""), pa.scalar(None, pa.string()), trimmed)
+
+
+def _text_kind(values: object) -> str:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    present = pc.drop_null(values)
+    if not len(present):
+        return "null"
+    first = present[0].as_py()
+    for kind, pattern in TEXT_KINDS:
+        if not re.fullmatch(pattern, first):
+            continue
+        if not pc.all(pc.match_substring_regex(present, f"^(?:{pattern})$")).as_py():
+            continue
+        try:
+            pc.cast(present, arrow_types()[kind])
+        except pa.ArrowInvalid:
+            continue
+        return kind
+    return "string"
+
+
+def column_kind(series: pd.Series) -> str:
+    text = _text_arrays(series)
+    if text is not None:
+        return _text_kind(text[1])
+
+    values = _present(series)
+    if values.empty:
+        return "null"
+    if pd.api.types.is_bool_dtype(values):
+        return "bool"
+    if pd.api.types.is_integer_dtype(values):
+        return "int"
+    if pd.api.types.is_float_dtype(values):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return "date" if (values.dt.normalize() == values).all() else "timestamp"
+
+    types = set(map(type, values.tolist()))
+    if types <= {bool, np.bool_}:
+        return "bool"
+    if not types & {bool, np.bool_} and all(issubclass(kind, NUMBER_TYPES) for kind in types):
+        integral = all(issubclass(kind, (int, np.integer)) for kind in types)
+        return "int" if integral and values.map(lambda value: abs(value) < 2**63).all() else "float"
+    if all(issubclass(kind, (datetime, date)) for kind in types):
+        converted = pd.to_datetime(values, errors="coerce")
+        if converted.isna().any():
+            return "string"
+        return "date" if (converted.dt.normalize() == converted).all() else "timestamp"
+    return "string"
+
+
+def merge_kind(left: str, right: str) -> str:
+    if left == "null" or left == right:
+        return right
+    if right == "null":
+        return left
+    if {left, right} == {"int", "float"}:
+        return "float"
+    if {left, right} == {"date", "timestamp"}:
+        return "timestamp"
+    return "string"
+
+
+def infer_kinds(frames: Iterable[pd.DataFrame], columns: list[str]) -> dict[str, str]:
+    kinds = {column: "null" for column in columns}
+    for frame in frames:
+        for column in frame.columns:
+            if kinds[column] != "string":
+                kinds[column] = merge_kind(kinds[column], column_kind(frame[column]))
+    return kinds
+
+
+def arrow_types() -> dict[str, object]:
+    import pyarrow as pa
+
+    return {
+        "null": pa.string(),
+        "string": pa.string(),
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+    }
+
+
+def arrow_schema(kinds: dict[str, str]) -> object:
+    import pyarrow as pa
+
+    types = arrow_types()
+    return pa.schema([(str(column), types[kind]) for column, kind in kinds.items()])
+
+
+def _text(value: object) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def _typed_values(series: pd.Series, kind: str) -> pd.Series:
+    if kind in ("null", "string"):
+        return series.map(_text, na_action="ignore").astype("string")
+    values = series.where(series.map(lambda value: not isinstance(value, str) or bool(value.strip())))
+    if kind == "bool":
+        return values.astype("boolean")
+    if kind in ("int", "float"):
+        return pd.to_numeric(values, dtype_backend="numpy_nullable").astype("Int64" if kind == "int" else "Float64")
+    date_format = "%Y-%m-%d" if kind == "date" else "ISO8601"
+    texts = values.map(lambda value: value.strip() if isinstance(value, str) else value, na_action="ignore")
+    return pd.to_datetime(texts, format=date_format, errors="coerce")
+
+
+def frame_to_table(frame: pd.DataFrame, kinds: dict[str, str]) -> object:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    schema = arrow_schema(kinds)
+    arrays = []
+    for column, field in zip(kinds, schema):
+        text = _text_arrays(frame[column])
+        if text is not None:
+            raw, cleaned = text
+            arrays.append(raw if kinds[column] in ("null", "string") else pc.cast(cleaned, field.type))
+            continue
+
+        values = _typed_values(frame[column], kinds[column])
+        if kinds[column] == "date":
+            arrays.append(pa.Array.from_pandas(values, type=pa.timestamp("us")).cast(pa.date32()))
+        else:
+            arrays.append(pa.Array.from_pandas(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class ColumnarWriter:
+    def __init__(
+        self, output_file: Path, file_format: str, kinds: dict[str, str], row_group_rows: int = ROW_GROUP_ROWS
+    ) -> None:
+        require_pyarrow(file_format)
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError(f"Formato columnar no soportado: {file_format}")
+        self.output_file = output_file
+        self.file_format = file_format
+        self.kinds = kinds
+        self.schema = arrow_schema(kinds)
+        self.row_group_rows = max(1, row_group_rows)
+        self.rows = 0
+        self._pending: list[object] = []
+        self._pending_rows = 0
+        self._writer: object | None = None
+
+    def __enter__(self) -> ColumnarWriter:
+        import pyarrow as pa
+
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.output_file, self.schema, compression=COLUMNAR_COMPRESSION)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=COLUMNAR_COMPRESSION)
+            self._writer = pa.ipc.new_file(str(self.output_file), self.schema, options=options)
+        return self
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        self._pending.append(frame_to_table(frame, self.kinds))
+        self._pending_rows += len(frame)
+        self.rows += len(frame)
+        if self._pending_rows >= self.row_group_rows:
+            self._flush(final=False)
+
+    def _flush(self, final: bool = True) -> None:
+        import pyarrow as pa
+
+        if not self._pending:
+            return
+        table = pa.concat_tables(self._pending)
+        size = table.num_rows if final else table.num_rows - table.num_rows % self.row_group_rows
+        if self.file_format == "parquet":
+            self._writer.write_table(table.slice(0, size), row_group_size=self.row_group_rows)
+        else:
+            self._writer.write_table(table.slice(0, size), max_chunksize=self.row_group_rows)
+        rest = table.slice(size)
+        self._pending, self._pending_rows = ([rest] if rest.num_rows else []), rest.num_rows
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        try:
+            if exc_type is None:
+                self._flush()
+        finally:
+            self._writer.close()
+
+
+def write_columnar_frames(
+    frames: Callable[[], Iterable[pd.DataFrame]],
+    output_file: Path,
+    file_format: str,
+    columns: list[str],
+) -> int:
+    require_pyarrow(file_format)
+    kinds = infer_kinds(frames(), columns)
+
+    part_file = output_file.with_name(f"{output_file.name}.part")
+    try:
+        with ColumnarWriter(part_file, file_format, kinds) as writer:
+            for frame in frames():
+                writer.write(frame.reindex(columns=columns))
+        part_file.replace(output_file)
+    finally:
+        part_file.unlink(missing_ok=True)
+    return writer.rows
+
+
+def write_columnar_frame(frame: pd.DataFrame, output_file: Path, file_format: str) -> int:
+    frame = frame.copy()
+    frame.columns = [str(column) for column in frame.columns]
+    return write_columnar_frames(lambda: [frame], output_file, file_format, list(frame.columns))
+
+
+def csv_file_to_columnar(csv_file: Path, output_file: Path, file_format: str, encoding: str = "utf-8") -> int:
+    def frames() -> Iterable[pd.DataFrame]:
+        with pd.read_csv(
+            csv_file, dtype=object, keep_default_na=False, na_values=[""], encoding=encoding, chunksize=ROW_GROUP_ROWS
+        ) as reader:
+            yield from reader
+
+    try:
+        columns = list(pd.read_csv(csv_file, dtype=object, nrows=0, encoding=encoding).columns)
+    except EmptyDataError:
+        return write_columnar_frames(lambda: [], output_file, file_format, [])
+    return write_columnar_frames(frames, output_file, file_format, columns)
+
+
+def is_columnar_file(path: Path) -> bool:
+    return path.suffix.lower() in COLUMNAR_INPUT_EXTENSIONS
+
+
+def _open_ipc(source: object, included_fields: list[int] | None = None) -> object:
+    import pyarrow as pa
+
+    options = pa.ipc.IpcReadOptions(included_fields=included_fields) if included_fields else None
+    return pa.ipc.open_file(source, options=options)
+
+
+def columnar_column_names(path: Path) -> list[str]:
+    require_pyarrow(path.suffix.lstrip("."))
+    import pyarrow as pa
+
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(path).names)
+    with pa.memory_map(str(path)) as source:
+        try:
+            return list(_open_ipc(source).schema.names)
+        except pa.ArrowInvalid:
+            import pyarrow.feather as feather
+
+            return list(feather.read_table(path, memory_map=True).schema.names)
+
+
+def _text_column(column: object) -> np.ndarray:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    kind = column.type
+    arrow_text = pa.types.is_string(kind) or pa.types.is_large_string(kind) or pa.types.is_integer(kind)
+    if not arrow_text and not pa.types.is_date32(kind):
+        frame = pa.table([column], names=["valor"]).to_pandas(integer_object_nulls=True, date_as_object=True)
+        return csv_text_frame(frame).iloc[:, 0].to_numpy(dtype=object)
+
+    text = pc.cast(column, pa.string())
+    text = pc.if_else(pc.is_in(text, value_set=pa.array(sorted(PANDAS_NA_STRINGS))), pa.scalar(None, pa.string()), text)
+    values = text.to_numpy(zero_copy_only=False).astype(object)
+    values[text.is_null().to_numpy(zero_copy_only=False)] = np.nan
+    return values
+
+
+def _text_batch(batch: object) -> pd.DataFrame:
+    names = [str(name) for name in batch.schema.names]
+    columns = {name: _text_column(column) for name, column in zip(names, batch.columns)}
+    return pd.DataFrame(columns, index=pd.RangeIndex(batch.num_rows), columns=list(columns))
+
+
+def _iter_batches(path: Path, names: list[str], selected: list[str], batch_rows: int) -> Iterator[object]:
+    import pyarrow as pa
+
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=selected)
+        return
+
+    with pa.memory_map(str(path)) as source:
+        try:
+            reader = _open_ipc(source, [names.index(name) for name in selected])
+        except pa.ArrowInvalid:
+            import pyarrow.feather as feather
+
+            yield from feather.read_table(path, columns=selected, memory_map=True).to_batches(batch_rows)
+        else:
+            yield from (reader.get_batch(idx) for idx in range(reader.num_record_batches))
+
+
+def iter_columnar_frames(
+    path: Path,
+    columns: list[str] | None = None,
+    batch_rows: int = ROW_GROUP_ROWS,
+) -> Iterator[pd.DataFrame]:
+    if not path.exists():
+        raise FileNotFoundError(f"No existe el archivo: {path}")
+    names = columnar_column_names(path)
+    wanted = set(names if columns is None else columns)
+    selected = [name for name in names if name in wanted]
+    if not selected:
+        return
+
+    emitted = False
+    for batch in _iter_batches(path, names, selected, batch_rows):
+        emitted = True
+        yield _text_batch(batch)
+    if not emitted:
+        yield pd.DataFrame(columns=selected, dtype=object)
+
+
+def read_columnar_frame(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    frames = list(iter_columnar_frames(path, columns))
+    if not frames:
+        names = columnar_column_names(path)
+        return pd.DataFrame(columns=names if columns is None else [name for name in names if name in columns])
+    return pd.concat(frames, ignore_index=True)
@@ -9,6 +9,7 @@ from pathlib import Path
 
 TEMP_CSV_DIRNAME = "csv_exports_local"
 TEMP_SQL_DIRNAME = "sql_exports_local"
+CACHE_DIRNAME = ".dataforge_cache"
 MIN_PANEL_WIDTH = 56
 MAX_PANEL_WIDTH = 100
 
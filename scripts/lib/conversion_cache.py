@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .common import CACHE_DIRNAME, TEMP_CSV_DIRNAME, TEMP_SQL_DIRNAME
+
+CACHE_VERSION = 4
+CACHE_MAX_BYTES = 1024 * 1024 * 1024
+HASH_BLOCK_BYTES = 1024 * 1024
+META_FILENAME = "meta.json"
+DIGESTS_FILENAME = "digests.json"
+
+
+def _write_json_atomic(path: Path, payload: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False)
+    with handle:
+        json.dump(payload, handle, ensure_ascii=False)
+    os.replace(handle.name, path)
+
+
+class ConversionCache:
+    def __init__(self, root: Path, enabled: bool = True, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.root = root
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.entries_dir = root / "entries"
+        self.notes: list[str] = []
+        self._digests: dict[str, list[object]] = {}
+        self._dirty = False
+        if enabled:
+            digests_file = root / DIGESTS_FILENAME
+            try:
+                self._digests = json.loads(digests_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._digests = {}
+
+    @classmethod
+    def beside(cls, output_dir: Path, enabled: bool = True) -> ConversionCache:
+        if output_dir.name in (TEMP_CSV_DIRNAME, TEMP_SQL_DIRNAME):
+            return cls(output_dir.parent / CACHE_DIRNAME, enabled=enabled)
+        return cls(output_dir / CACHE_DIRNAME, enabled=enabled)
+
+    def __enter__(self) -> ConversionCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _disable(self, exc: OSError) -> None:
+        self.enabled = False
+        self.notes.append(f"Cache deshabilitada, no se pudo escribir en {self.root}: {exc}")
+
+    def file_digest(self, path: Path) -> str:
+        resolved = str(path.resolve())
+        stat = path.stat()
+        known = self._digests.get(resolved)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return str(known[2])
+
+        digest = hashlib.sha256()
+        with path.open("rb") as handle:
+            for block in iter(lambda: handle.read(HASH_BLOCK_BYTES), b""):
+                digest.update(block)
+        self._digests[resolved] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        self._dirty = True
+        return digest.hexdigest()
+
+    def entry_key(self, kind: str, source: Path, options: dict[str, object]) -> str:
+        if not self.enabled:
+            return ""
+        payload = {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "source": self.file_digest(source),
+            "options": options,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / key
+
+    def lookup(self, key: str) -> dict[str, object] | None:
+        if not self.enabled:
+            return None
+
+        entry_dir = self._entry_dir(key)
+        meta_file = entry_dir / META_FILENAME
+        try:
+            meta = json.loads(meta_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not all((entry_dir / name).is_file() for name in meta.get("files", [])):
+            return None
+
+        now = time.time()
+        try:
+            os.utime(meta_file, (now, now))
+        except OSError:
+            pass
+        return meta
+
+    def blob_path(self, key: str, name: str) -> Path:
+        return self._entry_dir(key) / name
+
+    def restore(self, key: str, name: str, destination: Path) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.blob_path(key, name), destination)
+
+    def store(self, key: str, meta: dict[str, object], files: dict[str, Path] | None = None) -> None:
+        if not self.enabled:
+            return
+
+        files = files or {}
+        entry_dir = self._entry_dir(key)
+        try:
+            entry_dir.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(dir=entry_dir.parent, suffix=".tmp"))
+        except OSError as exc:
+            self._disable(exc)
+            return
+        try:
+            size = 0
+            for name, source in files.items():
+                shutil.copyfile(source, staging / name)
+                size += (staging / name).stat().st_size
+            _write_json_atomic(staging / META_FILENAME, {**meta, "files": list(files), "bytes": size})
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging, entry_dir)
+        except OSError as exc:
+            self._disable(exc)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def evict(self) -> list[Path]:
+        if not self.entries_dir.is_dir():
+            return []
+
+        entries: list[tuple[float, int, Path]] = []
+        for meta_file in self.entries_dir.glob(f"*/*/{META_FILENAME}"):
+            try:
+                size = int(json.loads(meta_file.read_text(encoding="utf-8")).get("bytes", 0))
+                entries.append((meta_file.stat().st_mtime, size, meta_file.parent))
+            except (OSError, ValueError):
+                entries.append((0.0, 0, meta_file.parent))
+
+        total = sum(size for _, size, _ in entries)
+        removed: list[Path] = []
+        for _, size, entry_dir in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            removed.append(entry_dir)
+            total -= size
+        return removed
+
+    def close(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            if self._dirty:
+                digests = {path: value for path, value in self._digests.items() if Path(path).exists()}
+                _write_json_atomic(self.root / DIGESTS_FILENAME, digests)
+                self._dirty = False
+            self.evict()
+        except OSError as exc:
+            self._disable(exc)
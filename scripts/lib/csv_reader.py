@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import codecs
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from pandas.errors import EmptyDataError, ParserError
+
+CSV_ENGINES = ("auto", "pyarrow", "c", "python")
+PYARROW_MIN_BYTES = 1024 * 1024
+SNIFF_BYTES = 64 * 1024
+DECODE_BLOCK_BYTES = 1024 * 1024
+SNIFF_SAMPLE_CHARS = 2048
+DELIMITER_CANDIDATES = ",;\t|"
+UTF8_ALIASES = ("utf-8", "utf8", "utf-8-sig", "utf_8", "utf_8_sig")
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+PANDAS_NA_STRINGS = (
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+)
+
+
+@dataclass(frozen=True)
+class CsvDialect:
+    encoding: str
+    delimiter: str
+
+
+def encoding_candidates(preferred_encoding: str) -> list[str]:
+    candidates: list[str] = []
+    for encoding in (preferred_encoding, "utf-8-sig", "utf-8", "latin-1"):
+        if encoding not in candidates:
+            candidates.append(encoding)
+    return candidates
+
+
+def _decodes(prefix: bytes, encoding: str, complete: bool) -> bool:
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(prefix, final=complete)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+def _sniff_encoding(prefix: bytes, preferred_encoding: str, complete: bool) -> str:
+    for bom, encoding in BOM_ENCODINGS:
+        if prefix.startswith(bom):
+            if encoding == "utf-8-sig" and preferred_encoding.lower() in UTF8_ALIASES:
+                return preferred_encoding
+            return encoding
+
+    for encoding in encoding_candidates(preferred_encoding):
+        if _decodes(prefix, encoding, complete):
+            return encoding
+    return preferred_encoding
+
+
+def _sniff_delimiter(sample: str) -> str:
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=DELIMITER_CANDIDATES).delimiter
+    except csv.Error:
+        return ","
+
+
+@lru_cache(maxsize=16384)
+def _sniff_cached(path: str, size: int, mtime_ns: int, preferred_encoding: str) -> CsvDialect:
+    with open(path, "rb") as handle:
+        prefix = handle.read(SNIFF_BYTES)
+
+    encoding = _sniff_encoding(prefix, preferred_encoding, complete=len(prefix) >= size)
+    text = prefix.decode(encoding, errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    sample = text[:SNIFF_SAMPLE_CHARS]
+    return CsvDialect(encoding=encoding, delimiter=_sniff_delimiter(sample))
+
+
+def sniff_csv_dialect(file_path: Path, preferred_encoding: str = "utf-8") -> CsvDialect:
+    stat = file_path.stat()
+    return _sniff_cached(str(file_path.resolve()), stat.st_size, stat.st_mtime_ns, preferred_encoding)
+
+
+def _decodes_file(file_path: Path, encoding: str) -> bool:
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        with file_path.open("rb") as handle:
+            for block in iter(lambda: handle.read(DECODE_BLOCK_BYTES), b""):
+                decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except (UnicodeDecodeError, LookupError):
+        return False
+    return True
+
+
+def resolve_file_encoding(file_path: Path, dialect: CsvDialect) -> str | None:
+    candidates = encoding_candidates(dialect.encoding)
+    if file_path.stat().st_size <= SNIFF_BYTES:
+        return candidates[0]
+    return next((encoding for encoding in candidates if _decodes_file(file_path, encoding)), None)
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def engine_order(engine: str = "auto", file_size: int | None = None) -> list[str]:
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Motor CSV no soportado: {engine}. Usa {', '.join(CSV_ENGINES)}")
+    if engine == "auto":
+        large = file_size is None or file_size >= PYARROW_MIN_BYTES
+        return ["pyarrow", "c", "python"] if large and pyarrow_available() else ["c", "python"]
+    if engine == "pyarrow" and not pyarrow_available():
+        raise ImportError("El motor pyarrow requiere instalar pyarrow")
+    return {"pyarrow": ["pyarrow", "c", "python"], "c": ["c", "python"], "python": ["python"]}[engine]
+
+
+def _mangle_header(row: list[str]) -> list[str]:
+    names = [name or f"Unnamed: {idx}" for idx, name in enumerate(row)]
+    unnamed = [idx for idx, name in enumerate(row) if not name]
+    named = [idx for idx, name in enumerate(row) if name]
+    counts: dict[str, int] = {}
+    for idx in named + unnamed:
+        name = original = names[idx]
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts.get(name, 0)
+        names[idx] = name
+        counts[name] = count + 1
+    return names
+
+
+def _scan_header(file_path: Path, sep: str, encoding: str) -> tuple[list[str], int]:
+    with file_path.open("r", encoding=encoding, newline="") as handle:
+        for position, row in enumerate(csv.reader(handle, delimiter=sep), start=1):
+            if row:
+                if row[0].startswith("\ufeff"):
+                    row[0] = row[0][1:]
+                return _mangle_header(row), position
+    raise EmptyDataError("No columns to parse from file")
+
+
+def read_csv_header(file_path: Path, sep: str, encoding: str) -> list[str]:
+    return _scan_header(file_path, sep, encoding)[0]
+
+
+def _iter_pyarrow(
+    file_path: Path,
+    sep: str,
+    encoding: str,
+    chunk_rows: int | None,
+    usecols: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    names, header_rows = _scan_header(file_path, sep, encoding)
+    selected = names if usecols is None else [name for name in names if name in set(usecols)]
+    read_options = pa_csv.ReadOptions(column_names=names, skip_rows=header_rows, encoding=encoding)
+    parse_options = pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in names},
+        null_values=list(PANDAS_NA_STRINGS),
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=True,
+        include_columns=selected,
+    )
+
+    def to_frame(data: object) -> pd.DataFrame:
+        frame = data.to_pandas()
+        frame.columns = selected
+        for idx, column in enumerate(data.columns):
+            if column.null_count:
+                values = frame.iloc[:, idx].to_numpy(dtype=object, copy=True)
+                values[column.is_null().to_numpy(zero_copy_only=False)] = np.nan
+                frame.isetitem(idx, values)
+        return frame
+
+    if chunk_rows is None:
+        yield to_frame(pa_csv.read_csv(file_path, read_options, parse_options, convert_options))
+        return
+
+    emitted = False
+    with pa_csv.open_csv(file_path, read_options, parse_options, convert_options) as reader:
+        for batch in reader:
+            if batch.num_rows:
+                emitted = True
+                yield to_frame(batch)
+    if not emitted:
+        yield pd.DataFrame(columns=selected, dtype=object)
+
+
+def _iter_engine(
+    engine: str,
+    file_path: Path,
+    sep: str,
+    encoding: str,
+    chunk_rows: int | None,
+    usecols: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    if engine == "pyarrow":
+        yield from _iter_pyarrow(file_path, sep, encoding, chunk_rows, usecols)
+        return
+
+    positions = None
+    if usecols is not None:
+        wanted = set(usecols)
+        positions = [idx for idx, name in enumerate(read_csv_header(file_path, sep, encoding)) if name in wanted]
+
+    if chunk_rows is None:
+        yield pd.read_csv(file_path, dtype=object, sep=sep, encoding=encoding, engine=engine, usecols=positions)
+        return
+
+    with pd.read_csv(
+        file_path, dtype=object, sep=sep, encoding=encoding, engine=engine, chunksize=chunk_rows, usecols=positions
+    ) as reader:
+        yield from reader
+
+
+class _PythonEngineRequired(Exception):
+    pass
+
+
+def _is_parse_error(exc: Exception) -> bool:
+    if isinstance(exc, (UnicodeDecodeError, EmptyDataError)):
+        return False
+    return isinstance(exc, (ParserError, csv.Error, ValueError))
+
+
+def iter_csv_frames(
+    file_path: Path,
+    sep: str,
+    encoding: str,
+    chunk_rows: int | None = None,
+    engine: str = "auto",
+    usecols: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    engines = engine_order(engine, file_path.stat().st_size)
+    emitted_rows = 0
+
+    while engines:
+        current = engines.pop(0)
+        skip = emitted_rows
+        try:
+            for frame in _iter_engine(current, file_path, sep, encoding, chunk_rows, usecols):
+                if usecols is None and frame.shape[1] == 1 and "python" in engines:
+                    raise _PythonEngineRequired(file_path.name)
+                if skip:
+                    dropped = min(skip, len(frame))
+                    frame = frame.iloc[dropped:]
+                    skip -= dropped
+                    if frame.empty:
+                        continue
+                emitted_rows += len(frame)
+                yield frame
+            return
+        except _PythonEngineRequired:
+            engines = ["python"]
+        except Exception as exc:
+            if not engines or not _is_parse_error(exc):
+                raise
+
+
+def read_csv_frame(
+    file_path: Path,
+    sep: str,
+    encoding: str,
+    engine: str = "auto",
+    usecols: list[str] | None = None,
+) -> pd.DataFrame:
+    return next(iter_csv_frames(file_path, sep, encoding, chunk_rows=None, engine=engine, usecols=usecols))
+
+
+def csv_text_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    if frame.shape[1] == 0:
+        return pd.DataFrame()
+
+    columns: dict[str, np.ndarray] = {}
+    for idx, name in enumerate(frame.columns):
+        values = frame.iloc[:, idx].to_numpy(dtype=object)
+        text = values.astype(str).astype(object)
+        text[pd.isna(values) | pd.Series(text).isin(PANDAS_NA_STRINGS).to_numpy()] = np.nan
+        columns[str(name)] = text
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(frame)), columns=list(columns))
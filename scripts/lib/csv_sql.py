@@ -1,16 +1,48 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
+from functools import partial
+from itertools import chain
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
 
 import pandas as pd
 from pandas.errors import EmptyDataError
 
+from .columnar import (
+    COLUMNAR_INPUT_EXTENSIONS,
+    columnar_column_names,
+    is_columnar_file,
+    iter_columnar_frames,
+)
 from .common import TEMP_SQL_DIRNAME, sanitize_name, unique_column_names
+from .conversion_cache import ConversionCache
+from .csv_reader import (
+    CSV_ENGINES,
+    encoding_candidates,
+    iter_csv_frames,
+    read_csv_frame,
+    read_csv_header,
+    resolve_file_encoding,
+    sniff_csv_dialect,
+)
+from .db_loader import ConnectionPool, create_table_statement, insert_many
+from .delta_sql import (
+    DELTA_KEY_COLUMN,
+    DELTA_STYLES,
+    DeltaTracker,
+    iter_update_statements,
+    promote_delta_index,
+    upsert_clause,
+)
+from .sql_render import render_copy_rows, render_param_rows, render_sql_rows, sql_literal
+from .table_routing import TableRouter, load_routing_file
 
 
 CSV_TABLE_MAP_STAGING_V2 = {
@@ -152,14 +184,19 @@ RENAME_MAP_STAGING_V2_RAW = {
 }
 
 IGNORE_FILE_KEYWORDS_STAGING_V2 = ("grafica", "filtro", "documents", "mettings")
+DEFAULT_TABLE_ROUTER = TableRouter.from_mapping(CSV_TABLE_MAP_STAGING_V2, IGNORE_FILE_KEYWORDS_STAGING_V2)
+
+READ_CHUNK_ROWS = 50_000
+OUTPUT_FORMATS = ("insert", "copy", "load_data")
 
 
 @dataclass
 class SqlGenerationReport:
     profile: str
-    output_path: Path
+    output_path: Path | str
     items: dict[str, int] = field(default_factory=dict)
     notes: list[str] = field(default_factory=list)
+    rows_per_second: dict[str, float] = field(default_factory=dict)
 
 
 def normalize_column_name(value: object) -> str:
@@ -175,25 +212,38 @@ def normalized_rename_map() -> dict[str, str]:
 
 
 def detect_delimiter(file_path: Path) -> str:
-    sample = file_path.read_text(encoding="utf-8", errors="ignore")[:2048]
-    try:
-        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
-        return dialect.delimiter
-    except csv.Error:
-        return ","
-
-
-def read_csv_flexible(file_path: Path, preferred_encoding: str = "utf-8") -> tuple[pd.DataFrame, str]:
-    delimiter = detect_delimiter(file_path)
-    candidates = [preferred_encoding, "utf-8-sig", "utf-8", "latin-1"]
+    return sniff_csv_dialect(file_path).delimiter
+
+
+def _select_usecols(
+    header: list[str],
+    select_columns: Callable[[list[str]], list[str]] | None,
+) -> list[str] | None:
+    if select_columns is None or len(header) <= 1:
+        return None
+    selected = select_columns(header)
+    return None if len(selected) == len(header) else selected
+
+
+def read_csv_flexible(
+    file_path: Path,
+    preferred_encoding: str = "utf-8",
+    csv_engine: str = "auto",
+    select_columns: Callable[[list[str]], list[str]] | None = None,
+) -> tuple[pd.DataFrame, str]:
+    dialect = sniff_csv_dialect(file_path, preferred_encoding)
     tried: list[str] = []
 
-    for encoding in candidates:
-        if encoding in tried:
-            continue
+    for encoding in encoding_candidates(dialect.encoding):
         tried.append(encoding)
         try:
-            frame = pd.read_csv(file_path, dtype=object, sep=delimiter, encoding=encoding, engine="python")
+            usecols = None
+            if select_columns is not None:
+                header = read_csv_header(file_path, dialect.delimiter, encoding)
+                usecols = _select_usecols(header, select_columns)
+                if usecols is not None and not usecols:
+                    return pd.DataFrame(columns=header), encoding
+            frame = read_csv_frame(file_path, dialect.delimiter, encoding, engine=csv_engine, usecols=usecols)
             return frame, encoding
         except UnicodeDecodeError:
             continue
@@ -203,208 +253,1034 @@ def read_csv_flexible(file_path: Path, preferred_encoding: str = "utf-8") -> tup
     raise ValueError(f"No se pudo leer {file_path.name} con encodings: {', '.join(tried)}")
 
 
-def sql_literal(value: object) -> str:
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return "NULL"
+def iter_csv_chunks(
+    file_path: Path,
+    delimiter: str,
+    encoding: str,
+    chunk_rows: int = READ_CHUNK_ROWS,
+    csv_engine: str = "auto",
+) -> Iterator[pd.DataFrame]:
+    yield from iter_csv_frames(file_path, delimiter, encoding, chunk_rows=chunk_rows, engine=csv_engine)
 
-    if isinstance(value, str):
-        trimmed = value.strip()
-        if not trimmed:
-            return "NULL"
-        escaped = trimmed.replace("'", "''")
-        return f"'{escaped}'"
 
-    if isinstance(value, (int, float)) and not pd.isna(value):
-        return str(value)
+def sql_column_names(frame: pd.DataFrame) -> list[str]:
+    return unique_column_names([sanitize_name(str(col), fallback="columna") for col in frame.columns.tolist()])
 
-    if isinstance(value, (pd.Timestamp, datetime)):
-        return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
 
-    text = str(value).strip()
-    if not text:
-        return "NULL"
+def sql_column_list(frame: pd.DataFrame) -> str:
+    return ", ".join(sql_column_names(frame))
 
-    escaped = text.replace("'", "''")
-    return f"'{escaped}'"
 
+def iter_insert_statements(
+    frames: Iterable[pd.DataFrame],
+    table_name: str,
+    chunk_size: int = 500,
+    suffix: str = "",
+) -> Iterator[str]:
+    column_sql: str | None = None
+    pending: list[str] = []
+
+    for frame in frames:
+        if column_sql is None:
+            column_sql = sql_column_list(frame)
+
+        rows_sql = pending + render_sql_rows(frame)
+        complete = len(rows_sql) - (len(rows_sql) % chunk_size)
+        for start in range(0, complete, chunk_size):
+            yield (
+                f"INSERT INTO {table_name} ({column_sql}) VALUES\n"
+                + ",\n".join(rows_sql[start : start + chunk_size])
+                + suffix
+                + ";\n"
+            )
+        pending = rows_sql[complete:]
 
-def build_insert_statements(df: pd.DataFrame, table_name: str, chunk_size: int = 500) -> str:
-    columns = unique_column_names([sanitize_name(str(col), fallback="columna") for col in df.columns.tolist()])
-    df = df.copy()
-    df.columns = columns
+    if pending:
+        yield f"INSERT INTO {table_name} ({column_sql}) VALUES\n" + ",\n".join(pending) + suffix + ";\n"
 
-    statement_blocks: list[str] = []
-    column_sql = ", ".join(columns)
 
-    for start in range(0, len(df), chunk_size):
-        chunk = df.iloc[start : start + chunk_size]
-        rows_sql = []
-        for row in chunk.itertuples(index=False, name=None):
-            values_sql = ", ".join(sql_literal(value) for value in row)
-            rows_sql.append(f"({values_sql})")
+def write_insert_statements(
+    handle: TextIO,
+    frames: Iterable[pd.DataFrame],
+    table_name: str,
+    chunk_size: int = 500,
+    suffix: str = "",
+) -> int:
+    row_count = 0
+
+    def counted() -> Iterator[pd.DataFrame]:
+        nonlocal row_count
+        for frame in frames:
+            row_count += len(frame)
+            yield frame
+
+    statements = iter_insert_statements(counted(), table_name=table_name, chunk_size=chunk_size, suffix=suffix)
+    for index, statement in enumerate(statements):
+        if index:
+            handle.write("\n")
+        handle.write(statement)
+    return row_count
+
+
+def write_copy_statement(handle: TextIO, frames: Iterable[pd.DataFrame], table_name: str) -> int:
+    row_count = 0
+    for frame in frames:
+        lines = render_copy_rows(frame)
+        if not lines:
+            continue
+        if not row_count:
+            handle.write(f"COPY {table_name} ({sql_column_list(frame)}) FROM STDIN;\n")
+        handle.write("\n".join(lines) + "\n")
+        row_count += len(lines)
+
+    if row_count:
+        handle.write("\\.\n")
+    return row_count
+
+
+def write_load_data_statement(
+    handle: TextIO,
+    frames: Iterable[pd.DataFrame],
+    table_name: str,
+    data_file: Path,
+) -> int:
+    row_count = 0
+    column_sql: str | None = None
+    with data_file.open("w", encoding="utf-8", newline="") as data_handle:
+        for frame in frames:
+            if column_sql is None:
+                column_sql = sql_column_list(frame)
+            lines = render_copy_rows(frame)
+            if lines:
+                data_handle.write("\n".join(lines) + "\n")
+                row_count += len(lines)
+
+    if not row_count:
+        data_file.unlink(missing_ok=True)
+        return 0
+
+    location = data_file.resolve().as_posix().replace("\\", "\\\\").replace("'", "\\'")
+    handle.write(
+        f"LOAD DATA LOCAL INFILE '{location}'\n"
+        f"INTO TABLE {table_name}\n"
+        "CHARACTER SET utf8mb4\n"
+        "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'\n"
+        "LINES TERMINATED BY '\\n'\n"
+        f"({column_sql});\n"
+    )
+    return row_count
 
-        if rows_sql:
-            statement = (
-                f"INSERT INTO {table_name} ({column_sql}) VALUES\n"
-                + ",\n".join(rows_sql)
-                + ";\n"
-            )
-            statement_blocks.append(statement)
 
+def write_table_rows(
+    handle: TextIO,
+    frames: Iterable[pd.DataFrame],
+    table_name: str,
+    output_format: str = "insert",
+    chunk_size: int = 500,
+    data_file: Path | None = None,
+) -> int:
+    if output_format == "copy":
+        return write_copy_statement(handle, frames, table_name=table_name)
+    if output_format == "load_data":
+        if data_file is None:
+            raise ValueError("El formato load_data requiere un archivo de datos")
+        return write_load_data_statement(handle, frames, table_name=table_name, data_file=data_file)
+    if output_format == "insert":
+        return write_insert_statements(handle, frames, table_name=table_name, chunk_size=chunk_size)
+    raise ValueError(f"Formato de salida no soportado: {output_format}")
+
+
+def build_insert_statements(df: pd.DataFrame, table_name: str, chunk_size: int = 500) -> str:
+    statement_blocks = list(iter_insert_statements([df], table_name=table_name, chunk_size=chunk_size))
     if not statement_blocks:
         return f"-- No hay filas para insertar en {table_name}\n"
     return "\n".join(statement_blocks)
 
 
-def csv_to_insert_sql_generic(
-    source_path: Path,
-    output_dir: Path | None = None,
-    table_prefix: str = "",
-    encoding: str = "utf-8",
+def write_table_sql_file(
+    sql_file: Path,
+    frames: Iterable[pd.DataFrame],
+    table_name: str,
     chunk_size: int = 500,
-) -> SqlGenerationReport:
+    output_format: str = "insert",
+) -> int:
+    with sql_file.open("w", encoding="utf-8") as handle:
+        row_count = write_table_rows(
+            handle,
+            frames,
+            table_name=table_name,
+            output_format=output_format,
+            chunk_size=chunk_size,
+            data_file=sql_file.with_suffix(".tsv"),
+        )
+        if not row_count:
+            handle.write(f"-- No hay filas para insertar en {table_name}\n")
+    return row_count
+
+
+def csv_to_sql_file(
+    csv_file: Path,
+    sql_file: Path,
+    table_name: str,
+    preferred_encoding: str = "utf-8",
+    chunk_size: int = 500,
+    output_format: str = "insert",
+    csv_engine: str = "auto",
+) -> tuple[int, str]:
+    chunk_rows = chunk_size * max(1, READ_CHUNK_ROWS // chunk_size)
+    if is_columnar_file(csv_file):
+        frames = (chunk.dropna(axis=0, how="all") for chunk in iter_columnar_frames(csv_file, batch_rows=chunk_rows))
+        return write_table_sql_file(sql_file, frames, table_name, chunk_size, output_format), preferred_encoding
+
+    dialect = sniff_csv_dialect(csv_file, preferred_encoding)
+    tried: list[str] = []
+
+    for encoding in encoding_candidates(dialect.encoding):
+        tried.append(encoding)
+        frames = (
+            chunk.dropna(axis=0, how="all")
+            for chunk in iter_csv_chunks(csv_file, dialect.delimiter, encoding, chunk_rows, csv_engine)
+        )
+        try:
+            return write_table_sql_file(sql_file, frames, table_name, chunk_size, output_format), encoding
+        except UnicodeDecodeError:
+            continue
+        except EmptyDataError:
+            sql_file.with_suffix(".tsv").unlink(missing_ok=True)
+            sql_file.write_text(f"-- No hay filas para insertar en {table_name}\n", encoding="utf-8")
+            return 0, encoding
+
+    raise ValueError(f"No se pudo leer {csv_file.name} con encodings: {', '.join(tried)}")
+
+
+def collect_csv_files(source_path: Path) -> list[Path]:
     if not source_path.exists():
         raise FileNotFoundError(f"No existe la ruta: {source_path}")
 
-    csv_files: list[Path]
     if source_path.is_file():
-        csv_files = [source_path]
-    else:
-        csv_files = sorted(source_path.glob("*.csv"))
+        return [source_path]
 
+    csv_files = sorted(
+        path
+        for path in source_path.iterdir()
+        if path.suffix == ".csv" or (path.is_file() and path.suffix.lower() in COLUMNAR_INPUT_EXTENSIONS)
+    )
     if not csv_files:
-        raise ValueError("No se encontraron archivos CSV")
+        raise ValueError("No se encontraron archivos CSV, Parquet, Arrow o Feather")
+    return csv_files
+
+
+def csv_to_insert_sql_generic(
+    source_path: Path,
+    output_dir: Path | None = None,
+    table_prefix: str = "",
+    encoding: str = "utf-8",
+    chunk_size: int = 500,
+    output_format: str = "insert",
+    csv_engine: str = "auto",
+    use_cache: bool = True,
+) -> SqlGenerationReport:
+    csv_files = collect_csv_files(source_path)
 
     if output_dir is None:
         output_dir = source_path.parent / TEMP_SQL_DIRNAME if source_path.is_file() else source_path / TEMP_SQL_DIRNAME
     output_dir.mkdir(parents=True, exist_ok=True)
 
     report = SqlGenerationReport(profile="generic", output_path=output_dir)
-    for csv_file in csv_files:
-        table_name = sanitize_name(f"{table_prefix}{csv_file.stem}", fallback="tabla")
-        try:
-            df, used_encoding = read_csv_flexible(csv_file, preferred_encoding=encoding)
-            df.dropna(axis=0, how="all", inplace=True)
-            sql_content = build_insert_statements(df, table_name=table_name, chunk_size=chunk_size)
-            row_count = len(df)
+    with ConversionCache.beside(output_dir, enabled=use_cache) as cache:
+        for csv_file in csv_files:
+            table_name = sanitize_name(f"{table_prefix}{csv_file.stem}", fallback="tabla")
+            sql_file = output_dir / f"{table_name}.sql"
+            data_file = sql_file.with_suffix(".tsv")
+            options = {
+                "table_name": table_name,
+                "encoding": encoding,
+                "chunk_size": chunk_size,
+                "output_format": output_format,
+                "data_file": str(data_file.resolve()) if output_format == "load_data" else "",
+            }
+            key = cache.entry_key("sql_generic", csv_file, options)
+            meta = cache.lookup(key)
+            if meta is None:
+                row_count, used_encoding = csv_to_sql_file(
+                    csv_file,
+                    sql_file,
+                    table_name=table_name,
+                    preferred_encoding=encoding,
+                    chunk_size=chunk_size,
+                    output_format=output_format,
+                    csv_engine=csv_engine,
+                )
+                outputs = {sql_file.name: sql_file}
+                if output_format == "load_data" and data_file.exists():
+                    outputs[data_file.name] = data_file
+                cache.store(key, {"rows": row_count, "encoding": used_encoding}, outputs)
+            else:
+                row_count, used_encoding = int(meta["rows"]), str(meta["encoding"])
+                if output_format == "load_data" and data_file.name not in meta["files"]:
+                    data_file.unlink(missing_ok=True)
+                for name in meta["files"]:
+                    cache.restore(key, name, output_dir / name)
+
             if used_encoding.lower() != encoding.lower():
                 report.notes.append(f"{csv_file.name}: encoding detectado '{used_encoding}'")
-        except EmptyDataError:
-            sql_content = f"-- CSV vacio: {csv_file.name}\n-- No hay filas para insertar en {table_name}\n"
-            row_count = 0
+            report.items[sql_file.name] = row_count
 
-        sql_file = output_dir / f"{table_name}.sql"
-        sql_file.write_text(sql_content, encoding="utf-8")
-        report.items[sql_file.name] = row_count
+    report.notes.extend(cache.notes)
+    return report
+
+
+def frames_to_insert_sql_generic(
+    frames: Iterable[tuple[str, pd.DataFrame]],
+    output_dir: Path,
+    table_prefix: str = "",
+    chunk_size: int = 500,
+    output_format: str = "insert",
+) -> SqlGenerationReport:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Formato de salida no soportado: {output_format}")
+    output_dir.mkdir(parents=True, exist_ok=True)
 
+    report = SqlGenerationReport(profile="generic", output_path=output_dir)
+    for source_name, df in frames:
+        table_name = sanitize_name(f"{table_prefix}{Path(source_name).with_suffix('').as_posix()}", fallback="tabla")
+        sql_file = output_dir / f"{table_name}.sql"
+        report.items[sql_file.name] = write_table_sql_file(
+            sql_file, [df.dropna(axis=0, how="all")], table_name, chunk_size, output_format
+        )
     return report
 
 
-def resolve_target_table(base_name: str) -> str | None:
-    if base_name in CSV_TABLE_MAP_STAGING_V2:
-        return CSV_TABLE_MAP_STAGING_V2[base_name]
+def resolve_target_table(base_name: str, router: TableRouter | None = None) -> str | None:
+    return (router or DEFAULT_TABLE_ROUTER).resolve(base_name)
+
+
+def route_warehouse_file(
+    csv_file: Path,
+    source_name: str | None = None,
+    router: TableRouter | None = None,
+) -> tuple[str | None, str | None]:
+    router = router or DEFAULT_TABLE_ROUTER
+    base_name = sanitize_name(csv_file.stem, fallback="archivo")
+    target_table = router.resolve(base_name)
+    if target_table:
+        return target_table, None
+    if router.ignores(base_name):
+        return None, None
+    return None, f"Ignorado sin mapeo: {source_name or csv_file.name}"
+
+
+def project_staging_frame(
+    df: pd.DataFrame,
+    target_table: str,
+    rename_map: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    rename_map = rename_map if rename_map is not None else normalized_rename_map()
+    normalized_columns = [normalize_column_name(col) for col in df.columns.tolist()]
+    df = df.copy()
+    df.columns = normalized_columns
 
-    for key, value in CSV_TABLE_MAP_STAGING_V2.items():
-        if key in base_name:
-            return value
+    for source_col, target_col in rename_map.items():
+        if source_col in df.columns and target_col not in df.columns:
+            df[target_col] = df[source_col]
 
-    return None
+    if "organizacion" in df.columns and "org_name_raw" not in df.columns:
+        df["org_name_raw"] = df["organizacion"]
 
+    if "email" in df.columns and "correo" not in df.columns:
+        df["correo"] = df["email"]
 
-def csv_to_insert_sql_warehouse_clean(
-    source_path: Path,
-    output_file: Path | None = None,
-    encoding: str = "utf-8",
-    wrap_transaction: bool = True,
-) -> SqlGenerationReport:
-    if not source_path.exists():
-        raise FileNotFoundError(f"No existe la ruta: {source_path}")
+    df = df.loc[:, ~df.columns.duplicated(keep="first")]
+    df.dropna(axis=0, how="all", inplace=True)
 
-    if source_path.is_file():
-        csv_files = [source_path]
-        default_output_file = source_path.parent / TEMP_SQL_DIRNAME / "warehouse_seed.sql"
+    allowed = ALLOWED_COLUMNS_STAGING_V2.get(target_table)
+    if allowed:
+        final_cols = [column for column in allowed if column in df.columns]
     else:
-        csv_files = sorted(source_path.glob("*.csv"))
-        default_output_file = source_path / TEMP_SQL_DIRNAME / "warehouse_seed.sql"
-
-    if not csv_files:
-        raise ValueError("No se encontraron archivos CSV")
+        final_cols = [column for column in df.columns if column]
+    return df[final_cols]
+
+
+def staging_source_columns(
+    columns: list[str],
+    target_table: str,
+    rename_map: dict[str, str] | None = None,
+) -> list[str]:
+    allowed = ALLOWED_COLUMNS_STAGING_V2.get(target_table)
+    if not allowed:
+        return list(columns)
+
+    rename_map = rename_map if rename_map is not None else normalized_rename_map()
+    copies = [*rename_map.items(), ("organizacion", "org_name_raw"), ("email", "correo")]
+    needed = set(allowed)
+    while True:
+        sources = {source for source, target in copies if target in needed} - needed
+        if not sources:
+            break
+        needed |= sources
+    return [column for column in columns if normalize_column_name(column) in needed]
+
+
+def write_warehouse_fragment(
+    handle: TextIO,
+    csv_file: Path,
+    target_table: str,
+    encoding: str = "utf-8",
+    rename_map: dict[str, str] | None = None,
+    chunk_size: int = 500,
+    single_row_inserts: bool = False,
+    output_format: str = "insert",
+    data_file: Path | None = None,
+    csv_engine: str = "auto",
+    delta: DeltaTracker | None = None,
+) -> tuple[int | None, list[str]]:
+    notes: list[str] = []
+    frames = _iter_source_frames(
+        csv_file,
+        encoding,
+        notes,
+        select_columns=partial(staging_source_columns, target_table=target_table, rename_map=rename_map),
+        csv_engine=csv_engine,
+    )
+    rows, frame_notes = write_warehouse_frames(
+        handle,
+        frames,
+        csv_file.name,
+        target_table,
+        rename_map=rename_map,
+        chunk_size=chunk_size,
+        single_row_inserts=single_row_inserts,
+        output_format=output_format,
+        data_file=data_file,
+        delta=delta,
+    )
+    return rows, notes + frame_notes
 
-    output_file = output_file or default_output_file
-    output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    rename_map = normalized_rename_map()
-    report = SqlGenerationReport(profile="warehouse_clean", output_path=output_file)
+def write_warehouse_frame(
+    handle: TextIO,
+    df: pd.DataFrame,
+    source_name: str,
+    target_table: str,
+    rename_map: dict[str, str] | None = None,
+    chunk_size: int = 500,
+    single_row_inserts: bool = False,
+    output_format: str = "insert",
+    data_file: Path | None = None,
+    delta: DeltaTracker | None = None,
+) -> tuple[int | None, list[str]]:
+    return write_warehouse_frames(
+        handle,
+        [df],
+        source_name,
+        target_table,
+        rename_map=rename_map,
+        chunk_size=chunk_size,
+        single_row_inserts=single_row_inserts,
+        output_format=output_format,
+        data_file=data_file,
+        delta=delta,
+    )
 
-    with output_file.open("w", encoding="utf-8") as handle:
-        handle.write("-- CARGA DE DATOS PARA SCHEMA V2\n")
-        if wrap_transaction:
-            handle.write("BEGIN;\n\n")
 
-        for csv_file in csv_files:
-            base_name = sanitize_name(csv_file.stem, fallback="archivo")
-            target_table = resolve_target_table(base_name)
-
-            if not target_table:
-                if not any(keyword in base_name for keyword in IGNORE_FILE_KEYWORDS_STAGING_V2):
-                    note = f"Ignorado sin mapeo: {csv_file.name}"
-                    report.notes.append(note)
-                    handle.write(f"-- WARNING: {note}\n")
+def write_warehouse_frames(
+    handle: TextIO,
+    frames: Iterable[pd.DataFrame],
+    source_name: str,
+    target_table: str,
+    rename_map: dict[str, str] | None = None,
+    chunk_size: int = 500,
+    single_row_inserts: bool = False,
+    output_format: str = "insert",
+    data_file: Path | None = None,
+    delta: DeltaTracker | None = None,
+) -> tuple[int | None, list[str]]:
+    notes: list[str] = []
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None or len(first.columns) == 0:
+        handle.write(f"-- INFO: CSV vacio {source_name}\n")
+        return 0, notes
+
+    head = project_staging_frame(first, target_table, rename_map)
+    if head.shape[1] == 0:
+        warning = f"{source_name} sin columnas validas para {target_table}"
+        notes.append(warning)
+        handle.write(f"-- WARNING: {warning}\n")
+        return None, notes
+
+    row_count = 0
+
+    def projected() -> Iterator[pd.DataFrame]:
+        nonlocal row_count
+        row_count += len(head)
+        yield head
+        for df in frames:
+            frame = project_staging_frame(df, target_table, rename_map)
+            row_count += len(frame)
+            yield frame
+
+    if delta is not None:
+        delta_chunk_size = 1 if single_row_inserts else chunk_size
+        written = _write_delta_rows(
+            handle, projected(), target_table, delta, delta_chunk_size, output_format, data_file
+        )
+        if written:
+            handle.write("\n")
+        return written, notes
+
+    if single_row_inserts and output_format == "insert":
+        col_sql = ", ".join(head.columns)
+        for frame in projected():
+            for row_sql in render_sql_rows(frame):
+                handle.write(f"INSERT INTO {target_table} ({col_sql}) VALUES {row_sql};\n")
+    elif write_table_rows(
+        handle,
+        projected(),
+        table_name=target_table,
+        output_format=output_format,
+        chunk_size=chunk_size,
+        data_file=data_file,
+    ):
+        handle.write("\n")
+
+    return row_count, notes
+
+
+def _write_delta_rows(
+    handle: TextIO,
+    frames: Iterable[pd.DataFrame],
+    target_table: str,
+    delta: DeltaTracker,
+    chunk_size: int = 500,
+    output_format: str = "insert",
+    data_file: Path | None = None,
+) -> int:
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return 0
+    changed_frames: list[pd.DataFrame] = []
+
+    def classified() -> Iterator[pd.DataFrame]:
+        for frame in chain([first], frames):
+            new_rows, changed_rows = delta.classify(frame, target_table)
+            if delta.style != "update":
+                yield frame[new_rows | changed_rows]
                 continue
+            changed_frames.append(frame[changed_rows])
+            yield frame[new_rows]
+
+    if delta.style != "update":
+        suffix = upsert_clause(first.columns.tolist(), delta.style)
+        return write_insert_statements(handle, classified(), target_table, chunk_size, suffix)
+
+    written = write_table_rows(
+        handle,
+        classified(),
+        table_name=target_table,
+        output_format=output_format,
+        chunk_size=chunk_size,
+        data_file=data_file,
+    )
+    for changed in changed_frames:
+        for statement in iter_update_statements(changed, target_table):
+            handle.write(statement)
+    return written + sum(len(changed) for changed in changed_frames)
+
+
+def default_warehouse_output_file(source_path: Path) -> Path:
+    base_dir = source_path.parent if source_path.is_file() else source_path
+    return base_dir / TEMP_SQL_DIRNAME / "warehouse_seed.sql"
+
+
+def default_delta_index_dir(output_file: Path) -> Path:
+    return output_file.parent / f"{output_file.stem}_delta"
+
+
+class WarehouseSqlWriter:
+    def __init__(
+        self,
+        output_file: Path,
+        wrap_transaction: bool = True,
+        chunk_size: int = 500,
+        single_row_inserts: bool = False,
+        output_format: str = "insert",
+        delta: bool = False,
+        delta_style: str = "update",
+        delta_deletes: bool = False,
+        delta_index_dir: Path | None = None,
+        router: TableRouter | None = None,
+    ) -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Formato de salida no soportado: {output_format}")
+        if delta and delta_style != "update" and output_format != "insert":
+            raise ValueError(f"El estilo delta {delta_style} solo aplica con output_format insert")
+
+        self.output_file = output_file
+        self.wrap_transaction = wrap_transaction
+        self.chunk_size = chunk_size
+        self.single_row_inserts = single_row_inserts
+        self.output_format = output_format
+        self.data_dir = output_file.parent / f"{output_file.stem}_data"
+        self.rename_map = normalized_rename_map()
+        self.router = router or DEFAULT_TABLE_ROUTER
+        self.report = SqlGenerationReport(profile="warehouse_clean", output_path=output_file)
+        self.tracker = None
+        if delta:
+            self.tracker = DeltaTracker(
+                delta_index_dir or default_delta_index_dir(output_file),
+                style=delta_style,
+                deletes=delta_deletes,
+            )
+        self._data_names: dict[str, int] = {}
+        self.handle: TextIO | None = None
 
-            try:
-                df, used_encoding = read_csv_flexible(csv_file, preferred_encoding=encoding)
-                if used_encoding.lower() != encoding.lower():
-                    report.notes.append(f"{csv_file.name}: encoding detectado '{used_encoding}'")
-            except EmptyDataError:
-                df = pd.DataFrame()
-
-            if df.empty and len(df.columns) == 0:
-                handle.write(f"-- INFO: CSV vacio {csv_file.name}\n")
-                report.items[f"{csv_file.name} -> {target_table}"] = 0
-                continue
+    def __enter__(self) -> WarehouseSqlWriter:
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        if self.output_format == "load_data":
+            self.data_dir.mkdir(parents=True, exist_ok=True)
 
-            normalized_columns = [normalize_column_name(col) for col in df.columns.tolist()]
-            df = df.copy()
-            df.columns = normalized_columns
+        self.handle = self.output_file.open("w", encoding="utf-8")
+        self.handle.write("-- CARGA DE DATOS PARA SCHEMA V2\n")
+        if self.wrap_transaction:
+            self.handle.write("BEGIN;\n\n")
+        return self
 
-            for source_col, target_col in rename_map.items():
-                if source_col in df.columns and target_col not in df.columns:
-                    df[target_col] = df[source_col]
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        try:
+            if exc_type is None:
+                if self.tracker is not None and self.tracker.write_deletes(self.handle, self.chunk_size):
+                    self.handle.write("\n")
+                if self.wrap_transaction:
+                    self.handle.write("\nCOMMIT;\n")
+        finally:
+            self.handle.close()
+
+        if exc_type is None and self.tracker is not None:
+            self.tracker.save()
+            self.report.notes.extend(self.tracker.notes())
+
+    def route(self, source_name: str) -> str | None:
+        target_table, note = route_warehouse_file(Path(source_name), source_name, self.router)
+        if not target_table and note:
+            self.report.notes.append(note)
+            self.handle.write(f"-- WARNING: {note}\n")
+        return target_table
+
+    def fragment_options(self, source_name: str) -> dict[str, object]:
+        base_name = sanitize_name(Path(source_name).stem, fallback="archivo")
+        seen = self._data_names.get(base_name, 0)
+        self._data_names[base_name] = seen + 1
+        data_name = base_name if not seen else f"{base_name}_{seen + 1}"
+        return {
+            "rename_map": self.rename_map,
+            "chunk_size": self.chunk_size,
+            "single_row_inserts": self.single_row_inserts,
+            "output_format": self.output_format,
+            "data_file": self.data_dir / f"{data_name}.tsv",
+        }
+
+    def record(self, source_name: str, target_table: str, rows: int | None, notes: list[str]) -> None:
+        self.report.notes.extend(notes)
+        if rows is not None:
+            self.report.items[f"{source_name} -> {target_table}"] = rows
+
+    def write_frame(self, source_name: str, df: pd.DataFrame) -> None:
+        target_table = self.route(source_name)
+        if not target_table:
+            return
+        rows, notes = write_warehouse_frame(
+            self.handle, df, source_name, target_table, delta=self.tracker, **self.fragment_options(source_name)
+        )
+        self.record(source_name, target_table, rows, notes)
 
-            if "organizacion" in df.columns and "org_name_raw" not in df.columns:
-                df["org_name_raw"] = df["organizacion"]
 
-            if "email" in df.columns and "correo" not in df.columns:
-                df["correo"] = df["email"]
+def csv_to_insert_sql_warehouse_clean(
+    source_path: Path,
+    output_file: Path | None = None,
+    encoding: str = "utf-8",
+    wrap_transaction: bool = True,
+    chunk_size: int = 500,
+    single_row_inserts: bool = False,
+    output_format: str = "insert",
+    csv_engine: str = "auto",
+    use_cache: bool = True,
+    delta: bool = False,
+    delta_style: str = "update",
+    delta_deletes: bool = False,
+    delta_index_dir: Path | None = None,
+    workers: int = 1,
+    router: TableRouter | None = None,
+) -> SqlGenerationReport:
+    csv_files = collect_csv_files(source_path)
+    writer = WarehouseSqlWriter(
+        output_file or default_warehouse_output_file(source_path),
+        wrap_transaction=wrap_transaction,
+        chunk_size=chunk_size,
+        single_row_inserts=single_row_inserts,
+        output_format=output_format,
+        delta=delta,
+        delta_style=delta_style,
+        delta_deletes=delta_deletes,
+        delta_index_dir=delta_index_dir,
+        router=router,
+    )
+    cache = ConversionCache.beside(writer.output_file.parent, enabled=use_cache and writer.tracker is None)
+    workers = max(1, min(workers, len(csv_files)))
+    if workers > 1 and writer.tracker is not None:
+        writer.report.notes.append("El modo delta se procesa en un solo proceso (se ignora --workers)")
+        workers = 1
+    with cache, writer:
+        if workers > 1:
+            _write_warehouse_parallel(writer, cache, csv_files, encoding, csv_engine, workers)
+        else:
+            _write_warehouse_sequential(writer, cache, csv_files, encoding, csv_engine)
+    writer.report.notes.extend(cache.notes)
+    return writer.report
+
+
+def _write_warehouse_sequential(
+    writer: WarehouseSqlWriter,
+    cache: ConversionCache,
+    csv_files: list[Path],
+    encoding: str,
+    csv_engine: str,
+) -> None:
+    for csv_file in csv_files:
+        target_table = writer.route(csv_file.name)
+        if not target_table:
+            continue
 
-            df = df.loc[:, ~df.columns.duplicated(keep="first")]
-            df.dropna(axis=0, how="all", inplace=True)
+        fragment_options = {"encoding": encoding, **writer.fragment_options(csv_file.name)}
+        if cache.enabled:
+            rows, notes = _cached_warehouse_fragment(
+                cache, writer.handle, csv_file, target_table, fragment_options, csv_engine
+            )
+        else:
+            rows, notes = write_warehouse_fragment(
+                writer.handle,
+                csv_file,
+                target_table,
+                csv_engine=csv_engine,
+                delta=writer.tracker,
+                **fragment_options,
+            )
+        writer.record(csv_file.name, target_table, rows, notes)
 
-            allowed = ALLOWED_COLUMNS_STAGING_V2.get(target_table)
-            if allowed:
-                final_cols = [column for column in allowed if column in df.columns]
-            else:
-                final_cols = [column for column in df.columns if column]
 
-            if not final_cols:
-                warning = f"{csv_file.name} sin columnas validas para {target_table}"
-                report.notes.append(warning)
-                handle.write(f"-- WARNING: {warning}\n")
-                continue
+def frames_to_insert_sql_warehouse_clean(
+    frames: Iterable[tuple[str, pd.DataFrame]],
+    output_file: Path,
+    wrap_transaction: bool = True,
+    chunk_size: int = 500,
+    single_row_inserts: bool = False,
+    output_format: str = "insert",
+    delta: bool = False,
+    delta_style: str = "update",
+    delta_deletes: bool = False,
+    delta_index_dir: Path | None = None,
+    router: TableRouter | None = None,
+) -> SqlGenerationReport:
+    with WarehouseSqlWriter(
+        output_file,
+        wrap_transaction=wrap_transaction,
+        chunk_size=chunk_size,
+        single_row_inserts=single_row_inserts,
+        output_format=output_format,
+        delta=delta,
+        delta_style=delta_style,
+        delta_deletes=delta_deletes,
+        delta_index_dir=delta_index_dir,
+        router=router,
+    ) as writer:
+        for source_name, df in frames:
+            writer.write_frame(source_name, df)
+    return writer.report
+
+
+def _warehouse_fragment_key(
+    cache: ConversionCache,
+    csv_file: Path,
+    target_table: str,
+    fragment_options: dict[str, object],
+) -> str:
+    load_data = fragment_options["output_format"] == "load_data"
+    key_options = {
+        **fragment_options,
+        "data_file": str(Path(fragment_options["data_file"]).resolve()) if load_data else "",
+        "target_table": target_table,
+        "allowed_columns": ALLOWED_COLUMNS_STAGING_V2.get(target_table),
+    }
+    return cache.entry_key("sql_warehouse", csv_file, key_options)
+
+
+def _replay_warehouse_fragment(
+    cache: ConversionCache,
+    key: str,
+    meta: dict[str, object],
+    handle: TextIO,
+    data_file: Path,
+) -> tuple[int | None, list[str]]:
+    with cache.blob_path(key, "fragment.sql").open("r", encoding="utf-8") as fragment:
+        shutil.copyfileobj(fragment, handle)
+    if data_file.name in meta["files"]:
+        cache.restore(key, data_file.name, data_file)
+    rows = meta["rows"]
+    return (None if rows is None else int(rows)), [str(note) for note in meta["notes"]]
+
+
+def _append_warehouse_fragment(
+    cache: ConversionCache,
+    key: str | None,
+    handle: TextIO,
+    spool_path: Path,
+    fragment_options: dict[str, object],
+    rows: int | None,
+    notes: list[str],
+) -> None:
+    with spool_path.open("r", encoding="utf-8") as fragment:
+        shutil.copyfileobj(fragment, handle)
+    if key is None:
+        return
+
+    data_file = Path(fragment_options["data_file"])
+    outputs = {"fragment.sql": spool_path}
+    if fragment_options["output_format"] == "load_data" and data_file.exists():
+        outputs[data_file.name] = data_file
+    cache.store(key, {"rows": rows, "notes": notes}, outputs)
+
+
+def _cached_warehouse_fragment(
+    cache: ConversionCache,
+    handle: TextIO,
+    csv_file: Path,
+    target_table: str,
+    fragment_options: dict[str, object],
+    csv_engine: str = "auto",
+) -> tuple[int | None, list[str]]:
+    key = _warehouse_fragment_key(cache, csv_file, target_table, fragment_options)
+    meta = cache.lookup(key)
+    if meta is not None:
+        return _replay_warehouse_fragment(cache, key, meta, handle, Path(fragment_options["data_file"]))
+
+    spool = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=Path(handle.name).parent, suffix=".fragment", delete=False
+    )
+    spool_path = Path(spool.name)
+    try:
+        with spool:
+            rows, notes = write_warehouse_fragment(
+                spool, csv_file, target_table, csv_engine=csv_engine, **fragment_options
+            )
+        _append_warehouse_fragment(cache, key, handle, spool_path, fragment_options, rows, notes)
+        return rows, notes
+    finally:
+        spool_path.unlink(missing_ok=True)
+
+
+def _render_warehouse_fragment(
+    task: tuple[Path, Path, str, dict[str, object], str],
+) -> tuple[int | None, list[str]]:
+    spool_path, csv_file, target_table, fragment_options, csv_engine = task
+    with spool_path.open("w", encoding="utf-8") as spool:
+        return write_warehouse_fragment(spool, csv_file, target_table, csv_engine=csv_engine, **fragment_options)
+
+
+def _write_warehouse_parallel(
+    writer: WarehouseSqlWriter,
+    cache: ConversionCache,
+    csv_files: list[Path],
+    encoding: str,
+    csv_engine: str,
+    workers: int,
+) -> None:
+    spool_dir = Path(tempfile.mkdtemp(prefix=".fragments_", dir=writer.output_file.parent))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            jobs: list[tuple[Path, dict[str, object], str | None, dict[str, object] | None, Future | None]] = []
+            for index, csv_file in enumerate(csv_files):
+                target_table, _ = route_warehouse_file(Path(csv_file.name), csv_file.name, writer.router)
+                if not target_table:
+                    jobs.append((csv_file, {}, None, None, None))
+                    continue
+
+                fragment_options = {"encoding": encoding, **writer.fragment_options(csv_file.name)}
+                key = meta = future = None
+                if cache.enabled:
+                    key = _warehouse_fragment_key(cache, csv_file, target_table, fragment_options)
+                    meta = cache.lookup(key)
+                if meta is None:
+                    task = (spool_dir / f"{index}.sql", csv_file, target_table, fragment_options, csv_engine)
+                    future = executor.submit(_render_warehouse_fragment, task)
+                jobs.append((csv_file, fragment_options, key, meta, future))
+
+            for index, (csv_file, fragment_options, key, meta, future) in enumerate(jobs):
+                target_table = writer.route(csv_file.name)
+                if not target_table:
+                    continue
+                if meta is not None:
+                    data_file = Path(fragment_options["data_file"])
+                    rows, notes = _replay_warehouse_fragment(cache, key, meta, writer.handle, data_file)
+                else:
+                    rows, notes = future.result()
+                    spool_path = spool_dir / f"{index}.sql"
+                    _append_warehouse_fragment(cache, key, writer.handle, spool_path, fragment_options, rows, notes)
+                    spool_path.unlink()
+                writer.record(csv_file.name, target_table, rows, notes)
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+def _iter_source_frames(
+    csv_file: Path,
+    encoding: str,
+    notes: list[str],
+    select_columns: Callable[[list[str]], list[str]] | None = None,
+    csv_engine: str = "auto",
+    chunk_rows: int = READ_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    if is_columnar_file(csv_file):
+        columns = columnar_column_names(csv_file)
+        selected = select_columns(columns) if select_columns is not None else None
+        if selected is not None and not selected:
+            yield pd.DataFrame(columns=columns)
+            return
+        yield from iter_columnar_frames(csv_file, selected, batch_rows=chunk_rows)
+        return
+
+    dialect = sniff_csv_dialect(csv_file, encoding)
+    used_encoding = resolve_file_encoding(csv_file, dialect)
+    if used_encoding is None:
+        tried = ", ".join(encoding_candidates(dialect.encoding))
+        raise ValueError(f"No se pudo leer {csv_file.name} con encodings: {tried}")
+    if used_encoding.lower() != encoding.lower():
+        notes.append(f"{csv_file.name}: encoding detectado '{used_encoding}'")
 
-            col_sql = ", ".join(final_cols)
-            inserted_rows = 0
-            for row in df[final_cols].itertuples(index=False, name=None):
-                values = ", ".join(sql_literal(value) for value in row)
-                handle.write(f"INSERT INTO {target_table} ({col_sql}) VALUES ({values});\n")
-                inserted_rows += 1
+    try:
+        header = read_csv_header(csv_file, dialect.delimiter, used_encoding)
+        usecols = _select_usecols(header, select_columns)
+        if usecols is not None and not usecols:
+            yield pd.DataFrame(columns=header)
+            return
+        yield from iter_csv_frames(
+            csv_file, dialect.delimiter, used_encoding, chunk_rows=chunk_rows, engine=csv_engine, usecols=usecols
+        )
+    except EmptyDataError:
+        return
+
+
+def _iter_load_frames(
+    csv_file: Path,
+    table_name: str,
+    profile: str,
+    encoding: str,
+    rename_map: dict[str, str],
+    notes: list[str],
+    csv_engine: str = "auto",
+    chunk_rows: int = READ_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    select_columns = None
+    if profile != "generic":
+        select_columns = partial(staging_source_columns, target_table=table_name, rename_map=rename_map)
+
+    for df in _iter_source_frames(csv_file, encoding, notes, select_columns, csv_engine, chunk_rows):
+        if len(df.columns) == 0:
+            return
+        if profile == "generic":
+            df = df.dropna(axis=0, how="all")
+            df.columns = sql_column_names(df)
+            yield df
+            continue
 
-            report.items[f"{csv_file.name} -> {target_table}"] = inserted_rows
+        frame = project_staging_frame(df, table_name, rename_map)
+        if frame.shape[1] == 0:
+            notes.append(f"{csv_file.name} sin columnas validas para {table_name}")
+            return
+        yield frame
 
-        if wrap_transaction:
-            handle.write("\nCOMMIT;\n")
 
+def load_csv_to_database(
+    source_path: Path,
+    dsn: str,
+    profile: str = "warehouse_clean",
+    table_prefix: str = "",
+    encoding: str = "utf-8",
+    chunk_size: int = 500,
+    workers: int = 1,
+    create_tables: bool = False,
+    csv_engine: str = "auto",
+    router: TableRouter | None = None,
+) -> SqlGenerationReport:
+    csv_files = collect_csv_files(source_path)
+    rename_map = normalized_rename_map()
+    routing_notes: list[str] = []
+    tables: dict[str, list[Path]] = {}
+
+    for csv_file in csv_files:
+        if profile == "generic":
+            table_name: str | None = sanitize_name(f"{table_prefix}{csv_file.stem}", fallback="tabla")
+        else:
+            table_name, note = route_warehouse_file(csv_file, router=router)
+            if note:
+                routing_notes.append(note)
+        if table_name:
+            tables.setdefault(table_name, []).append(csv_file)
+
+    chunk_rows = chunk_size * max(1, READ_CHUNK_ROWS // chunk_size)
+
+    def load_table(table_name: str, files: list[Path]) -> tuple[dict[Path, int], list[str], float]:
+        loaded: dict[Path, int] = {}
+        notes: list[str] = []
+        insert_seconds = 0.0
+        created = not create_tables
+        with pool.connection() as conn:
+            try:
+                for csv_file in files:
+                    loaded[csv_file] = 0
+                    frames = _iter_load_frames(
+                        csv_file, table_name, profile, encoding, rename_map, notes, csv_engine, chunk_rows
+                    )
+                    for frame in frames:
+                        columns = frame.columns.tolist()
+                        if not created:
+                            table_columns = ALLOWED_COLUMNS_STAGING_V2.get(table_name, columns)
+                            if profile == "generic":
+                                table_columns = columns
+                            cursor = conn.cursor()
+                            cursor.execute(create_table_statement(table_name, table_columns))
+                            cursor.close()
+                            created = True
+                        rows = render_param_rows(frame)
+                        started = time.perf_counter()
+                        loaded[csv_file] += insert_many(
+                            conn, pool.target.placeholder, table_name, columns, rows, batch_size=chunk_size
+                        )
+                        insert_seconds += time.perf_counter() - started
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return loaded, notes, insert_seconds
+
+    with ConnectionPool(dsn, size=workers) as pool:
+        report = SqlGenerationReport(profile=profile, output_path=pool.target.dsn, notes=routing_notes)
+        if workers > pool.size:
+            report.notes.append(f"{pool.target.kind} admite un solo escritor: se carga una tabla a la vez")
+        with ThreadPoolExecutor(max_workers=max(1, min(pool.size, len(tables) or 1))) as executor:
+            futures = {name: executor.submit(load_table, name, files) for name, files in tables.items()}
+            results = {name: future.result() for name, future in futures.items()}
+
+    loaded_rows: dict[Path, int] = {}
+    for table_name, (loaded, notes, insert_seconds) in results.items():
+        loaded_rows.update(loaded)
+        report.notes.extend(notes)
+        total = sum(loaded.values())
+        report.rows_per_second[table_name] = total / insert_seconds if insert_seconds > 0 else float(total)
+
+    for table_name, files in tables.items():
+        for csv_file in files:
+            report.items[f"{csv_file.name} -> {table_name}"] = loaded_rows[csv_file]
     return report
 
 
@@ -417,14 +1293,32 @@ def csv_to_insert_sql(
     encoding: str = "utf-8",
     chunk_size: int = 500,
     wrap_transaction: bool = True,
+    single_row_inserts: bool = False,
+    output_format: str = "insert",
+    csv_engine: str = "auto",
+    use_cache: bool = True,
+    delta: bool = False,
+    delta_style: str = "update",
+    delta_deletes: bool = False,
+    delta_index_dir: Path | None = None,
+    workers: int = 1,
+    router: TableRouter | None = None,
 ) -> SqlGenerationReport:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Formato de salida no soportado: {output_format}")
+
     if profile == "generic":
+        if delta:
+            raise ValueError("El modo delta solo aplica al perfil warehouse_clean")
         return csv_to_insert_sql_generic(
             source_path=source_path,
             output_dir=output_dir,
             table_prefix=table_prefix,
             encoding=encoding,
             chunk_size=chunk_size,
+            output_format=output_format,
+            csv_engine=csv_engine,
+            use_cache=use_cache,
         )
 
     if profile == "warehouse_clean":
@@ -433,14 +1327,27 @@ def csv_to_insert_sql(
             output_file=output_file,
             encoding=encoding,
             wrap_transaction=wrap_transaction,
+            chunk_size=chunk_size,
+            single_row_inserts=single_row_inserts,
+            output_format=output_format,
+            csv_engine=csv_engine,
+            use_cache=use_cache,
+            delta=delta,
+            delta_style=delta_style,
+            delta_deletes=delta_deletes,
+            delta_index_dir=delta_index_dir,
+            workers=workers,
+            router=router,
         )
 
     raise ValueError(f"Perfil SQL no soportado: {profile}")
 
 
 def cli(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Generar SQL INSERT desde CSV")
-    parser.add_argument("--source-path", required=True, help="Archivo CSV o carpeta de CSV")
+    parser = argparse.ArgumentParser(description="Generar SQL INSERT desde CSV, Parquet, Arrow o Feather")
+    parser.add_argument(
+        "--source-path", required=True, help="Archivo CSV/Parquet/Arrow/Feather o carpeta con esos archivos"
+    )
     parser.add_argument(
         "--profile",
         default="warehouse_clean",
@@ -456,14 +1363,111 @@ def cli(argv: list[str] | None = None) -> int:
         action="store_true",
         help="No envolver salida con BEGIN/COMMIT (warehouse_clean)",
     )
+    parser.add_argument(
+        "--single-row-inserts",
+        action="store_true",
+        help="Formato legacy: un INSERT por fila (warehouse_clean)",
+    )
+    parser.add_argument(
+        "--output-format",
+        default="insert",
+        choices=OUTPUT_FORMATS,
+        help="insert, copy (PostgreSQL COPY FROM STDIN) o load_data (MySQL LOAD DATA LOCAL INFILE)",
+    )
+    parser.add_argument(
+        "--load-to",
+        help="Cargar directo a base de datos (sqlite:///ruta.db, postgresql://..., mysql://...)",
+    )
+    parser.add_argument("--create-tables", action="store_true", help="Crear tablas TEXT si no existen (--load-to)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Procesos en paralelo por archivo (warehouse_clean) o conexiones por tabla (--load-to; "
+            "SQLite carga una tabla a la vez)"
+        ),
+    )
+    parser.add_argument(
+        "--csv-engine",
+        default="auto",
+        choices=CSV_ENGINES,
+        help="Motor de lectura CSV: auto (pyarrow si esta instalado, luego c y python), pyarrow, c o python",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Regenerar todo sin usar la cache de conversiones")
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help=f"Emitir solo filas nuevas o modificadas segun {DELTA_KEY_COLUMN} (warehouse_clean)",
+    )
+    parser.add_argument(
+        "--delta-style",
+        default="update",
+        choices=DELTA_STYLES,
+        help="update (INSERT + UPDATE), on_conflict (PostgreSQL/SQLite) u on_duplicate_key (MySQL)",
+    )
+    parser.add_argument("--delta-deletes", action="store_true", help="Emitir DELETE para filas que ya no existen")
+    parser.add_argument(
+        "--delta-index-dir",
+        help="Carpeta del indice delta (default: <stem del SQL>_delta junto al archivo SQL)",
+    )
+    parser.add_argument(
+        "--delta-promote",
+        action="store_true",
+        help=(
+            "Confirmar el indice delta pendiente y salir. --delta deja el indice en <tabla>.tsv.gz.pending "
+            "hasta que lo confirmes: ejecutalo solo despues de aplicar el SQL generado, o la siguiente corrida "
+            "omitira filas que nunca llegaron a la base"
+        ),
+    )
+    parser.add_argument("--routing-file", help="JSON con reglas archivo -> tabla (warehouse_clean)")
     args = parser.parse_args(argv)
 
     source_path = Path(args.source_path).expanduser().resolve()
     output_dir = Path(args.output_dir).expanduser().resolve() if args.output_dir else None
     output_file = Path(args.output_file).expanduser().resolve() if args.output_file else None
+    delta_index_dir = Path(args.delta_index_dir).expanduser().resolve() if args.delta_index_dir else None
     profile = (args.profile or "warehouse_clean").strip().lower()
     if profile not in {"warehouse_clean", "generic"}:
         raise ValueError("Perfil invalido. Usa 'warehouse_clean' o 'generic'")
+    if args.delta_promote:
+        sql_file = output_file or default_warehouse_output_file(source_path)
+        index_dir = delta_index_dir or default_delta_index_dir(sql_file)
+        promoted = promote_delta_index(index_dir)
+        if not promoted:
+            print(f"[ERROR] No hay indice delta pendiente en: {index_dir}")
+            return 1
+        print(f"[OK] Indice delta confirmado en: {index_dir}")
+        for table_name in promoted:
+            print(f" - {table_name}")
+        return 0
+
+    router = None
+    if args.routing_file:
+        router = load_routing_file(Path(args.routing_file).expanduser().resolve(), defaults=DEFAULT_TABLE_ROUTER)
+
+    if args.load_to:
+        report = load_csv_to_database(
+            source_path=source_path,
+            dsn=args.load_to,
+            profile=profile,
+            table_prefix=args.table_prefix,
+            encoding=args.encoding,
+            chunk_size=max(1, args.chunk_size),
+            workers=max(1, args.workers),
+            create_tables=args.create_tables,
+            csv_engine=args.csv_engine,
+            router=router,
+        )
+        print(f"[OK] Perfil usado: {report.profile}")
+        print(f"[OK] Datos cargados en: {report.output_path}")
+        for item_name, rows in report.items.items():
+            print(f" - {item_name}: {rows} filas cargadas")
+        for table_name, rate in report.rows_per_second.items():
+            print(f" - {table_name}: {rate:,.0f} filas/s")
+        for note in report.notes:
+            print(f" - NOTE: {note}")
+        return 0
 
     report = csv_to_insert_sql(
         source_path=source_path,
@@ -474,6 +1478,16 @@ def cli(argv: list[str] | None = None) -> int:
         encoding=args.encoding,
         chunk_size=max(1, args.chunk_size),
         wrap_transaction=not args.no_transaction,
+        single_row_inserts=args.single_row_inserts,
+        output_format=args.output_format,
+        csv_engine=args.csv_engine,
+        use_cache=not args.no_cache,
+        delta=args.delta,
+        delta_style=args.delta_style,
+        delta_deletes=args.delta_deletes,
+        delta_index_dir=delta_index_dir,
+        workers=max(1, args.workers),
+        router=router,
     )
 
     print(f"[OK] Perfil usado: {report.profile}")
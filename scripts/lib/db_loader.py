@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+from urllib.parse import unquote, urlsplit
+
+
+@dataclass
+class DatabaseTarget:
+    kind: str
+    dsn: str
+    connect: Callable[[], Any]
+    placeholder: str
+    single_writer: bool = False
+
+
+def redact_dsn(dsn: str) -> str:
+    parts = urlsplit(dsn)
+    if not parts.password:
+        return dsn
+    netloc = parts.netloc.replace(f":{parts.password}@", ":***@", 1)
+    return parts._replace(netloc=netloc).geturl()
+
+
+def _sqlite_target(dsn: str) -> DatabaseTarget:
+    raw_path = dsn
+    if "://" in dsn:
+        raw_path = dsn.split("://", 1)[1]
+        raw_path = raw_path[1:] if raw_path.startswith("/") else raw_path
+    db_path = Path(unquote(raw_path)).expanduser()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def connect() -> sqlite3.Connection:
+        return sqlite3.connect(db_path, timeout=60, check_same_thread=False)
+
+    return DatabaseTarget(kind="sqlite", dsn=str(db_path), connect=connect, placeholder="?", single_writer=True)
+
+
+def _postgresql_target(dsn: str) -> DatabaseTarget:
+    try:
+        import psycopg as driver
+    except ImportError:
+        try:
+            import psycopg2 as driver
+        except ImportError as exc:
+            raise ImportError("Instala psycopg o psycopg2 para cargar en PostgreSQL") from exc
+
+    conninfo = dsn.replace("postgres://", "postgresql://", 1).replace("postgresql+psycopg://", "postgresql://", 1)
+    return DatabaseTarget(
+        kind="postgresql",
+        dsn=redact_dsn(dsn),
+        connect=lambda: driver.connect(conninfo),
+        placeholder="%s",
+    )
+
+
+def _mysql_target(dsn: str) -> DatabaseTarget:
+    try:
+        import pymysql as driver
+    except ImportError:
+        try:
+            import mysql.connector as driver
+        except ImportError as exc:
+            raise ImportError("Instala pymysql o mysql-connector-python para cargar en MySQL") from exc
+
+    parts = urlsplit(dsn)
+    options = {
+        "host": parts.hostname or "localhost",
+        "port": parts.port or 3306,
+        "user": unquote(parts.username or ""),
+        "password": unquote(parts.password or ""),
+        "database": parts.path.lstrip("/"),
+        "charset": "utf8mb4",
+    }
+    return DatabaseTarget(
+        kind="mysql",
+        dsn=redact_dsn(dsn),
+        connect=lambda: driver.connect(**options),
+        placeholder="%s",
+    )
+
+
+def resolve_database_target(dsn: str) -> DatabaseTarget:
+    scheme = dsn.split("://", 1)[0].lower() if "://" in dsn else ""
+    if scheme == "sqlite" or (not scheme and Path(dsn).suffix.lower() in (".db", ".sqlite", ".sqlite3")):
+        return _sqlite_target(dsn)
+    if scheme.startswith("postgres"):
+        return _postgresql_target(dsn)
+    if scheme.startswith("mysql"):
+        return _mysql_target(dsn)
+    raise ValueError("DSN no soportado. Usa sqlite:///ruta.db, postgresql://... o mysql://...")
+
+
+class ConnectionPool:
+    def __init__(self, dsn: str, size: int = 1) -> None:
+        self.target = resolve_database_target(dsn)
+        self.size = 1 if self.target.single_writer else max(1, size)
+        self._idle: queue.LifoQueue[Any] = queue.LifoQueue()
+        self._opened: list[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._opened) < self.size:
+                conn = self.target.connect()
+                self._opened.append(conn)
+                return conn
+        return self._idle.get()
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+
+    def __enter__(self) -> ConnectionPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def create_table_statement(table_name: str, columns: Sequence[str]) -> str:
+    column_sql = ", ".join(f"{column} TEXT" for column in columns)
+    return f"CREATE TABLE IF NOT EXISTS {table_name} ({column_sql})"
+
+
+def insert_many(
+    conn: Any,
+    placeholder: str,
+    table_name: str,
+    columns: Sequence[str],
+    rows: Sequence[tuple[object, ...]],
+    batch_size: int = 500,
+) -> int:
+    statement = (
+        f"INSERT INTO {table_name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(placeholder for _ in columns)})"
+    )
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(statement, rows[start : start + batch_size])
+    finally:
+        cursor.close()
+    return len(rows)
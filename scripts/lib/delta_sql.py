@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, TextIO
+
+import numpy as np
+import pandas as pd
+
+from .sql_render import render_sql_rows, sql_literal, sql_literal_series
+
+DELTA_KEY_COLUMN = "appsheet_row_id"
+DELTA_STYLES = ("update", "on_conflict", "on_duplicate_key")
+INDEX_SUFFIX = ".tsv.gz"
+PENDING_SUFFIX = ".pending"
+
+
+@dataclass
+class DeltaStats:
+    new: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    untracked: int = 0
+    deleted: int = 0
+
+
+def row_hashes(frame: pd.DataFrame) -> np.ndarray:
+    hash_key = hashlib.md5("\x1f".join(map(str, frame.columns)).encode("utf-8")).hexdigest()[:16]
+    rendered = np.array(render_sql_rows(frame), dtype=object)
+    return pd.util.hash_array(rendered, hash_key=hash_key, categorize=False)
+
+
+def row_ids(frame: pd.DataFrame) -> list[str | None]:
+    ids = frame[DELTA_KEY_COLUMN].astype("string").str.strip()
+    return [None if pd.isna(value) or not value else value for value in ids.tolist()]
+
+
+def load_delta_index(index_file: Path) -> dict[str, int]:
+    if not index_file.exists():
+        return {}
+    with gzip.open(index_file, "rt", encoding="utf-8", newline="") as handle:
+        return {row_id: int(value, 16) for row_id, value in csv.reader(handle, delimiter="\t")}
+
+
+def save_delta_index(index_file: Path, index: dict[str, int]) -> None:
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(dir=index_file.parent, suffix=".tmp", delete=False)
+    with handle, gzip.open(handle, "wt", encoding="utf-8", newline="", compresslevel=6) as target:
+        writer = csv.writer(target, delimiter="\t")
+        writer.writerows((row_id, f"{value:016x}") for row_id, value in index.items())
+    os.replace(handle.name, index_file)
+
+
+def pending_delta_files(index_dir: Path) -> list[Path]:
+    if not index_dir.is_dir():
+        return []
+    return sorted(index_dir.glob(f"*{INDEX_SUFFIX}{PENDING_SUFFIX}"))
+
+
+def promote_delta_index(index_dir: Path) -> list[str]:
+    promoted: list[str] = []
+    for pending in pending_delta_files(index_dir):
+        index_name = pending.name[: -len(PENDING_SUFFIX)]
+        os.replace(pending, pending.with_name(index_name))
+        promoted.append(index_name[: -len(INDEX_SUFFIX)])
+    return promoted
+
+
+def upsert_clause(columns: list[str], style: str) -> str:
+    updates = [column for column in columns if column != DELTA_KEY_COLUMN]
+    if style == "on_conflict":
+        if not updates:
+            return f"\nON CONFLICT ({DELTA_KEY_COLUMN}) DO NOTHING"
+        assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+        return f"\nON CONFLICT ({DELTA_KEY_COLUMN}) DO UPDATE SET {assignments}"
+    if style == "on_duplicate_key":
+        assignments = ", ".join(f"{column} = VALUES({column})" for column in updates or [DELTA_KEY_COLUMN])
+        return f"\nON DUPLICATE KEY UPDATE {assignments}"
+    return ""
+
+
+def iter_update_statements(frame: pd.DataFrame, table_name: str) -> Iterator[str]:
+    literals = {column: sql_literal_series(frame[column]).tolist() for column in frame.columns}
+    updates = [column for column in frame.columns if column != DELTA_KEY_COLUMN]
+    for idx in range(len(frame)):
+        assignments = ", ".join(f"{column} = {literals[column][idx]}" for column in updates)
+        yield f"UPDATE {table_name} SET {assignments} WHERE {DELTA_KEY_COLUMN} = {literals[DELTA_KEY_COLUMN][idx]};\n"
+
+
+def iter_delete_statements(row_ids: list[str], table_name: str, chunk_size: int = 500) -> Iterator[str]:
+    for start in range(0, len(row_ids), chunk_size):
+        values = ", ".join(sql_literal(row_id) for row_id in row_ids[start : start + chunk_size])
+        yield f"DELETE FROM {table_name} WHERE {DELTA_KEY_COLUMN} IN ({values});\n"
+
+
+class DeltaTracker:
+    def __init__(self, index_dir: Path, style: str = "update", deletes: bool = False) -> None:
+        if style not in DELTA_STYLES:
+            raise ValueError(f"Estilo delta no soportado: {style}. Usa {', '.join(DELTA_STYLES)}")
+        self.index_dir = index_dir
+        self.style = style
+        self.deletes = deletes
+        self.previous: dict[str, dict[str, int]] = {}
+        self.current: dict[str, dict[str, int]] = {}
+        self.stats: dict[str, DeltaStats] = {}
+
+    def index_file(self, table_name: str) -> Path:
+        return self.index_dir / f"{table_name}{INDEX_SUFFIX}"
+
+    def pending_file(self, table_name: str) -> Path:
+        return self.index_dir / f"{table_name}{INDEX_SUFFIX}{PENDING_SUFFIX}"
+
+    def _previous(self, table_name: str) -> dict[str, int]:
+        if table_name not in self.previous:
+            self.previous[table_name] = load_delta_index(self.index_file(table_name))
+        return self.previous[table_name]
+
+    def classify(self, frame: pd.DataFrame, table_name: str) -> tuple[np.ndarray, np.ndarray]:
+        stats = self.stats.setdefault(table_name, DeltaStats())
+        if DELTA_KEY_COLUMN not in frame.columns:
+            stats.untracked += len(frame)
+            return np.ones(len(frame), dtype=bool), np.zeros(len(frame), dtype=bool)
+
+        previous = self._previous(table_name)
+        current = self.current.setdefault(table_name, {})
+        emit_new = np.zeros(len(frame), dtype=bool)
+        emit_changed = np.zeros(len(frame), dtype=bool)
+        for position, (row_id, row_hash) in enumerate(zip(row_ids(frame), row_hashes(frame).tolist())):
+            if row_id is None:
+                stats.untracked += 1
+                emit_new[position] = True
+                continue
+
+            known = previous.get(row_id)
+            if known is None:
+                stats.new += 1
+                emit_new[position] = True
+            elif known != row_hash:
+                stats.changed += 1
+                emit_changed[position] = True
+            else:
+                stats.unchanged += 1
+            current[row_id] = row_hash
+        return emit_new, emit_changed
+
+    def vanished(self, table_name: str) -> list[str]:
+        current = self.current.get(table_name, {})
+        return [row_id for row_id in self._previous(table_name) if row_id not in current]
+
+    def write_deletes(self, handle: TextIO, chunk_size: int = 500) -> int:
+        deleted = 0
+        for table_name in self.current:
+            row_ids_to_delete = self.vanished(table_name)
+            if not self.deletes or not row_ids_to_delete:
+                continue
+            for statement in iter_delete_statements(row_ids_to_delete, table_name, chunk_size):
+                handle.write(statement)
+            self.stats[table_name].deleted = len(row_ids_to_delete)
+            deleted += len(row_ids_to_delete)
+        return deleted
+
+    def save(self) -> None:
+        for stale in pending_delta_files(self.index_dir):
+            stale.unlink()
+        for table_name, current in self.current.items():
+            index = dict(current)
+            if not self.deletes:
+                for row_id in self.vanished(table_name):
+                    index[row_id] = self._previous(table_name)[row_id]
+            save_delta_index(self.pending_file(table_name), index)
+
+    def notes(self) -> list[str]:
+        notes = [
+            f"{table_name}: delta nuevas={stats.new}, modificadas={stats.changed}, "
+            f"sin_cambios={stats.unchanged}, sin_id={stats.untracked}, eliminadas={stats.deleted}"
+            for table_name, stats in self.stats.items()
+        ]
+        if self.current:
+            notes.append(
+                f"Indice delta pendiente en {self.index_dir}: aplica el SQL y luego confirmalo con --delta-promote"
+            )
+        return notes
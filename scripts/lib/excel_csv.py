@@ -1,13 +1,57 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import glob
+import os
+import tempfile
+import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
+from typing import Iterable, Iterator
+from xml.etree import ElementTree
 
 import pandas as pd
 
+from .columnar import FILE_FORMATS, check_file_format, csv_file_to_columnar, output_name, write_columnar_frame
 from .common import TEMP_CSV_DIRNAME, sanitize_name, unique_column_names
+from .conversion_cache import ConversionCache
 
 SUPPORTED_EXTENSIONS = (".xlsx", ".xls", ".xlsm")
+STREAMING_EXTENSIONS = (".xlsx", ".xlsm")
+NA_CELL_STRINGS = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+        "#DIV/0!",
+        "#NAME?",
+        "#NULL!",
+        "#NUM!",
+        "#REF!",
+        "#VALUE!",
+    }
+)
+NON_DATE_STRINGS = frozenset({"", "NaT", "nat", "NAT", "nan", "NaN", "NAN", "now", "today"})
+SPOOL_BLOCK_ROWS = 5_000
 
 
 def detect_header_row(raw_df: pd.DataFrame, scan_limit: int = 30) -> int:
@@ -48,24 +92,203 @@ def normalize_date_columns(df: pd.DataFrame, date_keywords: list[str]) -> None:
             df.loc[converted.isna(), column] = ""
 
 
-def read_excel_sheet_adaptive(excel_path: Path, sheet_name: str) -> pd.DataFrame:
-    raw = pd.read_excel(excel_path, sheet_name=sheet_name, header=None, dtype=object)
+def resolve_excel_sources(raw_path: str | Path) -> list[Path]:
+    text = str(raw_path)
+    if Path(text).is_file():
+        return [Path(text)]
+    if Path(text).is_dir():
+        candidates = list(Path(text).iterdir())
+    elif any(char in text for char in "*?["):
+        candidates = [Path(item) for item in glob.glob(text)]
+    else:
+        return [Path(text)]
+
+    return sorted(
+        path
+        for path in candidates
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS and not path.name.startswith("~$")
+    )
+
+
+def list_sheet_names(excel_path: Path) -> list[str]:
+    if excel_path.suffix.lower() not in STREAMING_EXTENSIONS:
+        with open_workbook(excel_path) as workbook:
+            return list(workbook.sheet_names)
+
+    with zipfile.ZipFile(excel_path) as archive:
+        root = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    return [node.attrib["name"] for node in root.iter() if node.tag.rsplit("}", 1)[-1] == "sheet"]
+
+
+def open_workbook(excel_path: Path) -> pd.ExcelFile:
+    return pd.ExcelFile(excel_path)
+
+
+def header_names(values: list[object]) -> list[str]:
+    names = [str(v).strip() if pd.notna(v) else "" for v in values]
+    return unique_column_names([name if name else f"columna_{idx + 1}" for idx, name in enumerate(names)])
+
+
+def read_excel_sheet_adaptive(workbook: pd.ExcelFile | Path, sheet_name: str) -> pd.DataFrame:
+    raw = pd.read_excel(workbook, sheet_name=sheet_name, header=None, dtype=object)
     if raw.empty:
         return pd.DataFrame()
 
     header_row = detect_header_row(raw)
-    header_values = [str(v).strip() if pd.notna(v) else "" for v in raw.iloc[header_row].tolist()]
-    header_values = [value if value else f"columna_{idx + 1}" for idx, value in enumerate(header_values)]
-    header_values = unique_column_names(header_values)
-
     body = raw.iloc[header_row + 1 :].copy()
-    body.columns = header_values
+    body.columns = header_names(raw.iloc[header_row].tolist())
     body.dropna(axis=1, how="all", inplace=True)
     body.dropna(axis=0, how="all", inplace=True)
     body.reset_index(drop=True, inplace=True)
     return body
 
 
+def _cell_value(value: object) -> object:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return None if value in NA_CELL_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _cell_text(value: object) -> str:
+    return "" if value is None else str(value)
+
+
+def _slot_text(cells: list[str], position: int) -> str:
+    return cells[position] if position < len(cells) else ""
+
+
+def _date_anchor(values: list[object]) -> object | None:
+    for value in values:
+        if pd.isna(value) or (isinstance(value, str) and value in NON_DATE_STRINGS):
+            continue
+        return value
+    return None
+
+
+def _date_texts(values: list[object], anchor: object | None) -> list[str]:
+    prefix = [] if anchor is None else [anchor]
+    converted = pd.to_datetime(pd.Series(prefix + values, dtype=object), errors="coerce")
+    texts = converted.dt.strftime("%Y-%m-%d").iloc[len(prefix) :]
+    return texts.fillna("").tolist()
+
+
+def iter_sheet_rows(worksheet: object) -> Iterator[tuple[object, ...]]:
+    for row in worksheet.iter_rows(values_only=True):
+        yield tuple(_cell_value(value) for value in row)
+
+
+def open_streaming_workbook(excel_path: Path) -> object:
+    from openpyxl import load_workbook
+
+    return load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+
+
+def stream_sheet_to_csv(
+    rows: Iterable[tuple[object, ...]],
+    output_file: Path,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    date_keywords: list[str] | None = None,
+    scan_limit: int = 30,
+) -> int:
+    rows = iter(rows)
+    head = list(islice(rows, scan_limit))
+    if not any(any(value is not None for value in row) for row in head):
+        rest = next(rows, None)
+        if rest is None:
+            pd.DataFrame().to_csv(output_file, index=False, encoding=encoding, sep=delimiter)
+            return 0
+        rows = chain([rest], rows)
+
+    head_width = max(len(row) for row in head)
+    padded = [list(row) + [None] * (head_width - len(row)) for row in head]
+    header_row = detect_header_row(pd.DataFrame(padded, dtype=object))
+    header_cells = padded[header_row]
+
+    keys = [key.lower().strip() for key in (date_keywords or []) if key.strip()]
+    header_values: list[str] = []
+    non_empty: list[bool] = []
+    date_columns: list[int] = []
+    date_anchors: dict[int, object | None] = {}
+    date_converted: dict[int, bool] = {}
+
+    def widen(width: int) -> None:
+        nonlocal header_values
+        start = len(header_values)
+        header_values = unique_column_names(header_names(header_cells + [None] * (width - len(header_cells))))
+        non_empty.extend([False] * (width - start))
+        for idx in range(start, width):
+            if any(key in header_values[idx].lower() for key in keys):
+                date_columns.append(idx)
+                date_anchors[idx] = None
+                date_converted[idx] = False
+
+    block: list[tuple[object, ...]] = []
+
+    def flush(spool_writer: object) -> None:
+        dates: list[list[str]] = []
+        for idx in date_columns:
+            column = [row[idx] if idx < len(row) else None for row in block]
+            if date_anchors[idx] is None:
+                date_anchors[idx] = _date_anchor(column)
+            texts = _date_texts(column, date_anchors[idx])
+            date_converted[idx] = date_converted[idx] or any(texts)
+            dates.append(texts)
+        for position, row in enumerate(block):
+            spool_writer.writerow([len(row), *map(_cell_text, row), *(texts[position] for texts in dates)])
+        block.clear()
+
+    widen(head_width)
+    body = chain(head[header_row + 1 :], rows)
+    spool = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", newline="", dir=output_file.parent, suffix=".spool", delete=False
+    )
+    spool_path = Path(spool.name)
+    try:
+        with spool:
+            spool_writer = csv.writer(spool)
+            for row in body:
+                filled = [idx for idx, value in enumerate(row) if value is not None]
+                if not filled:
+                    continue
+                if len(row) > len(header_values):
+                    widen(len(row))
+                for idx in filled:
+                    non_empty[idx] = True
+                block.append(row)
+                if len(block) >= SPOOL_BLOCK_ROWS:
+                    flush(spool_writer)
+            flush(spool_writer)
+
+        kept = [idx for idx in range(len(header_values)) if non_empty[idx]]
+        date_slot = {idx: pos for pos, idx in enumerate(date_columns) if date_converted[idx]}
+
+        written = 0
+        with spool_path.open("r", encoding="utf-8", newline="") as source, output_file.open(
+            "w", encoding=encoding, newline=""
+        ) as target:
+            writer = csv.writer(target, delimiter=delimiter, lineterminator=os.linesep)
+            writer.writerow([header_values[idx] for idx in kept])
+            for record in csv.reader(source):
+                count = int(record[0])
+                values = record[1 : count + 1]
+                dates = record[count + 1 :]
+                writer.writerow(
+                    [
+                        _slot_text(dates, date_slot[idx]) if idx in date_slot else _slot_text(values, idx)
+                        for idx in kept
+                    ]
+                )
+                written += 1
+        return written
+    finally:
+        spool_path.unlink(missing_ok=True)
+
+
 def convert_excel_to_csv(
     excel_path: Path,
     output_dir: Path | None = None,
@@ -74,39 +297,248 @@ def convert_excel_to_csv(
     encoding: str = "utf-8",
     date_keywords: list[str] | None = None,
     drop_empty_rows: bool = True,
+    streaming: bool = False,
+    workers: int = 1,
+    use_cache: bool = True,
+    file_format: str = "csv",
 ) -> dict[str, int]:
     if not excel_path.exists():
         raise FileNotFoundError(f"No existe el archivo Excel: {excel_path}")
     if excel_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
         raise ValueError("Archivo no soportado. Usa .xlsx, .xls o .xlsm")
+    check_file_format(file_format)
 
     if output_dir is None:
         output_dir = excel_path.parent / TEMP_CSV_DIRNAME
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    workbook = pd.ExcelFile(excel_path)
-    available_sheets = workbook.sheet_names
-    selected_sheets = sheets if sheets else available_sheets
+    keywords = date_keywords if date_keywords else ["fecha", "date"]
+    options = _task_options(delimiter, encoding, keywords, drop_empty_rows, streaming, file_format)
+    with ConversionCache.beside(output_dir, enabled=use_cache) as cache:
+        key = cache.entry_key("excel_csv", excel_path, {**options, "sheets": sheets or []})
+        result = _restore_csv_outputs(cache, key, output_dir)
+        if result is None:
+            result = _convert_excel_sheets(
+                excel_path,
+                output_dir,
+                sheets,
+                delimiter,
+                encoding,
+                keywords,
+                drop_empty_rows,
+                streaming,
+                workers,
+                file_format,
+            )
+            cache.store(key, {"result": result}, {name: output_dir / name for name in result})
+    _warn_cache_notes(cache)
+    return result
 
-    missing = [sheet for sheet in selected_sheets if sheet not in available_sheets]
-    if missing:
-        raise ValueError(f"Estas hojas no existen: {', '.join(missing)}")
 
-    keywords = date_keywords if date_keywords else ["fecha", "date"]
+def _warn_cache_notes(cache: ConversionCache) -> None:
+    for note in cache.notes:
+        warnings.warn(note, RuntimeWarning, stacklevel=3)
+
+
+def _restore_csv_outputs(cache: ConversionCache, key: str, output_dir: Path) -> dict[str, int] | None:
+    meta = cache.lookup(key)
+    if meta is None:
+        return None
+
+    result = {str(name): int(rows) for name, rows in meta["result"].items()}
+    for name in result:
+        cache.restore(key, name, output_dir / name)
+    return result
+
+
+def _convert_excel_sheets(
+    excel_path: Path,
+    output_dir: Path,
+    sheets: list[str] | None,
+    delimiter: str,
+    encoding: str,
+    keywords: list[str],
+    drop_empty_rows: bool,
+    streaming: bool,
+    workers: int,
+    file_format: str = "csv",
+) -> dict[str, int]:
+    if workers > 1:
+        selected_sheets = sheets if sheets else list_sheet_names(excel_path)
+        if len(selected_sheets) > 1:
+            options = _task_options(delimiter, encoding, keywords, drop_empty_rows, streaming, file_format)
+            groups = [selected_sheets[start::workers] for start in range(min(workers, len(selected_sheets)))]
+            partial: dict[str, int] = {}
+            for chunk in _run_conversion_tasks([(excel_path, output_dir, group, options) for group in groups], workers):
+                partial.update(chunk)
+            names = [f"{sanitize_name(sheet, fallback='hoja')}.csv" for sheet in selected_sheets]
+            ordered = [output_name(name, file_format) for name in names]
+            return {name: partial[name] for name in ordered if name in partial}
+
+    if streaming and excel_path.suffix.lower() in STREAMING_EXTENSIONS:
+        return _convert_excel_streaming(excel_path, output_dir, sheets, delimiter, encoding, keywords, file_format)
+
     result: dict[str, int] = {}
+    for csv_name, df in iter_excel_frames(excel_path, sheets, keywords, drop_empty_rows):
+        if file_format == "csv":
+            df.to_csv(output_dir / csv_name, index=False, encoding=encoding, sep=delimiter)
+            result[csv_name] = len(df)
+        else:
+            name = output_name(csv_name, file_format)
+            result[name] = write_columnar_frame(df, output_dir / name, file_format)
+    return result
 
-    for sheet_name in selected_sheets:
-        df = read_excel_sheet_adaptive(excel_path, sheet_name)
-        if not df.empty:
-            df.columns = unique_column_names([sanitize_name(str(col), "columna") for col in df.columns.tolist()])
-            if drop_empty_rows:
-                df.dropna(axis=0, how="all", inplace=True)
-            normalize_date_columns(df, keywords)
 
-        output_file = output_dir / f"{sanitize_name(sheet_name, fallback='hoja')}.csv"
-        df.to_csv(output_file, index=False, encoding=encoding, sep=delimiter)
-        result[output_file.name] = len(df)
+def iter_excel_frames(
+    excel_path: Path,
+    sheets: list[str] | None = None,
+    date_keywords: list[str] | None = None,
+    drop_empty_rows: bool = True,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    keywords = date_keywords if date_keywords else ["fecha", "date"]
+    with open_workbook(excel_path) as workbook:
+        available_sheets = workbook.sheet_names
+        selected_sheets = sheets if sheets else available_sheets
+
+        missing = [sheet for sheet in selected_sheets if sheet not in available_sheets]
+        if missing:
+            raise ValueError(f"Estas hojas no existen: {', '.join(missing)}")
+
+        for sheet_name in selected_sheets:
+            df = read_excel_sheet_adaptive(workbook, sheet_name)
+            if not df.empty:
+                df.columns = unique_column_names([sanitize_name(str(col), "columna") for col in df.columns.tolist()])
+                if drop_empty_rows:
+                    df.dropna(axis=0, how="all", inplace=True)
+                normalize_date_columns(df, keywords)
 
+            yield f"{sanitize_name(sheet_name, fallback='hoja')}.csv", df
+
+
+def _convert_excel_streaming(
+    excel_path: Path,
+    output_dir: Path,
+    sheets: list[str] | None,
+    delimiter: str,
+    encoding: str,
+    date_keywords: list[str],
+    file_format: str = "csv",
+) -> dict[str, int]:
+    workbook = open_streaming_workbook(excel_path)
+    try:
+        available_sheets = workbook.sheetnames
+        selected_sheets = sheets if sheets else available_sheets
+
+        missing = [sheet for sheet in selected_sheets if sheet not in available_sheets]
+        if missing:
+            raise ValueError(f"Estas hojas no existen: {', '.join(missing)}")
+
+        result: dict[str, int] = {}
+        for sheet_name in selected_sheets:
+            output_file = output_dir / output_name(f"{sanitize_name(sheet_name, fallback='hoja')}.csv", file_format)
+            csv_file = output_file if file_format == "csv" else output_file.with_name(f"{output_file.name}.csv")
+            try:
+                result[output_file.name] = stream_sheet_to_csv(
+                    iter_sheet_rows(workbook[sheet_name]),
+                    csv_file,
+                    delimiter=delimiter if file_format == "csv" else ",",
+                    encoding=encoding if file_format == "csv" else "utf-8",
+                    date_keywords=date_keywords,
+                )
+                if file_format != "csv":
+                    csv_file_to_columnar(csv_file, output_file, file_format)
+            finally:
+                if file_format != "csv":
+                    csv_file.unlink(missing_ok=True)
+        return result
+    finally:
+        workbook.close()
+
+
+def _task_options(
+    delimiter: str,
+    encoding: str,
+    date_keywords: list[str] | None,
+    drop_empty_rows: bool,
+    streaming: bool,
+    file_format: str = "csv",
+) -> dict[str, object]:
+    return {
+        "delimiter": delimiter,
+        "encoding": encoding,
+        "date_keywords": date_keywords,
+        "drop_empty_rows": drop_empty_rows,
+        "streaming": streaming,
+        "file_format": file_format,
+    }
+
+
+def _convert_excel_task(task: tuple[Path, Path, list[str] | None, dict[str, object]]) -> dict[str, int]:
+    excel_path, output_dir, sheets, options = task
+    return convert_excel_to_csv(excel_path=excel_path, output_dir=output_dir, sheets=sheets, use_cache=False, **options)
+
+
+def _run_conversion_tasks(
+    tasks: list[tuple[Path, Path, list[str] | None, dict[str, object]]],
+    workers: int,
+) -> list[dict[str, int]]:
+    if workers <= 1 or len(tasks) <= 1:
+        return [_convert_excel_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        return list(executor.map(_convert_excel_task, tasks))
+
+
+def default_batch_output_dir(excel_paths: list[Path]) -> Path:
+    return Path(os.path.commonpath([str(path.parent) for path in excel_paths])) / TEMP_CSV_DIRNAME
+
+
+def convert_excel_batch(
+    excel_paths: list[Path],
+    output_dir: Path | None = None,
+    sheets: list[str] | None = None,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    date_keywords: list[str] | None = None,
+    drop_empty_rows: bool = True,
+    streaming: bool = False,
+    workers: int = 1,
+    use_cache: bool = True,
+    file_format: str = "csv",
+) -> dict[str, int]:
+    if not excel_paths:
+        raise ValueError("No se encontraron archivos Excel (.xlsx, .xls o .xlsm)")
+    check_file_format(file_format)
+
+    if output_dir is None:
+        output_dir = default_batch_output_dir(excel_paths)
+
+    folder_names = unique_column_names([path.stem for path in excel_paths])
+    keywords = date_keywords if date_keywords else ["fecha", "date"]
+    options = _task_options(delimiter, encoding, keywords, drop_empty_rows, streaming, file_format)
+
+    converted: dict[str, dict[str, int]] = {}
+    with ConversionCache.beside(output_dir, enabled=use_cache) as cache:
+        keys: dict[str, str] = {}
+        tasks: list[tuple[Path, Path, list[str] | None, dict[str, object]]] = []
+        for path, folder in zip(excel_paths, folder_names):
+            keys[folder] = cache.entry_key("excel_csv", path, {**options, "sheets": sheets or []})
+            cached = _restore_csv_outputs(cache, keys[folder], output_dir / folder)
+            if cached is None:
+                tasks.append((path, output_dir / folder, sheets, options))
+            else:
+                converted[folder] = cached
+
+        pending = [folder for folder in folder_names if folder not in converted]
+        for folder, outputs in zip(pending, _run_conversion_tasks(tasks, workers)):
+            folder_dir = output_dir / folder
+            cache.store(keys[folder], {"result": outputs}, {name: folder_dir / name for name in outputs})
+            converted[folder] = outputs
+    _warn_cache_notes(cache)
+
+    result: dict[str, int] = {}
+    for folder in folder_names:
+        for csv_name, rows in converted[folder].items():
+            result[f"{folder}/{csv_name}"] = rows
     return result
 
 
@@ -118,30 +550,51 @@ def _parse_csv_list(raw: str | None) -> list[str]:
 
 def cli(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Extraer hojas de Excel a CSV")
-    parser.add_argument("--excel-path", required=True, help="Ruta del archivo Excel")
+    parser.add_argument("--excel-path", required=True, help="Ruta del archivo Excel, carpeta o patron glob")
     parser.add_argument("--output-dir", help="Carpeta de salida para CSV")
+    parser.add_argument(
+        "--format",
+        default="csv",
+        choices=FILE_FORMATS,
+        help="Formato de salida: csv, parquet o arrow (tipados y comprimidos, requieren pyarrow)",
+    )
     parser.add_argument("--sheets", help="Hojas separadas por coma")
     parser.add_argument("--delimiter", default=",", help="Delimitador CSV")
     parser.add_argument("--encoding", default="utf-8", help="Encoding del CSV")
     parser.add_argument("--date-keywords", default="fecha,date", help="Keywords de fecha separadas por coma")
     parser.add_argument("--keep-empty-rows", action="store_true", help="Conservar filas completamente vacias")
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Escribir CSV fila a fila con memoria constante (.xlsx/.xlsm)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo por libro u hoja")
+    parser.add_argument("--no-cache", action="store_true", help="Reconvertir todo sin usar la cache de conversiones")
     args = parser.parse_args(argv)
 
     excel_path = Path(args.excel_path).expanduser().resolve()
     output_dir = Path(args.output_dir).expanduser().resolve() if args.output_dir else None
-
-    results = convert_excel_to_csv(
-        excel_path=excel_path,
-        output_dir=output_dir,
-        sheets=_parse_csv_list(args.sheets),
-        delimiter=args.delimiter,
-        encoding=args.encoding,
-        date_keywords=_parse_csv_list(args.date_keywords),
-        drop_empty_rows=not args.keep_empty_rows,
-    )
-
-    destination = output_dir if output_dir else excel_path.parent / TEMP_CSV_DIRNAME
-    print(f"[OK] CSV generados en: {destination}")
+    options = {
+        "sheets": _parse_csv_list(args.sheets),
+        "delimiter": args.delimiter,
+        "encoding": args.encoding,
+        "date_keywords": _parse_csv_list(args.date_keywords),
+        "drop_empty_rows": not args.keep_empty_rows,
+        "streaming": args.streaming,
+        "workers": max(1, args.workers),
+        "use_cache": not args.no_cache,
+        "file_format": args.format,
+    }
+
+    excel_paths = resolve_excel_sources(excel_path)
+    if excel_paths == [excel_path]:
+        results = convert_excel_to_csv(excel_path=excel_path, output_dir=output_dir, **options)
+        destination = output_dir if output_dir else excel_path.parent / TEMP_CSV_DIRNAME
+    else:
+        results = convert_excel_batch(excel_paths=excel_paths, output_dir=output_dir, **options)
+        destination = output_dir if output_dir else default_batch_output_dir(excel_paths)
+    label = "CSV" if args.format == "csv" else args.format.capitalize()
+    print(f"[OK] {label} generados en: {destination}")
     for csv_name, rows in results.items():
         print(f" - {csv_name}: {rows} filas")
     return 0
@@ -1,34 +1,268 @@
 from __future__ import annotations
 
 import argparse
+import html
+import posixpath
+import re
+import zipfile
+from functools import lru_cache
 from pathlib import Path
+from typing import IO, Iterator
+from xml.etree import ElementTree
 
 import pandas as pd
 
-from .excel_csv import detect_header_row
+from .excel_csv import NA_CELL_STRINGS, STREAMING_EXTENSIONS, detect_header_row, open_workbook
 
+HEADER_SCAN_LIMIT = 30
+XML_READ_BYTES = 1024 * 1024
+ROOT_PATTERN = re.compile(rb"<(\w+:)?(?:worksheet|sst)\b")
+TEXT_PATTERN = re.compile(rb"<(?:\w+:)?t(?:\s[^>]*?)?(?<!/)>(.*?)</(?:\w+:)?t>", re.S)
+VALUE_PATTERN = re.compile(rb"<(?:\w+:)?v(?:\s[^>]*?)?(?<!/)>(.*?)</(?:\w+:)?v>", re.S)
+PHONETIC_PATTERN = re.compile(rb"<(?:\w+:)?rPh\b.*?</(?:\w+:)?rPh>", re.S)
+ROW_NUMBER_PATTERN = re.compile(rb'\br="(\d+)"')
+CELL_REF_PATTERN = re.compile(rb'\br="([A-Za-z]+)')
+CELL_TYPE_PATTERN = re.compile(rb'\bt="(\w+)"')
+CELL_STYLE_PATTERN = re.compile(rb'\bs="(\d+)"')
+NUM_FMT_PATTERN = re.compile(rb'<(?:\w+:)?numFmt\b[^>]*?\bnumFmtId="(\d+)"[^>]*?\bformatCode="([^"]*)"')
+CELL_XFS_PATTERN = re.compile(rb"<(?:\w+:)?cellXfs\b.*?</(?:\w+:)?cellXfs>", re.S)
+XF_PATTERN = re.compile(rb"<(?:\w+:)?xf\b([^>]*)>")
+XF_NUM_FMT_PATTERN = re.compile(rb'\bnumFmtId="(\d+)"')
+DATE_1904_PATTERN = re.compile(rb'\bdate1904="(?:1|true)"')
 
-def inspect_excel_structure(excel_path: Path) -> list[dict[str, object]]:
+
+@lru_cache(maxsize=None)
+def _column_index(letters: bytes) -> int:
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + char - 64
+    return index - 1
+
+
+@lru_cache(maxsize=None)
+def _start_tag_pattern(prefix: bytes, name: bytes) -> re.Pattern[bytes]:
+    return re.compile(rb"<" + re.escape(prefix + name) + rb"\b([^>/]*)(/?)>")
+
+
+@lru_cache(maxsize=None)
+def _dimension_pattern(prefix: bytes) -> re.Pattern[bytes]:
+    return re.compile(rb"<" + re.escape(prefix) + rb'dimension\b[^>]*?\bref="([^"]*)"')
+
+
+def _xml_text(raw: bytes) -> str:
+    text = raw.decode("utf-8")
+    return html.unescape(text) if "&" in text else text
+
+
+def _rich_text(raw: bytes) -> str:
+    return "".join(_xml_text(part) for part in TEXT_PATTERN.findall(PHONETIC_PATTERN.sub(b"", raw)))
+
+
+def _iter_xml_elements(handle: IO[bytes], name: bytes) -> Iterator[tuple[bytes, bytes]]:
+    head = handle.read(XML_READ_BYTES)
+    root = ROOT_PATTERN.search(head)
+    prefix = (root.group(1) or b"") if root else b""
+    closing = b"</" + prefix + name + b">"
+
+    buffer = head
+    while True:
+        block = handle.read(XML_READ_BYTES)
+        if not block:
+            yield prefix, buffer
+            return
+        pieces = (buffer + block).split(closing)
+        buffer = pieces.pop()
+        for piece in pieces:
+            yield prefix, piece
+
+
+def _sheet_parts(archive: zipfile.ZipFile) -> list[tuple[str, str]]:
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    relations = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {node.attrib["Id"]: node.attrib["Target"] for node in relations}
+
+    parts: list[tuple[str, str]] = []
+    for node in workbook.iter():
+        if not node.tag.endswith("sheet"):
+            continue
+        relation_id = next(value for key, value in node.attrib.items() if key.endswith("}id"))
+        target = targets[relation_id]
+        part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+        parts.append((node.attrib["name"], part))
+    return parts
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings: list[str] = []
+    with archive.open("xl/sharedStrings.xml") as handle:
+        for prefix, piece in _iter_xml_elements(handle, b"si"):
+            parts = _start_tag_pattern(prefix, b"si").split(piece)
+            for idx in range(1, len(parts), 3):
+                strings.append("" if parts[idx + 1] else _rich_text(parts[idx + 2]))
+    return strings
+
+
+def _date_styles(archive: zipfile.ZipFile) -> set[int]:
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+    if "xl/styles.xml" not in archive.namelist():
+        return set()
+    styles = archive.read("xl/styles.xml")
+    formats = {int(fmt_id): _xml_text(code) for fmt_id, code in NUM_FMT_PATTERN.findall(styles)}
+    cell_xfs = CELL_XFS_PATTERN.search(styles)
+    if cell_xfs is None:
+        return set()
+
+    date_styles: set[int] = set()
+    for position, attrs in enumerate(XF_PATTERN.findall(cell_xfs.group(0))):
+        fmt_id = XF_NUM_FMT_PATTERN.search(attrs)
+        code = formats.get(int(fmt_id.group(1)), BUILTIN_FORMATS.get(int(fmt_id.group(1)))) if fmt_id else None
+        if code and is_date_format(code):
+            date_styles.add(position)
+    return date_styles
+
+
+def _cell_value(attrs: bytes, body: bytes, shared_strings: list[str]) -> object:
+    cell_type = CELL_TYPE_PATTERN.search(attrs)
+    cell_type = cell_type.group(1) if cell_type else b"n"
+    if cell_type == b"e":
+        return None
+    if cell_type == b"inlineStr":
+        text = _rich_text(body)
+        return None if text in NA_CELL_STRINGS else text
+
+    value = VALUE_PATTERN.search(body)
+    if value is None:
+        return None
+    if cell_type == b"s":
+        text = shared_strings[int(value.group(1))]
+    elif cell_type in (b"str", b"d"):
+        text = _xml_text(value.group(1))
+    elif cell_type == b"b":
+        return value.group(1).strip() in (b"1", b"true")
+    else:
+        return value.group(1)
+    return None if text in NA_CELL_STRINGS else text
+
+
+def _typed_value(attrs: bytes, value: object, date_styles: set[int], epoch: object) -> object:
+    if not isinstance(value, bytes):
+        return value
+
+    from openpyxl.utils.datetime import from_excel
+
+    number = float(value)
+    style = CELL_STYLE_PATTERN.search(attrs)
+    if style and int(style.group(1)) in date_styles:
+        return from_excel(number, epoch)
+    return int(number) if number.is_integer() else number
+
+
+def scan_sheet_xml(
+    handle: IO[bytes],
+    shared_strings: list[str],
+    date_styles: set[int],
+    epoch: object,
+    scan_limit: int = HEADER_SCAN_LIMIT,
+) -> tuple[str | None, int, int, pd.DataFrame]:
+    dimension: str | None = None
+    non_empty_rows = 0
+    non_empty_cols: set[int] = set()
+    head: list[dict[int, object]] = [{} for _ in range(scan_limit)]
+    row_number = 0
+
+    for prefix, piece in _iter_xml_elements(handle, b"row"):
+        if not row_number:
+            found = _dimension_pattern(prefix).search(piece)
+            dimension = found.group(1).decode("ascii") if found else None
+
+        rows = _start_tag_pattern(prefix, b"row").split(piece)
+        for idx in range(1, len(rows), 3):
+            number = ROW_NUMBER_PATTERN.search(rows[idx])
+            row_number = int(number.group(1)) if number else row_number + 1
+            if rows[idx + 1]:
+                continue
+
+            in_head = row_number <= scan_limit
+            row_has_value = False
+            position = 0
+            cells = _start_tag_pattern(prefix, b"c").split(rows[idx + 2])
+            for cell_idx in range(1, len(cells), 3):
+                attrs = cells[cell_idx]
+                reference = CELL_REF_PATTERN.search(attrs)
+                column = _column_index(reference.group(1)) if reference else position
+                position = column + 1
+                if cells[cell_idx + 1] or (row_has_value and not in_head and column in non_empty_cols):
+                    continue
+                value = _cell_value(attrs, cells[cell_idx + 2], shared_strings)
+                if value is None:
+                    continue
+                row_has_value = True
+                non_empty_cols.add(column)
+                if in_head:
+                    head[row_number - 1][column] = _typed_value(attrs, value, date_styles, epoch)
+            non_empty_rows += row_has_value
+
+    last_row = max((idx for idx, row in enumerate(head) if row), default=-1)
+    raw_head = pd.DataFrame.from_records(head[: last_row + 1])
+    return dimension, non_empty_rows, len(non_empty_cols), raw_head
+
+
+def inspect_excel_fast(excel_path: Path, scan_limit: int = HEADER_SCAN_LIMIT) -> list[dict[str, object]]:
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+    report: list[dict[str, object]] = []
+    with zipfile.ZipFile(excel_path) as archive:
+        shared_strings = _shared_strings(archive)
+        date_styles = _date_styles(archive)
+        date_1904 = DATE_1904_PATTERN.search(archive.read("xl/workbook.xml"))
+        epoch = CALENDAR_MAC_1904 if date_1904 else CALENDAR_WINDOWS_1900
+
+        for sheet, part in _sheet_parts(archive):
+            with archive.open(part) as handle:
+                dimension, non_empty_rows, non_empty_cols, raw_head = scan_sheet_xml(
+                    handle, shared_strings, date_styles, epoch, scan_limit
+                )
+            header_row = detect_header_row(raw_head, scan_limit) if not raw_head.empty else 0
+            report.append(
+                {
+                    "hoja": sheet,
+                    "filas_no_vacias": non_empty_rows,
+                    "columnas_no_vacias": non_empty_cols,
+                    "fila_header_detectada": header_row + 1,
+                    "dimension": dimension,
+                }
+            )
+    return report
+
+
+def inspect_excel_structure(excel_path: Path, fast: bool = False) -> list[dict[str, object]]:
     if not excel_path.exists():
         raise FileNotFoundError(f"No existe el archivo: {excel_path}")
 
-    workbook = pd.ExcelFile(excel_path)
+    if fast and excel_path.suffix.lower() in STREAMING_EXTENSIONS:
+        return inspect_excel_fast(excel_path)
+
     report: list[dict[str, object]] = []
 
-    for sheet in workbook.sheet_names:
-        raw = pd.read_excel(excel_path, sheet_name=sheet, header=None, dtype=object)
-        header_row = detect_header_row(raw) if not raw.empty else 0
-        non_empty_rows = int(raw.dropna(axis=0, how="all").shape[0])
-        non_empty_cols = int(raw.dropna(axis=1, how="all").shape[1])
-
-        report.append(
-            {
-                "hoja": sheet,
-                "filas_no_vacias": non_empty_rows,
-                "columnas_no_vacias": non_empty_cols,
-                "fila_header_detectada": header_row + 1,
-            }
-        )
+    with open_workbook(excel_path) as workbook:
+        for sheet in workbook.sheet_names:
+            raw = pd.read_excel(workbook, sheet_name=sheet, header=None, dtype=object)
+            header_row = detect_header_row(raw) if not raw.empty else 0
+            non_empty_rows = int(raw.dropna(axis=0, how="all").shape[0])
+            non_empty_cols = int(raw.dropna(axis=1, how="all").shape[1])
+
+            report.append(
+                {
+                    "hoja": sheet,
+                    "filas_no_vacias": non_empty_rows,
+                    "columnas_no_vacias": non_empty_cols,
+                    "fila_header_detectada": header_row + 1,
+                }
+            )
 
     return report
 
@@ -36,10 +270,15 @@ def inspect_excel_structure(excel_path: Path) -> list[dict[str, object]]:
 def cli(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Inspeccionar estructura de Excel")
     parser.add_argument("--excel-path", required=True, help="Ruta del archivo Excel")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Modo rapido para .xlsx/.xlsm: dimension declarada y conteo en streaming sin cargar las hojas",
+    )
     args = parser.parse_args(argv)
 
     excel_path = Path(args.excel_path).expanduser().resolve()
-    report = inspect_excel_structure(excel_path)
+    report = inspect_excel_structure(excel_path, fast=args.fast)
 
     print(f"[OK] Analisis de: {excel_path}")
     for item in report:
@@ -47,6 +286,7 @@ def cli(argv: list[str] | None = None) -> int:
             f" - {item['hoja']}: filas={item['filas_no_vacias']}, "
             f"columnas={item['columnas_no_vacias']}, "
             f"header_sugerido=fila {item['fila_header_detectada']}"
+            + (f", dimension={item['dimension']}" if item.get("dimension") else "")
         )
 
     return 0
@@ -1,12 +1,86 @@
 from __future__ import annotations
 
 import argparse
+import io
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator, TextIO
 
 import pandas as pd
 from pandas.errors import EmptyDataError
 
-from .csv_sql import detect_delimiter
+from .columnar import FILE_FORMATS, check_file_format, output_name, write_columnar_frames
+from .csv_reader import CSV_ENGINES, CsvDialect, iter_csv_frames, read_csv_header, sniff_csv_dialect
+from .csv_sql import READ_CHUNK_ROWS
+
+MERGE_LOOKAHEAD = 4
+
+
+def scan_csv_file(csv_file: Path, encoding: str) -> tuple[CsvDialect, list[str]]:
+    dialect = sniff_csv_dialect(csv_file, encoding)
+    try:
+        return dialect, read_csv_header(csv_file, dialect.delimiter, dialect.encoding)
+    except EmptyDataError:
+        return dialect, []
+
+
+def merged_columns(headers: Iterable[list[str]], include_source_column: bool) -> list[str]:
+    columns: list[str] = []
+    seen: set[str] = set()
+    for header in headers:
+        if include_source_column:
+            header = [*header, "source_file"]
+        for column in header:
+            if column not in seen:
+                seen.add(column)
+                columns.append(column)
+    return columns
+
+
+def iter_merged_frames(
+    csv_file: Path,
+    dialect: CsvDialect,
+    columns: list[str],
+    include_source_column: bool,
+    csv_engine: str = "auto",
+) -> Iterator[pd.DataFrame]:
+    try:
+        chunks = iter_csv_frames(csv_file, dialect.delimiter, dialect.encoding, READ_CHUNK_ROWS, engine=csv_engine)
+        for chunk in chunks:
+            if include_source_column:
+                chunk["source_file"] = csv_file.name
+            yield chunk.reindex(columns=columns)
+    except EmptyDataError:
+        return
+
+
+def write_merged_frames(handle: TextIO, frames: Iterable[pd.DataFrame]) -> None:
+    pending: list[pd.DataFrame] = []
+    pending_rows = 0
+    for frame in frames:
+        pending.append(frame)
+        pending_rows += len(frame)
+        if pending_rows >= READ_CHUNK_ROWS:
+            pd.concat(pending).to_csv(handle, header=False, index=False)
+            pending, pending_rows = [], 0
+    if pending:
+        pd.concat(pending).to_csv(handle, header=False, index=False)
+
+
+def render_merged_rows(
+    csv_file: Path,
+    dialect: CsvDialect,
+    columns: list[str],
+    include_source_column: bool,
+    csv_engine: str = "auto",
+) -> str:
+    buffer = io.StringIO()
+    write_merged_frames(buffer, iter_merged_frames(csv_file, dialect, columns, include_source_column, csv_engine))
+    return buffer.getvalue()
 
 
 def merge_csv_folder(
@@ -14,40 +88,94 @@ def merge_csv_folder(
     output_file: Path | None = None,
     encoding: str = "utf-8",
     include_source_column: bool = True,
+    csv_engine: str = "auto",
+    workers: int = 1,
+    file_format: str = "csv",
 ) -> Path:
     if not folder_path.exists() or not folder_path.is_dir():
         raise FileNotFoundError(f"No existe la carpeta: {folder_path}")
+    check_file_format(file_format)
 
     csv_files = sorted(folder_path.glob("*.csv"))
     if not csv_files:
         raise ValueError("No hay CSV para combinar")
 
-    frames: list[pd.DataFrame] = []
-    for csv_file in csv_files:
-        delimiter = detect_delimiter(csv_file)
-        try:
-            df = pd.read_csv(csv_file, dtype=object, sep=delimiter, encoding=encoding, engine="python")
-        except EmptyDataError:
-            df = pd.DataFrame()
-        if include_source_column:
-            df["source_file"] = csv_file.name
-        frames.append(df)
-
-    merged = pd.concat(frames, axis=0, ignore_index=True, sort=False)
     if output_file is None:
-        output_file = folder_path / "merged_all.csv"
-
+        output_file = folder_path / output_name("merged_all.csv", file_format)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    merged.to_csv(output_file, index=False, encoding="utf-8")
+
+    if file_format != "csv":
+        scans = [scan_csv_file(csv_file, encoding) for csv_file in csv_files]
+        columns = merged_columns((header for _, header in scans), include_source_column)
+        write_columnar_frames(
+            lambda: (
+                frame
+                for csv_file, (dialect, _) in zip(csv_files, scans)
+                for frame in iter_merged_frames(csv_file, dialect, columns, include_source_column, csv_engine)
+            ),
+            output_file,
+            file_format,
+            columns,
+        )
+        return output_file
+
+    workers = max(1, min(workers, len(csv_files)))
+    part_file = output_file.with_name(f"{output_file.name}.part")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+            scan = partial(scan_csv_file, encoding=encoding)
+            scans = list(executor.map(scan, csv_files, chunksize=16) if executor else map(scan, csv_files))
+            columns = merged_columns((header for _, header in scans), include_source_column)
+
+            with part_file.open("w", encoding="utf-8", newline="") as handle:
+                pd.DataFrame(columns=columns).to_csv(handle, index=False)
+                if executor is None:
+                    write_merged_frames(
+                        handle,
+                        (
+                            frame
+                            for csv_file, (dialect, _) in zip(csv_files, scans)
+                            for frame in iter_merged_frames(
+                                csv_file, dialect, columns, include_source_column, csv_engine
+                            )
+                        ),
+                    )
+                else:
+                    render = partial(
+                        render_merged_rows,
+                        columns=columns,
+                        include_source_column=include_source_column,
+                        csv_engine=csv_engine,
+                    )
+                    remaining = zip(csv_files, (dialect for dialect, _ in scans))
+                    pending: deque[Future[str]] = deque(
+                        executor.submit(render, csv_file, dialect)
+                        for csv_file, dialect in islice(remaining, workers * MERGE_LOOKAHEAD)
+                    )
+                    while pending:
+                        handle.write(pending.popleft().result())
+                        for csv_file, dialect in islice(remaining, 1):
+                            pending.append(executor.submit(render, csv_file, dialect))
+        part_file.replace(output_file)
+    finally:
+        part_file.unlink(missing_ok=True)
     return output_file
 
 
 def cli(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Combinar CSV de una carpeta en uno solo")
     parser.add_argument("--folder-path", required=True, help="Carpeta con CSV")
-    parser.add_argument("--output-file", help="Archivo CSV de salida")
+    parser.add_argument("--output-file", help="Archivo de salida (default: merged_all con la extension del formato)")
+    parser.add_argument(
+        "--format",
+        default="csv",
+        choices=FILE_FORMATS,
+        help="Formato de salida: csv, parquet o arrow (tipados y comprimidos, requieren pyarrow)",
+    )
     parser.add_argument("--encoding", default="utf-8", help="Encoding de lectura")
+    parser.add_argument("--csv-engine", default="auto", choices=CSV_ENGINES, help="Motor de lectura CSV")
     parser.add_argument("--no-source-column", action="store_true", help="No agregar columna source_file")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos de lectura en paralelo (solo CSV)")
     args = parser.parse_args(argv)
 
     folder_path = Path(args.folder_path).expanduser().resolve()
@@ -58,6 +186,10 @@ def cli(argv: list[str] | None = None) -> int:
         output_file=output_file,
         encoding=args.encoding,
         include_source_column=not args.no_source_column,
+        csv_engine=args.csv_engine,
+        workers=max(1, args.workers),
+        file_format=args.format,
     )
-    print(f"[OK] CSV combinado generado en: {generated}")
+    label = "CSV" if args.format == "csv" else args.format.capitalize()
+    print(f"[OK] {label} combinado generado en: {generated}")
     return 0
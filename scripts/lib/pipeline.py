@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from .common import TEMP_SQL_DIRNAME, unique_column_names
+from .csv_reader import csv_text_frame
+from .csv_sql import (
+    DEFAULT_TABLE_ROUTER,
+    OUTPUT_FORMATS,
+    SqlGenerationReport,
+    frames_to_insert_sql_generic,
+    frames_to_insert_sql_warehouse_clean,
+)
+from .delta_sql import DELTA_STYLES
+from .excel_csv import iter_excel_frames, resolve_excel_sources
+from .table_routing import load_routing_file
+from .validate_csv import (
+    REPORT_FORMATS,
+    check_stats_file,
+    render_validation_report,
+    validate_frame,
+    write_column_stats,
+)
+
+JOB_SECTIONS = ("source", "extract", "validate", "sql")
+EXTRACT_DEFAULTS: dict[str, object] = {
+    "sheets": [],
+    "date_keywords": ["fecha", "date"],
+    "drop_empty_rows": True,
+    "csv_dir": None,
+    "delimiter": ",",
+    "encoding": "utf-8",
+}
+VALIDATE_DEFAULTS: dict[str, object] = {
+    "report_file": None,
+    "stats_file": None,
+    "fail_on": [],
+}
+SQL_DEFAULTS: dict[str, object] = {
+    "profile": "warehouse_clean",
+    "output_file": None,
+    "output_dir": None,
+    "output_format": "insert",
+    "chunk_size": 500,
+    "wrap_transaction": True,
+    "single_row_inserts": False,
+    "table_prefix": "",
+    "delta": False,
+    "delta_style": "update",
+    "delta_deletes": False,
+    "delta_index_dir": None,
+    "routing_file": None,
+}
+VALIDATION_CHECKS = ("columnas_duplicadas", "columnas_vacias", "filas_vacias")
+
+
+@dataclass
+class PipelineReport:
+    extracted: dict[str, int] = field(default_factory=dict)
+    validation: list[dict[str, object]] = field(default_factory=list)
+    sql: SqlGenerationReport | None = None
+    outputs: list[Path] = field(default_factory=list)
+
+
+def load_job_file(job_file: Path) -> dict[str, object]:
+    if not job_file.exists():
+        raise FileNotFoundError(f"No existe el archivo de trabajo: {job_file}")
+
+    text = job_file.read_text(encoding="utf-8")
+    if job_file.suffix.lower() in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError("Instala PyYAML para usar trabajos .yml/.yaml (o usa un archivo .json)") from exc
+        job = yaml.safe_load(text)
+    else:
+        job = json.loads(text)
+
+    if not isinstance(job, dict):
+        raise ValueError(f"El archivo de trabajo debe contener un objeto: {job_file}")
+    return job
+
+
+def _section(job: dict[str, object], name: str, defaults: dict[str, object]) -> dict[str, object] | None:
+    raw = job.get(name)
+    if raw is None or raw is False:
+        return None
+    if raw is True:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"La seccion '{name}' debe ser un objeto, true o false")
+
+    unknown = sorted(set(raw) - set(defaults))
+    if unknown:
+        raise ValueError(f"Claves desconocidas en '{name}': {', '.join(unknown)}")
+    return {**defaults, **raw}
+
+
+def _job_path(base_dir: Path, value: object) -> Path | None:
+    if value in (None, ""):
+        return None
+    path = Path(str(value)).expanduser()
+    return (path if path.is_absolute() else base_dir / path).resolve()
+
+
+def _check_validation(item: dict[str, object], fail_on: list[str]) -> None:
+    failed = [f"{check}={item[check]}" for check in fail_on if item[check]]
+    if failed:
+        raise ValueError(f"Validacion fallida en {item['archivo']}: {', '.join(failed)}")
+
+
+def run_pipeline(job: dict[str, object], base_dir: Path | None = None) -> PipelineReport:
+    base_dir = base_dir or Path.cwd()
+    unknown = sorted(set(job) - set(JOB_SECTIONS))
+    if unknown:
+        raise ValueError(f"Secciones desconocidas en el trabajo: {', '.join(unknown)}")
+    if not job.get("source"):
+        raise ValueError("El trabajo requiere 'source' (Excel, carpeta o patron glob)")
+
+    extract = _section(job, "extract", EXTRACT_DEFAULTS) or dict(EXTRACT_DEFAULTS)
+    validate = _section(job, "validate", VALIDATE_DEFAULTS)
+    sql = _section(job, "sql", SQL_DEFAULTS)
+
+    source = str(job["source"])
+    source = source if Path(source).expanduser().is_absolute() else str(base_dir / source)
+    excel_paths = resolve_excel_sources(Path(source).expanduser())
+    if not excel_paths:
+        raise ValueError("No se encontraron archivos Excel (.xlsx, .xls o .xlsm)")
+    for excel_path in excel_paths:
+        if not excel_path.exists():
+            raise FileNotFoundError(f"No existe el archivo Excel: {excel_path}")
+
+    fail_on = list(validate["fail_on"]) if validate else []
+    invalid_checks = [check for check in fail_on if check not in VALIDATION_CHECKS]
+    if invalid_checks:
+        raise ValueError(f"Chequeos no soportados en fail_on: {', '.join(invalid_checks)}")
+    report_file = _job_path(base_dir, validate["report_file"]) if validate else None
+    report_format = report_file.suffix.lower().lstrip(".") if report_file is not None else ""
+    if report_file is not None and report_format not in REPORT_FORMATS:
+        raise ValueError(f"Formato de reporte no soportado: {report_file.name} (usa .json o .csv)")
+    stats_file = _job_path(base_dir, validate["stats_file"]) if validate else None
+    if stats_file is not None:
+        check_stats_file(stats_file)
+    if sql and sql["profile"] not in {"warehouse_clean", "generic"}:
+        raise ValueError("Perfil invalido. Usa 'warehouse_clean' o 'generic'")
+    if sql and sql["output_format"] not in OUTPUT_FORMATS:
+        raise ValueError(f"Formato de salida no soportado: {sql['output_format']}")
+    if sql and sql["delta_style"] not in DELTA_STYLES:
+        raise ValueError(f"Estilo delta no soportado: {sql['delta_style']}")
+    if sql and sql["delta"] and sql["profile"] == "generic":
+        raise ValueError("El modo delta solo aplica al perfil warehouse_clean")
+
+    batch_mode = len(excel_paths) > 1
+    folders = unique_column_names([path.stem for path in excel_paths])
+    output_root = Path(os.path.commonpath([str(path.parent) for path in excel_paths]))
+    csv_dir = _job_path(base_dir, extract["csv_dir"])
+    report = PipelineReport()
+
+    def frames() -> Iterator[tuple[str, pd.DataFrame]]:
+        for excel_path, folder in zip(excel_paths, folders):
+            sheet_frames = iter_excel_frames(
+                excel_path,
+                sheets=list(extract["sheets"]) or None,
+                date_keywords=list(extract["date_keywords"]),
+                drop_empty_rows=bool(extract["drop_empty_rows"]),
+            )
+            for csv_name, df in sheet_frames:
+                name = f"{folder}/{csv_name}" if batch_mode else csv_name
+                report.extracted[name] = len(df)
+                if csv_dir is not None:
+                    csv_file = csv_dir / name
+                    csv_file.parent.mkdir(parents=True, exist_ok=True)
+                    df.to_csv(csv_file, index=False, encoding=str(extract["encoding"]), sep=str(extract["delimiter"]))
+
+                text = csv_text_frame(df)
+                if validate is not None:
+                    item = validate_frame(name, text, delimiter=str(extract["delimiter"]))
+                    report.validation.append(item)
+                    _check_validation(item, fail_on)
+                yield name, text
+
+    if sql is None:
+        for _ in frames():
+            pass
+    elif sql["profile"] == "generic":
+        output_dir = _job_path(base_dir, sql["output_dir"]) or output_root / TEMP_SQL_DIRNAME
+        report.sql = frames_to_insert_sql_generic(
+            frames(),
+            output_dir=output_dir,
+            table_prefix=str(sql["table_prefix"]),
+            chunk_size=max(1, int(sql["chunk_size"])),
+            output_format=str(sql["output_format"]),
+        )
+    else:
+        default_output_file = output_root / TEMP_SQL_DIRNAME / "warehouse_seed.sql"
+        output_file = _job_path(base_dir, sql["output_file"]) or default_output_file
+        routing_file = _job_path(base_dir, sql["routing_file"])
+        report.sql = frames_to_insert_sql_warehouse_clean(
+            frames(),
+            output_file=output_file,
+            wrap_transaction=bool(sql["wrap_transaction"]),
+            chunk_size=max(1, int(sql["chunk_size"])),
+            single_row_inserts=bool(sql["single_row_inserts"]),
+            output_format=str(sql["output_format"]),
+            delta=bool(sql["delta"]),
+            delta_style=str(sql["delta_style"]),
+            delta_deletes=bool(sql["delta_deletes"]),
+            delta_index_dir=_job_path(base_dir, sql["delta_index_dir"]),
+            router=load_routing_file(routing_file, defaults=DEFAULT_TABLE_ROUTER) if routing_file else None,
+        )
+    if report.sql is not None:
+        report.outputs.append(Path(report.sql.output_path))
+    if csv_dir is not None:
+        report.outputs.append(csv_dir)
+
+    if validate is not None:
+        if report_file is not None:
+            rendered = render_validation_report(report.validation, report_format)
+            report_file.parent.mkdir(parents=True, exist_ok=True)
+            report_file.write_text(rendered, encoding="utf-8")
+            report.outputs.append(report_file)
+        if stats_file is not None:
+            report.outputs.append(write_column_stats(report.validation, stats_file))
+    return report
+
+
+def cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ejecutar Excel -> validacion -> SQL en un solo proceso desde un archivo de trabajo JSON/YAML"
+    )
+    parser.add_argument("job_file", help="Archivo de trabajo (.json, o .yml/.yaml con PyYAML instalado)")
+    args = parser.parse_args(argv)
+
+    job_file = Path(args.job_file).expanduser().resolve()
+    report = run_pipeline(load_job_file(job_file), base_dir=job_file.parent)
+
+    print(f"[OK] Hojas procesadas: {len(report.extracted)}")
+    for name, rows in report.extracted.items():
+        print(f" - {name}: {rows} filas")
+    for item in report.validation:
+        print(
+            f" - VALIDACION {item['archivo']}: cols={item['columnas']}, "
+            f"dup_cols={item['columnas_duplicadas']}, cols_vacias={item['columnas_vacias']}, "
+            f"filas_vacias={item['filas_vacias']}"
+        )
+    if report.sql is not None:
+        print(f"[OK] Perfil usado: {report.sql.profile}")
+        for item_name, rows in report.sql.items.items():
+            print(f" - {item_name}: {rows} filas convertidas")
+        for note in report.sql.notes:
+            print(f" - NOTE: {note}")
+    for output in report.outputs:
+        print(f"[OK] Salida: {output}")
+    return 0
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_float_dtype, is_integer_dtype
+
+FACTORIZE_SAMPLE_SIZE = 2048
+COPY_NULL = "\\N"
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def sql_literal(value: object) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "NULL"
+
+    if isinstance(value, str):
+        trimmed = value.strip()
+        if not trimmed:
+            return "NULL"
+        escaped = trimmed.replace("'", "''")
+        return f"'{escaped}'"
+
+    if isinstance(value, (int, float)) and not pd.isna(value):
+        return str(value)
+
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
+
+    text = str(value).strip()
+    if not text:
+        return "NULL"
+
+    escaped = text.replace("'", "''")
+    return f"'{escaped}'"
+
+
+def copy_literal(value: object) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return COPY_NULL
+
+    if isinstance(value, (int, float)) and not pd.isna(value):
+        return str(value)
+
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+    text = str(value).strip()
+    if not text:
+        return COPY_NULL
+    return text.translate(COPY_ESCAPES)
+
+
+def param_value(value: object) -> object:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+
+    if isinstance(value, str):
+        return value.strip() or None
+
+    if isinstance(value, (int, float)) and not pd.isna(value):
+        return value
+
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+    return str(value).strip() or None
+
+
+def _plain_nulls(values: pd.Series, null_mask: pd.Series) -> bool:
+    return all(value is None or isinstance(value, float) for value in values[null_mask])
+
+
+def _repetitive(values: pd.Series) -> bool:
+    sample = values.iloc[:FACTORIZE_SAMPLE_SIZE]
+    return sample.nunique(dropna=False) <= len(sample) // 2
+
+
+def _literal_series(values: pd.Series, literal: Callable[[object], object], null_token: object) -> pd.Series:
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and (is_bool_dtype(dtype) or is_integer_dtype(dtype)):
+        return values.astype(str)
+
+    if isinstance(dtype, np.dtype) and is_float_dtype(dtype):
+        return pd.Series(np.where(values.isna(), null_token, values.astype(str)), index=values.index, dtype=object)
+
+    if dtype == object and len(values) and _repetitive(values) and infer_dtype(values, skipna=True) == "string":
+        null_mask = values.isna()
+        if not null_mask.any() or _plain_nulls(values, null_mask):
+            codes, uniques = pd.factorize(values)
+            rendered = np.array([literal(value) for value in uniques] + [null_token], dtype=object)
+            return pd.Series(rendered[codes], index=values.index, dtype=object)
+
+    cells = values.tolist() if isinstance(dtype, np.dtype) else values
+    return pd.Series([literal(value) for value in cells], index=values.index, dtype=object)
+
+
+def sql_literal_series(values: pd.Series) -> pd.Series:
+    return _literal_series(values, sql_literal, "NULL")
+
+
+def copy_literal_series(values: pd.Series) -> pd.Series:
+    return _literal_series(values, copy_literal, COPY_NULL)
+
+
+def param_values(values: pd.Series) -> list[object]:
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and (is_bool_dtype(dtype) or is_integer_dtype(dtype)):
+        return values.tolist()
+
+    if isinstance(dtype, np.dtype) and is_float_dtype(dtype):
+        return [None if pd.isna(value) else value for value in values.tolist()]
+
+    return _literal_series(values, param_value, None).tolist()
+
+
+def render_sql_rows(df: pd.DataFrame) -> list[str]:
+    if df.shape[1] == 0:
+        return ["()"] * len(df)
+
+    columns = [sql_literal_series(df.iloc[:, idx]).tolist() for idx in range(df.shape[1])]
+    return [f"({', '.join(values)})" for values in zip(*columns)]
+
+
+def render_copy_rows(df: pd.DataFrame) -> list[str]:
+    if df.shape[1] == 0:
+        return [""] * len(df)
+
+    columns = [copy_literal_series(df.iloc[:, idx]).tolist() for idx in range(df.shape[1])]
+    return ["\t".join(values) for values in zip(*columns)]
+
+
+def render_param_rows(df: pd.DataFrame) -> list[tuple[object, ...]]:
+    if df.shape[1] == 0:
+        return [()] * len(df)
+
+    columns = [param_values(df.iloc[:, idx]) for idx in range(df.shape[1])]
+    return list(zip(*columns))
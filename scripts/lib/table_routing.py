@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .common import sanitize_name
+
+ROUTING_KEYS = ("rules", "ignore", "include_defaults")
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    pattern: str
+    table: str
+    priority: int = 0
+
+
+class KeywordAutomaton:
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = child
+            self._out[node] += (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0) if node else 0
+                self._out[child] += self._out[self._fail[child]]
+
+    def matches(self, text: str) -> Iterator[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            yield from out[node]
+
+    def contains_any(self, text: str) -> bool:
+        return next(self.matches(text), None) is not None
+
+
+class TableRouter:
+    def __init__(self, rules: Iterable[RoutingRule], ignore: Iterable[str] = ()) -> None:
+        self.rules = list(rules)
+        self.ignore = list(ignore)
+        self._rules = KeywordAutomaton(rule.pattern for rule in self.rules)
+        self._ignore = KeywordAutomaton(self.ignore)
+
+    @classmethod
+    def from_mapping(cls, mapping: dict[str, str], ignore: Iterable[str] = ()) -> TableRouter:
+        rules = [RoutingRule(pattern, table, -index - 1) for index, (pattern, table) in enumerate(mapping.items())]
+        return cls(rules, ignore)
+
+    def resolve(self, name: str) -> str | None:
+        best: tuple[bool, int, int, int] | None = None
+        for index in self._rules.matches(name):
+            rule = self.rules[index]
+            rank = (len(rule.pattern) == len(name), rule.priority, len(rule.pattern), -index)
+            if best is None or rank > best:
+                best = rank
+        return None if best is None else self.rules[-best[3]].table
+
+    def ignores(self, name: str) -> bool:
+        return self._ignore.contains_any(name)
+
+
+def _parse_rules(raw: object) -> list[RoutingRule]:
+    if isinstance(raw, dict):
+        raw = [{"pattern": pattern, "table": table} for pattern, table in raw.items()]
+    if not isinstance(raw, list):
+        raise ValueError("'rules' debe ser una lista de reglas o un objeto patron -> tabla")
+
+    rules: list[RoutingRule] = []
+    for item in raw:
+        if not isinstance(item, dict) or not item.get("pattern") or not item.get("table"):
+            raise ValueError(f"Regla de ruteo invalida (requiere pattern y table): {item}")
+        pattern = sanitize_name(str(item["pattern"]), fallback="")
+        if not pattern:
+            raise ValueError(f"Patron de ruteo vacio tras normalizar: {item['pattern']}")
+        rules.append(RoutingRule(pattern, str(item["table"]), int(item.get("priority", 0))))
+    return rules
+
+
+def load_routing_file(routing_file: Path, defaults: TableRouter | None = None) -> TableRouter:
+    if not routing_file.exists():
+        raise FileNotFoundError(f"No existe el archivo de ruteo: {routing_file}")
+
+    config = json.loads(routing_file.read_text(encoding="utf-8"))
+    if not isinstance(config, dict):
+        raise ValueError(f"El archivo de ruteo debe contener un objeto: {routing_file}")
+    unknown = sorted(set(config) - set(ROUTING_KEYS))
+    if unknown:
+        raise ValueError(f"Claves desconocidas en el archivo de ruteo: {', '.join(unknown)}")
+
+    rules = _parse_rules(config.get("rules", []))
+    ignore = [sanitize_name(str(keyword), fallback="") for keyword in config.get("ignore", [])]
+    if defaults is not None and config.get("include_defaults", True):
+        rules.extend(defaults.rules)
+        ignore.extend(defaults.ignore)
+    return TableRouter(rules, [keyword for keyword in ignore if keyword])
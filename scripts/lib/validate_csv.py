@@ -1,15 +1,112 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import io
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Iterable
 
 import pandas as pd
 from pandas.errors import EmptyDataError
 
-from .csv_sql import detect_delimiter
+from .column_stats import ColumnProfile
+from .csv_reader import CSV_ENGINES, iter_csv_frames, read_csv_header, sniff_csv_dialect
+from .csv_sql import READ_CHUNK_ROWS
 
+REPORT_FORMATS = ("json", "csv")
+STATS_SUFFIXES = (".json", ".csv")
+REPORT_FIELDS = [
+    "archivo",
+    "filas",
+    "columnas",
+    "delimitador",
+    "columnas_duplicadas",
+    "columnas_vacias",
+    "filas_vacias",
+]
+COLUMN_STATS_FIELDS = [
+    "archivo",
+    "filas",
+    "columna",
+    "nulos",
+    "distintos_aprox",
+    "longitud_min",
+    "longitud_max",
+    "tipo_inferido",
+]
 
-def validate_csv_folder(folder_path: Path, encoding: str = "utf-8") -> list[dict[str, object]]:
+
+def _report_item(name: str, delimiter: str) -> dict[str, object]:
+    return {
+        "archivo": name,
+        "filas": 0,
+        "columnas": 0,
+        "delimitador": delimiter,
+        "columnas_duplicadas": 0,
+        "columnas_vacias": 0,
+        "filas_vacias": 0,
+        "estadisticas_columnas": [],
+    }
+
+
+def _profile_frames(item: dict[str, object], frames: Iterable[pd.DataFrame]) -> list[ColumnProfile] | None:
+    profiles: list[ColumnProfile] | None = None
+    rows = 0
+    empty_rows = 0
+    for chunk in frames:
+        if profiles is None:
+            profiles = [ColumnProfile(str(name)) for name in chunk.columns]
+            item["columnas_duplicadas"] = int(chunk.columns.duplicated().sum())
+        rows += len(chunk)
+        empty_rows += int(chunk.isna().all(axis=1).sum())
+        for idx, profile in enumerate(profiles):
+            profile.update(chunk.iloc[:, idx])
+    item["filas"] = rows
+    item["filas_vacias"] = empty_rows
+    return profiles
+
+
+def _finish_report_item(item: dict[str, object], profiles: list[ColumnProfile]) -> dict[str, object]:
+    item["columnas"] = len(profiles)
+    item["columnas_vacias"] = sum(1 for profile in profiles if profile.nulls == item["filas"])
+    item["estadisticas_columnas"] = [profile.as_dict() for profile in profiles]
+    return item
+
+
+def validate_csv_file(csv_file: Path, encoding: str = "utf-8", csv_engine: str = "auto") -> dict[str, object]:
+    dialect = sniff_csv_dialect(csv_file, encoding)
+    item = _report_item(csv_file.name, dialect.delimiter)
+
+    try:
+        chunks = iter_csv_frames(csv_file, dialect.delimiter, dialect.encoding, READ_CHUNK_ROWS, engine=csv_engine)
+        profiles = _profile_frames(item, chunks)
+        if profiles is None:
+            profiles = [
+                ColumnProfile(name) for name in read_csv_header(csv_file, dialect.delimiter, dialect.encoding)
+            ]
+    except EmptyDataError:
+        return _report_item(csv_file.name, dialect.delimiter)
+
+    return _finish_report_item(item, profiles)
+
+
+def validate_frame(name: str, frame: pd.DataFrame, delimiter: str = ",") -> dict[str, object]:
+    item = _report_item(name, delimiter)
+    if frame.shape[1] == 0:
+        return item
+    return _finish_report_item(item, _profile_frames(item, [frame]))
+
+
+def validate_csv_folder(
+    folder_path: Path,
+    encoding: str = "utf-8",
+    csv_engine: str = "auto",
+    workers: int = 1,
+) -> list[dict[str, object]]:
     if not folder_path.exists() or not folder_path.is_dir():
         raise FileNotFoundError(f"No existe la carpeta: {folder_path}")
 
@@ -17,59 +114,105 @@ def validate_csv_folder(folder_path: Path, encoding: str = "utf-8") -> list[dict
     if not csv_files:
         raise ValueError("No hay CSV para validar")
 
-    report: list[dict[str, object]] = []
-    for csv_file in csv_files:
-        delimiter = detect_delimiter(csv_file)
-        try:
-            df = pd.read_csv(csv_file, dtype=object, sep=delimiter, encoding=encoding, engine="python")
-        except EmptyDataError:
-            report.append(
-                {
-                    "archivo": csv_file.name,
-                    "filas": 0,
-                    "columnas": 0,
-                    "delimitador": delimiter,
-                    "columnas_duplicadas": 0,
-                    "columnas_vacias": 0,
-                    "filas_vacias": 0,
-                }
-            )
-            continue
+    validate = partial(validate_csv_file, encoding=encoding, csv_engine=csv_engine)
+    workers = max(1, min(workers, len(csv_files)))
+    if workers == 1:
+        return [validate(csv_file) for csv_file in csv_files]
+
+    chunksize = max(1, len(csv_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate, csv_files, chunksize=chunksize))
+
+
+def render_validation_report(report: list[dict[str, object]], report_format: str) -> str:
+    if report_format == "json":
+        return json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+
+    if report_format != "csv":
+        raise ValueError(f"Formato de reporte no soportado: {report_format}")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REPORT_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(report)
+    return buffer.getvalue()
+
 
-        duplicated_columns = int(df.columns.duplicated().sum())
-        empty_columns = int(df.isna().all(axis=0).sum())
-        empty_rows = int(df.isna().all(axis=1).sum())
+def check_stats_file(output_file: Path) -> None:
+    if output_file.suffix.lower() not in STATS_SUFFIXES:
+        raise ValueError("El archivo de estadisticas debe terminar en .json o .csv")
 
-        report.append(
-            {
-                "archivo": csv_file.name,
-                "filas": int(df.shape[0]),
-                "columnas": int(df.shape[1]),
-                "delimitador": delimiter,
-                "columnas_duplicadas": duplicated_columns,
-                "columnas_vacias": empty_columns,
-                "filas_vacias": empty_rows,
-            }
-        )
 
-    return report
+def write_column_stats(report: list[dict[str, object]], output_file: Path) -> Path:
+    check_stats_file(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    if output_file.suffix.lower() == ".json":
+        payload = [
+            {"archivo": item["archivo"], "filas": item["filas"], "columnas": item["estadisticas_columnas"]}
+            for item in report
+        ]
+        output_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        return output_file
+
+    with output_file.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=COLUMN_STATS_FIELDS)
+        writer.writeheader()
+        for item in report:
+            for stats in item["estadisticas_columnas"]:
+                writer.writerow({"archivo": item["archivo"], "filas": item["filas"], **stats})
+    return output_file
 
 
 def cli(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Validar archivos CSV de una carpeta")
     parser.add_argument("--folder-path", required=True, help="Carpeta con CSV")
     parser.add_argument("--encoding", default="utf-8", help="Encoding de lectura")
+    parser.add_argument("--csv-engine", default="auto", choices=CSV_ENGINES, help="Motor de lectura CSV")
+    parser.add_argument("--stats-file", help="Guardar estadisticas por columna (.json o .csv)")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos de validacion en paralelo")
+    parser.add_argument(
+        "--report-format",
+        choices=REPORT_FORMATS,
+        help="Emitir el reporte como json o csv (stdout o --report-file) en lugar de texto",
+    )
+    parser.add_argument("--report-file", help="Archivo donde guardar el reporte json/csv")
     args = parser.parse_args(argv)
 
     folder_path = Path(args.folder_path).expanduser().resolve()
-    report = validate_csv_folder(folder_path, encoding=args.encoding)
-
-    print(f"[OK] Validacion de carpeta: {folder_path}")
-    for item in report:
-        print(
-            f" - {item['archivo']}: filas={item['filas']}, cols={item['columnas']}, "
-            f"delim='{item['delimitador']}', dup_cols={item['columnas_duplicadas']}, "
-            f"cols_vacias={item['columnas_vacias']}, filas_vacias={item['filas_vacias']}"
-        )
+    stats_file = Path(args.stats_file).expanduser().resolve() if args.stats_file else None
+    if stats_file is not None:
+        check_stats_file(stats_file)
+    report = validate_csv_folder(
+        folder_path,
+        encoding=args.encoding,
+        csv_engine=args.csv_engine,
+        workers=max(1, args.workers),
+    )
+
+    report_format = args.report_format
+    if args.report_file and not report_format:
+        report_format = "csv" if args.report_file.lower().endswith(".csv") else "json"
+    machine_stdout = bool(report_format) and not args.report_file
+
+    if machine_stdout:
+        sys.stdout.write(render_validation_report(report, report_format))
+    else:
+        print(f"[OK] Validacion de carpeta: {folder_path}")
+        for item in report:
+            print(
+                f" - {item['archivo']}: filas={item['filas']}, cols={item['columnas']}, "
+                f"delim='{item['delimitador']}', dup_cols={item['columnas_duplicadas']}, "
+                f"cols_vacias={item['columnas_vacias']}, filas_vacias={item['filas_vacias']}"
+            )
+
+    if args.report_file:
+        report_file = Path(args.report_file).expanduser().resolve()
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(render_validation_report(report, report_format), encoding="utf-8")
+        print(f"[OK] Reporte {report_format} en: {report_file}")
+
+    if stats_file is not None:
+        write_column_stats(report, stats_file)
+        print(f"[OK] Estadisticas por columna en: {stats_file}", file=sys.stderr if machine_stdout else sys.stdout)
 
     return 0
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from lib.pipeline import cli
+
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
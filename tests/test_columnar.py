@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from lib.columnar import infer_kinds, read_columnar_frame  # noqa: E402
+from lib.merge_csv import merge_csv_folder  # noqa: E402
+
+
+def test_malformed_dates_fall_back_to_string(tmp_path: Path) -> None:
+    (tmp_path / "a.csv").write_text(
+        "id,fecha,hora\n1,2024-01-31,2024-01-01 10:00\n2,2024-02-30,2024-01-01 25:00\n", encoding="utf-8"
+    )
+    (tmp_path / "b.csv").write_text("id,fecha,hora\n3,2024-03-01,2024-01-02 11:00\n", encoding="utf-8")
+
+    output = merge_csv_folder(tmp_path, output_file=tmp_path / "out" / "merged.parquet", file_format="parquet")
+
+    schema = pq.read_schema(output)
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("fecha").type == pa.string()
+    assert schema.field("hora").type == pa.string()
+    assert read_columnar_frame(output)["fecha"].tolist() == ["2024-01-31", "2024-02-30", "2024-03-01"]
+
+
+def test_valid_dates_keep_date_types() -> None:
+    import pandas as pd
+
+    frame = pd.DataFrame(
+        {"fecha": ["2024-01-31", None], "hora": ["2024-01-01 10:00", "2024-01-01 23:59:59"], "n": ["1.5", "2"]},
+        dtype=object,
+    )
+    assert infer_kinds([frame], list(frame.columns)) == {"fecha": "date", "hora": "timestamp", "n": "float"}
+
+
+def test_malformed_dates_in_arrow_output(tmp_path: Path) -> None:
+    (tmp_path / "a.csv").write_text("fecha\n2023-02-29\n2024-02-29\n", encoding="utf-8")
+
+    output = merge_csv_folder(tmp_path, output_file=tmp_path / "out" / "merged.arrow", file_format="arrow")
+
+    assert read_columnar_frame(output)["fecha"].tolist() == ["2023-02-29", "2024-02-29"]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from lib.common import CACHE_DIRNAME, TEMP_SQL_DIRNAME
+from lib.conversion_cache import ConversionCache
+
+
+def test_cache_lives_inside_custom_output_dir(tmp_path: Path) -> None:
+    assert ConversionCache.beside(tmp_path / "salida").root == tmp_path / "salida" / CACHE_DIRNAME
+    assert ConversionCache.beside(tmp_path / TEMP_SQL_DIRNAME).root == tmp_path / CACHE_DIRNAME
+
+
+def test_write_failure_disables_cache_with_note(tmp_path: Path) -> None:
+    source = tmp_path / "datos.csv"
+    source.write_text("a\n1\n", encoding="utf-8")
+    (tmp_path / "salida").mkdir()
+    (tmp_path / "salida" / CACHE_DIRNAME).write_text("", encoding="utf-8")
+
+    with ConversionCache.beside(tmp_path / "salida") as cache:
+        key = cache.entry_key("sql_generic", source, {})
+        cache.store(key, {"rows": 1}, {"datos.csv": source})
+
+    assert not cache.enabled
+    assert cache.lookup(key) is None
+    assert len(cache.notes) == 1 and "Cache deshabilitada" in cache.notes[0]
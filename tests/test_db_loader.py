@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from lib import csv_sql
+from lib.csv_sql import load_csv_to_database
+
+
+def _write(path: Path, text: str) -> Path:
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _rows(db_file: Path, query: str) -> list[tuple[object, ...]]:
+    with sqlite3.connect(db_file) as conn:
+        return conn.execute(query).fetchall()
+
+
+def test_load_streams_chunks_into_sqlite(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(csv_sql, "READ_CHUNK_ROWS", 2)
+    source = tmp_path / "csv"
+    source.mkdir()
+    _write(
+        source / "terapias.csv",
+        "id,fecha,paciente,extra\n1,2024-01-01,Ana,x\n2,,Luis,y\n3,2024-01-03,,z\n4,2024-01-04,Eva,w\n5,,,v\n",
+    )
+    _write(source / "users.csv", "id,email\nu1,a@x.org\nu2,\n")
+    db_file = tmp_path / "carga.db"
+
+    report = load_csv_to_database(source, f"sqlite:///{db_file}", chunk_size=2, create_tables=True)
+
+    assert report.items == {"terapias.csv -> stg_terapias": 5, "users.csv -> stg_profesionales": 2}
+    assert set(report.rows_per_second) == {"stg_terapias", "stg_profesionales"}
+    assert _rows(db_file, "SELECT appsheet_row_id, fecha, paciente FROM stg_terapias ORDER BY appsheet_row_id") == [
+        ("1", "2024-01-01", "Ana"),
+        ("2", None, "Luis"),
+        ("3", "2024-01-03", None),
+        ("4", "2024-01-04", "Eva"),
+        ("5", None, None),
+    ]
+    assert _rows(db_file, "SELECT appsheet_row_id, correo, email FROM stg_profesionales ORDER BY 1") == [
+        ("u1", "a@x.org", "a@x.org"),
+        ("u2", None, None),
+    ]
+
+
+def test_generic_load_keeps_all_columns(tmp_path: Path) -> None:
+    csv_file = _write(tmp_path / "Ventas Mes.csv", "Producto,Monto\nA,10\n,\nB,\n")
+    db_file = tmp_path / "carga.db"
+
+    report = load_csv_to_database(csv_file, f"sqlite:///{db_file}", profile="generic", create_tables=True)
+
+    assert report.items == {"Ventas Mes.csv -> ventas_mes": 2}
+    assert _rows(db_file, "SELECT producto, monto FROM ventas_mes ORDER BY producto") == [("A", "10"), ("B", None)]
+
+
+def test_failed_table_load_rolls_back(tmp_path: Path) -> None:
+    source = tmp_path / "csv"
+    source.mkdir()
+    _write(source / "terapia_a.csv", "id,paciente\n1,Ana\n2,Luis\n")
+    _write(source / "terapia_b.csv", "id,paciente\n3,Eva\n4,\n")
+    db_file = tmp_path / "carga.db"
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("CREATE TABLE stg_terapias (appsheet_row_id TEXT, paciente TEXT NOT NULL)")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        load_csv_to_database(source, f"sqlite:///{db_file}", chunk_size=1)
+
+    assert _rows(db_file, "SELECT COUNT(*) FROM stg_terapias") == [(0,)]
+
+
+def test_sqlite_loads_one_table_at_a_time(tmp_path: Path) -> None:
+    source = tmp_path / "csv"
+    source.mkdir()
+    _write(source / "terapias.csv", "id,paciente\n1,Ana\n")
+    _write(source / "users.csv", "id,email\nu1,a@x.org\n")
+    db_file = tmp_path / "carga.db"
+
+    report = load_csv_to_database(source, f"sqlite:///{db_file}", workers=4, create_tables=True)
+
+    assert report.notes == ["sqlite admite un solo escritor: se carga una tabla a la vez"]
+    assert report.items == {"terapias.csv -> stg_terapias": 1, "users.csv -> stg_profesionales": 1}
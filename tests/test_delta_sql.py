@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from lib.delta_sql import DeltaTracker, pending_delta_files, promote_delta_index
+
+
+def _run(index_dir: Path, frame: pd.DataFrame) -> tuple[int, int]:
+    tracker = DeltaTracker(index_dir)
+    new_rows, changed_rows = tracker.classify(frame, "stg_demo")
+    tracker.save()
+    return int(new_rows.sum()), int(changed_rows.sum())
+
+
+def test_index_changes_only_after_promotion(tmp_path: Path) -> None:
+    frame = pd.DataFrame({"appsheet_row_id": ["a", "b"], "valor": ["1", "2"]})
+
+    assert _run(tmp_path, frame) == (2, 0)
+    assert [path.name for path in pending_delta_files(tmp_path)] == ["stg_demo.tsv.gz.pending"]
+    assert _run(tmp_path, frame) == (2, 0)
+
+    assert promote_delta_index(tmp_path) == ["stg_demo"]
+    assert not pending_delta_files(tmp_path)
+    assert _run(tmp_path, frame) == (0, 0)
+    assert promote_delta_index(tmp_path) == ["stg_demo"]
+    assert promote_delta_index(tmp_path) == []
+
+
+def test_new_run_discards_stale_pending_tables(tmp_path: Path) -> None:
+    (tmp_path / "stg_otra.tsv.gz.pending").write_bytes(b"")
+
+    _run(tmp_path, pd.DataFrame({"appsheet_row_id": ["a"], "valor": ["1"]}))
+
+    assert [path.name for path in pending_delta_files(tmp_path)] == ["stg_demo.tsv.gz.pending"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+from lib import excel_csv
+from lib.excel_csv import convert_excel_to_csv
+
+
+def _convert_both(excel_path: Path, tmp_path: Path, **options: object) -> list[tuple[dict[str, int], bytes]]:
+    outputs = []
+    for streaming in (False, True):
+        output_dir = tmp_path / f"salida_{streaming}"
+        result = convert_excel_to_csv(excel_path, output_dir, streaming=streaming, use_cache=False, **options)
+        outputs.append((result, b"".join(path.read_bytes() for path in sorted(output_dir.glob("*.csv")))))
+    return outputs
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("drop_empty_rows", [True, False])
+def test_streaming_matches_dataframe_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, drop_empty_rows: bool
+) -> None:
+    monkeypatch.setattr(excel_csv, "SPOOL_BLOCK_ROWS", 2)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Hoja Uno"
+    sheet.append(["a", "a", "a_2", None, "Fecha Alta", "Fecha Texto"])
+    sheet.append(["1", "2", "3", None, "2024-02-03", "01/02/2024"])
+    sheet.append([None, None, None, None, None, None])
+    sheet.append(["4", "5", "6", None, None, "13/01/2024"])
+    sheet.append(["7", "8", "9", None, datetime(2024, 3, 4), "no fecha"])
+    sheet.append(["10", "11", "12", None, "sin fecha", "05/06/2024"])
+    sheet.append([])
+    excel_path = tmp_path / "libro.xlsx"
+    workbook.save(excel_path)
+
+    outputs = _convert_both(excel_path, tmp_path, drop_empty_rows=drop_empty_rows)
+
+    assert outputs[0] == outputs[1]
+    assert outputs[1][0] == {"hoja_uno.csv": 4}
+    lines = outputs[1][1].splitlines()
+    assert lines[0] == b"a,a_2,a_2_2,fecha_alta,fecha_texto"
+    assert [line.split(b",")[-1] for line in lines[1:]] == [b"2024-01-02", b"", b"", b"2024-05-06"]
+
+
+def test_streaming_keeps_columns_wider_than_the_scanned_rows(tmp_path: Path) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("datos")
+    sheet.append(["a", "b", "c"])
+    for idx in range(40):
+        sheet.append([str(idx), "x", "y"])
+    sheet.append(["1", "2", "3", "extra4", "extra5"])
+    excel_path = tmp_path / "libro.xlsx"
+    workbook.save(excel_path)
+
+    outputs = _convert_both(excel_path, tmp_path)
+
+    assert outputs[0] == outputs[1]
+    lines = outputs[1][1].splitlines()
+    assert lines[0] == b"a,b,c,columna_4,columna_5"
+    assert lines[-1] == b"1,2,3,extra4,extra5"
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from lib.pipeline import run_pipeline
+
+
+@pytest.mark.parametrize(
+    ("validate", "bad_name"),
+    [
+        ({"report_file": "reporte.txt"}, "reporte.txt"),
+        ({"stats_file": "estadisticas.txt"}, "estadisticas"),
+    ],
+)
+def test_bad_validation_suffix_fails_before_writing_outputs(
+    tmp_path: Path, validate: dict[str, str], bad_name: str
+) -> None:
+    pd.DataFrame({"appsheet_row_id": ["a"], "valor": ["1"]}).to_excel(tmp_path / "terapias.xlsx", index=False)
+    job = {
+        "source": "terapias.xlsx",
+        "extract": {"csv_dir": "csv"},
+        "validate": validate,
+        "sql": {"output_file": "seed.sql"},
+    }
+
+    with pytest.raises(ValueError, match=bad_name):
+        run_pipeline(job, base_dir=tmp_path)
+
+    assert not (tmp_path / "seed.sql").exists()
+    assert not (tmp_path / "csv").exists()
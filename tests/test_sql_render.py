@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lib.sql_render import (
+    copy_literal,
+    copy_literal_series,
+    param_value,
+    param_values,
+    sql_literal,
+    sql_literal_series,
+)
+
+FRAME = pd.DataFrame(
+    {
+        "texto": pd.Series([" a ", None, "b'c", np.nan, ""], dtype=object),
+        "repetido": pd.Series(["x", "y", "x", "x", None], dtype=object),
+        "entero": pd.Series([1, 2, 3, 4, 5], dtype="int64"),
+        "entero_nulo": pd.Series([1, None, 3, 4, 5], dtype="Int64"),
+        "logico": pd.Series([True, False, True, True, False]),
+        "logico_nulo": pd.Series([True, None, False, True, True], dtype="boolean"),
+        "decimal": pd.Series([1.5, np.nan, 3.0, 4.25, 1e20]),
+        "cadena": pd.Series(["x", None, "y", "z", "x"], dtype="string"),
+    }
+)
+
+
+@pytest.mark.parametrize(
+    ("literal", "render"),
+    [
+        (sql_literal, lambda values: sql_literal_series(values).tolist()),
+        (copy_literal, lambda values: copy_literal_series(values).tolist()),
+        (param_value, param_values),
+    ],
+)
+@pytest.mark.parametrize("column", FRAME.columns.tolist())
+def test_column_rendering_matches_per_cell_literals(literal: object, render: object, column: str) -> None:
+    position = FRAME.columns.get_loc(column)
+    expected = [literal(row[position]) for row in FRAME.itertuples(index=False, name=None)]
+
+    assert render(FRAME[column]) == expected
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from lib.csv_sql import DEFAULT_TABLE_ROUTER
+from lib.table_routing import KeywordAutomaton, RoutingRule, TableRouter, load_routing_file
+
+
+def _write_rules(tmp_path: Path, config: object) -> Path:
+    routing_file = tmp_path / "ruteo.json"
+    routing_file.write_text(json.dumps(config), encoding="utf-8")
+    return routing_file
+
+
+def test_automaton_reports_overlapping_matches() -> None:
+    automaton = KeywordAutomaton(["he", "she", "his", "hers"])
+
+    assert sorted(automaton.matches("ushers")) == [0, 1, 3]
+    assert list(automaton.matches("xyz")) == []
+    assert automaton.contains_any("this")
+    assert not KeywordAutomaton([]).contains_any("this")
+
+
+def test_explicit_priority_beats_longer_pattern() -> None:
+    router = TableRouter(
+        [RoutingRule("terapia_grupal", "stg_grupal"), RoutingRule("terapia", "stg_terapias", priority=5)]
+    )
+
+    assert router.resolve("terapia_grupal_norte") == "stg_terapias"
+    assert router.resolve("otro") is None
+
+
+def test_longer_pattern_wins_on_equal_priority() -> None:
+    router = TableRouter([RoutingRule("terapia", "stg_terapias"), RoutingRule("terapia_grupal", "stg_grupal")])
+
+    assert router.resolve("terapia_grupal_norte") == "stg_grupal"
+    assert router.resolve("terapia_norte") == "stg_terapias"
+
+
+def test_exact_name_wins_over_priority() -> None:
+    router = TableRouter([RoutingRule("chat", "stg_chat", priority=10), RoutingRule("chat_bloques", "stg_bloques")])
+
+    assert router.resolve("chat_bloques") == "stg_bloques"
+    assert router.resolve("chat_bloques_2024") == "stg_chat"
+
+
+def test_default_router_keeps_legacy_first_match_order() -> None:
+    assert DEFAULT_TABLE_ROUTER.resolve("usuarioterapia_sede") == "stg_terapias"
+    assert DEFAULT_TABLE_ROUTER.resolve("usuarioterapia") == "stg_profesionales"
+    assert DEFAULT_TABLE_ROUTER.ignores("grafica_x")
+
+
+def test_client_rule_overrides_builtin_substring(tmp_path: Path) -> None:
+    rules = [
+        {"pattern": "terapia_grupal", "table": "stg_grupal"},
+        {"pattern": "chat_sede", "table": "stg_sedes", "priority": -100},
+    ]
+    routing_file = _write_rules(tmp_path, {"rules": rules, "ignore": ["borrador"]})
+    router = load_routing_file(routing_file, defaults=DEFAULT_TABLE_ROUTER)
+
+    assert router.resolve("terapia_grupal_2024") == "stg_grupal"
+    assert router.resolve("chat_sede_norte") == "stg_chat"
+    assert router.resolve("terapia_2024") == "stg_terapias"
+    assert router.ignores("borrador_terapia") and router.ignores("grafica_x")
+
+
+def test_include_defaults_false_drops_builtin_rules(tmp_path: Path) -> None:
+    config = {"rules": [{"pattern": "Sesiones Norte", "table": "stg_sesiones"}], "include_defaults": False}
+    router = load_routing_file(_write_rules(tmp_path, config), defaults=DEFAULT_TABLE_ROUTER)
+
+    assert router.resolve("sesiones_norte_2024") == "stg_sesiones"
+    assert router.resolve("terapia_2024") is None
+    assert not router.ignores("grafica_x")
+
+
+@pytest.mark.parametrize(
+    ("config", "message"),
+    [
+        ([], "debe contener un objeto"),
+        ({"reglas": {}}, "Claves desconocidas"),
+        ({"rules": "terapia"}, "debe ser una lista"),
+        ({"rules": [{"pattern": "terapia"}]}, "requiere pattern y table"),
+        ({"rules": [{"pattern": "???", "table": "stg_x"}]}, "vacio tras normalizar"),
+    ],
+)
+def test_malformed_rule_files_are_rejected(tmp_path: Path, config: object, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        load_routing_file(_write_rules(tmp_path, config))
+
+
+def test_missing_rule_file_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        load_routing_file(tmp_path / "no_existe.json")